@@ -0,0 +1,188 @@
+"""
+데이터 파이프라인 벤치마크
+
+합성 리그(synthetic_league)를 여러 크기로 만들어 주요 단계의 실행 시간을 측정하고
+저장된 기준값(baseline.json)과 비교합니다. 네트워크/브라우저 없이 실행됩니다.
+
+사용 예:
+    python benchmarks/run_benchmarks.py                    # 측정 + 기준값 비교 (회귀 시 종료 코드 1)
+    python benchmarks/run_benchmarks.py --update-baseline  # 현재 측정값을 기준값으로 저장
+    python benchmarks/run_benchmarks.py --sizes small medium --repeat 3
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), 'src'))
+
+from synthetic_league import generate_league  # noqa: E402
+from utils.data_loader import get_team_columns, process_match_results, process_attendance  # noqa: E402
+from utils.events import build_match_events  # noqa: E402
+from utils.html_table import render_html_table  # noqa: E402
+from utils.attendance import build_attendance_matrix  # noqa: E402
+from utils.incremental import IncrementalLeagueState  # noqa: E402
+from utils.metrics import build_round_goals, compute_weekly_gf, compute_weekly_ga, build_player_table  # noqa: E402
+from utils.ratings import compute_rapm  # noqa: E402
+
+
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baseline.json')
+
+# 리그 크기별 생성 인자
+SIZES = {
+    'small': dict(weeks=10, rounds=9, teams=3, roster=12),
+    'medium': dict(weeks=40, rounds=12, teams=3, roster=25),
+    'large': dict(weeks=150, rounds=20, teams=6, roster=40),
+}
+
+# 기준값 대비 이 배수보다 느리면 회귀 (아주 짧은 측정의 흔들림은 MIN_DELTA_SECONDS로 무시)
+DEFAULT_THRESHOLD = 2.0
+MIN_DELTA_SECONDS = 0.002
+
+
+def _prepare_player_inputs(df_match, df_att):
+    """선수 지표 계산 입력 (스냅샷 빌드와 같은 순서)"""
+    events = build_match_events(df_match, get_team_columns(df_match))
+    df_teams, df_history, df_scorers = process_match_results(df_match, events=events)
+    df_history = df_history.copy()
+    df_history['Week'] = df_history['Week'].astype(int)
+    team_points_by_week = df_history.groupby(['Week', 'Team'])['PointsGained'].sum().reset_index()
+    round_goals = build_round_goals(events)
+    return (df_att, process_attendance(df_att), df_scorers, df_history, team_points_by_week,
+            compute_weekly_gf(round_goals), compute_weekly_ga(round_goals))
+
+
+def _with_last_week_changed(df_match, df_att):
+    """마지막 주차의 팀 컬럼 값을 한 칸씩 돌리고 마지막 주차 출석을 뒤집은 시트 (한 주차만 바뀐 갱신)"""
+    teams = get_team_columns(df_match)
+    last = (df_match['주차'] == df_match['주차'].iloc[-1]).to_numpy()
+    df_match = df_match.copy()
+    df_match.loc[last, teams] = df_match.loc[last, teams[1:] + teams[:1]].to_numpy()
+    df_att = df_att.copy()
+    last_col = [c for c in df_att.columns if '주차' in c][-1]
+    df_att[last_col] = df_att[last_col].map({'1': '0', '0': '1'})
+    return df_match, df_att
+
+
+def _season_inputs(df_match, df_att):
+    """스냅샷 빌드와 같은 입력 (시트, 이벤트 테이블, 출석 행렬)"""
+    return df_match, df_att, build_match_events(df_match, get_team_columns(df_match)), build_attendance_matrix(df_att)
+
+
+def build_cases(size):
+    """size 리그에 대한 {케이스 이름: 인자 없는 함수}"""
+    df_match, df_att = generate_league(seed=0, **SIZES[size])
+    player_inputs = _prepare_player_inputs(df_match, df_att)
+    df_players_all = build_player_table(*player_inputs)
+    _, df_att_processed, _, df_history, _, _, _ = player_inputs
+    round_goals = build_round_goals(build_match_events(df_match, get_team_columns(df_match)))
+
+    # 마지막 주차만 다른 두 시즌을 번갈아 반영하여 매 호출이 한 주차 갱신이 되도록 함
+    seasons = [_season_inputs(df_match, df_att), _season_inputs(*_with_last_week_changed(df_match, df_att))]
+    league_state = IncrementalLeagueState()
+
+    def week_rebuild():
+        seasons.reverse()
+        df_m, df_a, events, attendance = seasons[0]
+        process_match_results(df_m, events=events)
+        process_attendance(df_a, attendance)
+
+    def week_incremental():
+        seasons.reverse()
+        df_m, df_a, events, attendance = seasons[0]
+        league_state.update_match_results(df_m, events=events)
+        league_state.update_attendance(df_a, attendance)
+
+    return {
+        'match_cells': lambda: build_match_events(df_match, get_team_columns(df_match)).cell_records,
+        'process_match_results': lambda: process_match_results(df_match),
+        'process_attendance': lambda: process_attendance(df_att),
+        'player_metrics': lambda: build_player_table(*player_inputs),
+        'html_render': lambda: render_html_table(df_players_all, compact=True),
+        'week_rebuild': week_rebuild,
+        'week_incremental': week_incremental,
+        'rapm': lambda: compute_rapm(df_players_all[['Player', 'Team']], df_att_processed, df_history, round_goals),
+    }
+
+
+def time_case(fn, repeat):
+    """repeat회 실행하여 (최소, 중앙값) 초 반환"""
+    fn()  # 워밍업
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return min(samples), statistics.median(samples)
+
+
+def load_baseline(path=BASELINE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def run(sizes, repeat, baseline, threshold):
+    """
+    벤치마크 실행
+
+    Returns:
+        (results, regressions)
+        results: {size: {case: {'min': 초, 'median': 초}}}
+        regressions: [(size, case, 측정값, 기준값)]
+    """
+    results, regressions = {}, []
+    print(f"{'size':<8}{'case':<24}{'min(ms)':>10}{'median(ms)':>12}{'base(ms)':>10}{'ratio':>8}")
+    for size in sizes:
+        results[size] = {}
+        for name, fn in build_cases(size).items():
+            best, median = time_case(fn, repeat)
+            results[size][name] = {'min': best, 'median': median}
+
+            base = baseline.get(size, {}).get(name, {}).get('min')
+            ratio = best / base if base else None
+            regressed = base is not None and best > base * threshold and best - base > MIN_DELTA_SECONDS
+            if regressed:
+                regressions.append((size, name, best, base))
+
+            base_str = f'{base * 1000:10.2f}' if base else f"{'-':>10}"
+            ratio_str = f'{ratio:8.2f}' if ratio else f"{'-':>8}"
+            flag = '  << REGRESSION' if regressed else ''
+            print(f'{size:<8}{name:<24}{best * 1000:10.2f}{median * 1000:12.2f}{base_str}{ratio_str}{flag}')
+    return results, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='데이터 파이프라인 벤치마크')
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='기준값 대비 허용 배수 (기본 %(default)s)')
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--update-baseline', action='store_true', help='측정값을 기준값 파일에 저장')
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    results, regressions = run(args.sizes, args.repeat, baseline, args.threshold)
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'기준값 저장: {args.baseline}')
+        return 0
+
+    if regressions:
+        print(f'\n{len(regressions)}개 케이스가 기준값의 {args.threshold}배보다 느립니다.')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+시트 로드 경로 지연 시간 벤치마크 (대역 서버 사용, 네트워크 불필요)
+
+sheets_stub_server를 프로세스 안에서 띄우고 SHEETS_BASE_URL을 그쪽으로 돌려
+요청 경로(load_data_versioned)와 백그라운드 갱신의 지연 시간을 측정합니다.
+디스크 캐시는 임시 폴더를 사용하므로 실제 .cache/sheets는 건드리지 않습니다.
+
+측정 항목:
+    cold_load          메모리/디스크 캐시 없음 -> 동기 다운로드 + 파싱
+    memory_hit         메모리 캐시 적중
+    disk_restore       프로세스 재시작 가정 (디스크 캐시로 복원)
+    revalidate_304     백그라운드 갱신, 내용 그대로 (조건부 요청 304)
+    refresh_changed    백그라운드 갱신, 내용 변경 (다운로드 + 파싱 + 디스크 저장)
+    stale_on_error     메모리 캐시가 오래됐고 서버가 오류 -> 마지막 데이터 즉시 반환
+    fallback_first     캐시 없음 + 서버 오류 -> 재시도 후 로컬 데이터로 대체
+    fallback_breaker   캐시 없음 + 브레이커 열림 -> 요청 없이 로컬 데이터로 대체
+
+사용 예:
+    python benchmarks/sheets_latency.py --latency 0.2 --repeat 5
+    python benchmarks/sheets_latency.py --latency 0.5 --jitter 0.2 --json out.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), 'src'))
+
+# 실제 디스크 캐시를 덮어쓰지 않도록 utils import 전에 임시 폴더 지정
+CACHE_DIR = tempfile.mkdtemp(prefix='sheets-latency-')
+os.environ['SHEETS_DISK_CACHE_DIR'] = CACHE_DIR
+
+from sheets_stub_server import StubSheetsServer  # noqa: E402
+from utils import data_loader  # noqa: E402
+from utils.data_loader import (  # noqa: E402
+    load_data_versioned, refresh_sheets_now, reset_sheet_cache, get_sheet_cache_status,
+)
+from utils.sheets_client import get_sheets_client  # noqa: E402
+
+
+def _quiet(message):
+    pass
+
+
+def _wait_refresh_idle(timeout=30.0):
+    """요청 경로가 띄운 백그라운드 갱신이 끝날 때까지 대기 (다음 측정과 겹치지 않도록)"""
+    deadline = time.time() + timeout
+    while get_sheet_cache_status()['refreshing'] and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def _reset(clear_disk):
+    _wait_refresh_idle()
+    reset_sheet_cache()
+    if clear_disk:
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+def _measure(setup, fn, repeat):
+    """setup() 후 fn() 시간을 repeat번 측정하여 초 단위 리스트 반환"""
+    samples = []
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def build_scenarios(server, url):
+    """{이름: (setup, fn)}"""
+    load = lambda: load_data_versioned(url, warn=_quiet)  # noqa: E731
+    refresh = lambda: refresh_sheets_now(url)  # noqa: E731
+
+    def healthy():
+        server.set_faults(error_rate=0.0, truncate_rate=0.0)
+        data_loader.CACHE_TTL_SECONDS = 3600.0
+
+    def cold():
+        healthy()
+        _reset(clear_disk=True)
+
+    def warm():
+        healthy()
+        _wait_refresh_idle()
+        if get_sheet_cache_status()['version'] is None:
+            load()
+            _wait_refresh_idle()
+
+    def restart():
+        warm()
+        _reset(clear_disk=False)
+
+    def changed():
+        warm()
+        server.change_content()
+
+    def stale_failing():
+        warm()
+        data_loader.CACHE_TTL_SECONDS = 0.0
+        server.set_faults(error_rate=1.0)
+
+    def cold_failing():
+        _reset(clear_disk=True)
+        server.set_faults(error_rate=1.0)
+
+    def breaker_open():
+        cold_failing()
+        breaker = get_sheets_client().breaker
+        while breaker.status()['state'] != 'open':
+            load()
+
+    return {
+        'cold_load': (cold, load),
+        'memory_hit': (warm, load),
+        'disk_restore': (restart, load),
+        'revalidate_304': (warm, refresh),
+        'refresh_changed': (changed, refresh),
+        'stale_on_error': (stale_failing, load),
+        'fallback_first': (cold_failing, load),
+        'fallback_breaker': (breaker_open, load),
+    }
+
+
+def run(server, repeat):
+    """시나리오별 {'min', 'median'} (초)"""
+    url = f'{server.base_url}/d/bench/edit'
+    results = {}
+    print(f"{'case':<20}{'min(ms)':>10}{'median(ms)':>12}")
+    for name, (setup, fn) in build_scenarios(server, url).items():
+        samples = _measure(setup, fn, repeat)
+        results[name] = {'min': min(samples), 'median': statistics.median(samples)}
+        print(f"{name:<20}{min(samples) * 1000:10.2f}{statistics.median(samples) * 1000:12.2f}")
+    _wait_refresh_idle()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='시트 로드 경로 지연 시간 벤치마크 (대역 서버)')
+    parser.add_argument('--fixtures', default=None, help='픽스처 폴더 (기본 data/)')
+    parser.add_argument('--latency', type=float, default=0.2, help='서버 응답 지연(초)')
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', default=None, help='결과를 저장할 JSON 파일')
+    args = parser.parse_args()
+
+    kwargs = {'fixtures_dir': args.fixtures} if args.fixtures else {}
+    server = StubSheetsServer(seed=args.seed, latency=args.latency, jitter=args.jitter, **kwargs).start()
+    data_loader.SHEETS_BASE_URL = server.base_url
+    print(f"대역 서버 {server.base_url} (지연 {args.latency}s + 0~{args.jitter}s), 반복 {args.repeat}회")
+    try:
+        results = run(server, args.repeat)
+    finally:
+        server.stop()
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    print(f"서버 통계: {server.stats}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'latency': args.latency, 'jitter': args.jitter, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+"""
+Google Sheets CSV export 대역 서버 (오프라인 테스트/벤치마크용)
+
+`/d/<문서 ID>/export?format=csv&gid=<gid>` (또는 `/export?format=csv&gid=<gid>`) 요청에
+픽스처 파일(TSV/CSV)을 CSV로 변환하여 응답합니다. 표준 라이브러리만 사용합니다.
+- ETag 조건부 요청(304) 지원
+- 장애 주입: 지연(latency + 무작위 jitter), 오류 응답(error_rate, error_status),
+  잘린 본문(truncate_rate, Content-Length보다 짧게 보내고 연결 종료)
+- 내용 변경: change_content()마다 경기 시트 끝에 빈 행을 추가하여 새 데이터 버전을 만듦
+  (빈 주차 행은 로더가 버리므로 화면은 같고 버전만 바뀜). 픽스처 파일을 수정해도 바로 반영됩니다.
+
+실행 중에는 HTTP로 설정을 바꿀 수 있습니다.
+    GET /_faults?latency=0.5&error_rate=0.2   # 지정한 항목만 변경, 현재 설정 반환
+    GET /_change                              # 내용 변경
+    GET /_stats                               # 요청/오류/304/잘림 횟수
+
+사용 예:
+    python benchmarks/sheets_stub_server.py --port 8765 --latency 0.3
+    SHEETS_BASE_URL=http://127.0.0.1:8765 \\
+    SPREADSHEET_URL=http://127.0.0.1:8765/d/local/edit \\
+    SHEETS_DISK_CACHE_DIR=/tmp/sheets-stub-cache streamlit run src/app.py
+
+대역 서버로 앱을 실행할 때는 SHEETS_DISK_CACHE_DIR를 별도 폴더로 지정하세요.
+지정하지 않으면 대역 서버의 데이터가 실제 앱의 디스크 캐시(.cache/sheets)를 덮어씁니다
+(sheets_latency.py는 임시 폴더를 사용합니다).
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), 'src'))
+
+from utils.data_loader import MATCH_GID, ATTENDANCE_GID  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'data')
+# gid -> 픽스처 파일명 (로컬 샘플/합성 리그와 같은 이름)
+FIXTURE_FILES = {
+    MATCH_GID: 'match_result_sample.tsv',
+    ATTENDANCE_GID: 'attendance_sample.tsv',
+}
+
+# 장애 주입 설정 기본값 (/_faults와 set_faults로 변경)
+DEFAULT_FAULTS = {
+    'latency': 0.0,         # 응답 전 대기(초)
+    'jitter': 0.0,          # 추가 대기 0 ~ jitter초 (무작위)
+    'error_rate': 0.0,      # 오류 응답 비율
+    'error_status': 503,    # 오류 응답 상태 코드
+    'truncate_rate': 0.0,   # 본문을 잘라 보내는 비율
+}
+
+
+def _fixture_path(fixtures_dir, gid):
+    """gid의 픽스처 파일 (<gid>.csv, <gid>.tsv, 샘플 파일명 순으로 찾음)"""
+    for name in (f'{gid}.csv', f'{gid}.tsv', FIXTURE_FILES.get(gid)):
+        if name and os.path.exists(os.path.join(fixtures_dir, name)):
+            return os.path.join(fixtures_dir, name)
+    return None
+
+
+def _to_csv_bytes(path):
+    """TSV/CSV 파일 -> 구글 시트 export와 같은 CSV 바이트 (UTF-8, 줄바꿈 CRLF)"""
+    with open(path, encoding='utf-8', newline='') as f:
+        text = f.read()
+    delimiter = '\t' if path.endswith('.tsv') else ','
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\r\n')
+    for row in csv.reader(io.StringIO(text), delimiter=delimiter):
+        writer.writerow(row)
+    return out.getvalue().encode('utf-8')
+
+
+class StubSheetsServer:
+    """
+    스레드로 실행되는 대역 서버
+
+    base_url을 data_loader.SHEETS_BASE_URL(또는 환경 변수)로 지정하면
+    로더가 구글 시트 대신 이 서버에서 받아 갑니다.
+    """
+
+    def __init__(self, fixtures_dir=DATA_DIR, host='127.0.0.1', port=0, seed=0, etag=True, **faults):
+        self.fixtures_dir = fixtures_dir
+        self.etag = etag
+        self.faults = dict(DEFAULT_FAULTS)
+        self.set_faults(**faults)
+        self.revision = 0
+        self.stats = {'requests': 0, 'ok': 0, 'not_modified': 0, 'errors': 0, 'truncated': 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        # gid -> (파일 mtime, 변경 횟수, 본문)
+        self._bodies = {}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='sheets-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def set_faults(self, **faults):
+        """장애 주입 설정 변경 (지정한 항목만)"""
+        unknown = set(faults) - set(DEFAULT_FAULTS)
+        if unknown:
+            raise ValueError(f"알 수 없는 설정: {sorted(unknown)}")
+        for key, value in faults.items():
+            self.faults[key] = type(DEFAULT_FAULTS[key])(value)
+        return dict(self.faults)
+
+    def change_content(self):
+        """경기 시트 내용을 바꿔 새 데이터 버전을 만듦"""
+        with self._lock:
+            self.revision += 1
+        return self.revision
+
+    def body(self, gid):
+        """gid 시트의 현재 CSV 본문 (없으면 None)"""
+        path = _fixture_path(self.fixtures_dir, gid)
+        if path is None:
+            return None
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            revision = self.revision if gid == MATCH_GID else 0
+            cached = self._bodies.get(gid)
+            if cached is not None and cached[:2] == (mtime, revision):
+                return cached[2]
+        body = _to_csv_bytes(path)
+        if revision:
+            n_cols = body.split(b'\r\n', 1)[0].count(b',') + 1
+            body += (b',' * (n_cols - 1) + b'\r\n') * revision
+        with self._lock:
+            self._bodies[gid] = (mtime, revision, body)
+        return body
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _roll(self, rate):
+        with self._lock:
+            return self._rng.random() < rate
+
+    def _delay(self):
+        with self._lock:
+            delay = self.faults['latency'] + self._rng.random() * self.faults['jitter']
+        if delay > 0:
+            time.sleep(delay)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, fmt, *args):
+                pass
+
+            def _send(self, status, body=b'', headers=None, content_type='text/csv; charset=utf-8'):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_json(self, payload):
+                self._send(200, json.dumps(payload).encode('utf-8'), content_type='application/json')
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+
+                if parts.path == '/_faults':
+                    try:
+                        self._send_json(server.set_faults(**query))
+                    except ValueError as e:
+                        self._send(400, str(e).encode('utf-8'), content_type='text/plain; charset=utf-8')
+                    return
+                if parts.path == '/_change':
+                    self._send_json({'revision': server.change_content()})
+                    return
+                if parts.path == '/_stats':
+                    with server._lock:
+                        self._send_json(dict(server.stats, revision=server.revision))
+                    return
+                if not parts.path.endswith('/export'):
+                    self._send(404)
+                    return
+
+                server._count('requests')
+                server._delay()
+                if server._roll(server.faults['error_rate']):
+                    server._count('errors')
+                    self._send(server.faults['error_status'])
+                    return
+
+                body = server.body(query.get('gid'))
+                if body is None:
+                    self._send(404)
+                    return
+
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                headers = {'ETag': etag} if server.etag else {}
+                if server.etag and self.headers.get('If-None-Match') == etag:
+                    server._count('not_modified')
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                if server._roll(server.faults['truncate_rate']):
+                    # 전체 길이를 알린 뒤 절반만 보내고 연결을 끊음
+                    server._count('truncated')
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/csv; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body[:len(body) // 2])
+                    self.close_connection = True
+                    return
+
+                server._count('ok')
+                self._send(200, body, headers)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Google Sheets CSV export 대역 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fixtures', default=DATA_DIR, help='픽스처 폴더 (<gid>.csv/.tsv 또는 샘플 파일명)')
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--truncate-rate', type=float, default=0.0)
+    parser.add_argument('--change-every', type=float, default=0.0, help='N초마다 내용 변경 (0이면 안 함)')
+    parser.add_argument('--no-etag', action='store_true', help='ETag를 보내지 않음 (항상 전체 본문)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = StubSheetsServer(
+        args.fixtures, args.host, args.port, seed=args.seed, etag=not args.no_etag,
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        error_status=args.error_status, truncate_rate=args.truncate_rate,
+    ).start()
+    print(f"대역 서버 실행 중: {server.base_url} (SHEETS_BASE_URL로 지정)")
+    print(f"  시트 URL 예: {server.base_url}/d/local/edit")
+    print("  앱 실행 시 SHEETS_DISK_CACHE_DIR를 별도 폴더로 지정 (예: /tmp/sheets-stub-cache)")
+    try:
+        while True:
+            if args.change_every > 0:
+                time.sleep(args.change_every)
+                print(f"  내용 변경 (revision {server.change_content()})")
+            else:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
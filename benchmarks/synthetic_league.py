@@ -0,0 +1,148 @@
+"""
+합성 리그 데이터 생성기
+
+실제 시트와 같은 형식의 경기/출석 데이터를 시드 기반으로 재현 가능하게 만듭니다.
+- 경기 시트: 주차, 라운드, 팀 컬럼 (득점자 이름을 쉼표로 나열, 무득점 '0', 미참여 빈 칸)
+- 출석 시트: 팀이름, 선수이름, N주차 (1: 출석, 0: 결장)
+
+사용 예:
+    python benchmarks/synthetic_league.py --weeks 40 --rounds 12 --out data/
+"""
+
+import argparse
+import math
+import os
+import random
+
+import pandas as pd
+
+
+# get_team_columns가 팀 컬럼을 찾는 키워드 (팀이 3개보다 많으면 번호를 붙여 반복)
+TEAM_KEYWORDS = ['레드', '블루', '옐로']
+TEAM_NAMES = ['타르가르옌', '스타크', '라니스터']
+SURNAMES = list('김이박최정강조윤장임한오서신권황안송전홍')
+GIVEN_SYLLABLES = list('민서준도윤하지우현수영성진호경태석훈')
+
+MATCH_FILE = 'match_result_sample.tsv'
+ATTENDANCE_FILE = 'attendance_sample.tsv'
+
+
+def team_names(n_teams):
+    """키워드가 포함된 팀 컬럼명 n개 (예: 타르가르옌(레드), 스타크(블루), ...)"""
+    names = []
+    for i in range(n_teams):
+        base = TEAM_NAMES[i % len(TEAM_NAMES)]
+        suffix = '' if i < len(TEAM_KEYWORDS) else str(i // len(TEAM_KEYWORDS) + 1)
+        names.append(f'{base}{suffix}({TEAM_KEYWORDS[i % len(TEAM_KEYWORDS)]})')
+    return names
+
+
+def _player_names(rng, n):
+    """서로 다른 한글 이름 n개"""
+    names, seen = [], set()
+    while len(names) < n:
+        name = rng.choice(SURNAMES) + rng.choice(GIVEN_SYLLABLES) + rng.choice(GIVEN_SYLLABLES)
+        if name in seen:
+            name = f'{name}{len(names)}'
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def generate_league(weeks=10, rounds=9, teams=3, roster=12, scorer_density=1.0,
+                    attendance_rate=0.75, own_goal_rate=0.02, teams_per_round=2, seed=0):
+    """
+    합성 리그 데이터 생성
+
+    Args:
+        weeks: 주차 수
+        rounds: 주차당 라운드 수
+        teams: 팀 수
+        roster: 팀당 선수 수
+        scorer_density: 참여 팀의 라운드당 평균 득점 (포아송)
+        attendance_rate: 주차별 출석 확률
+        own_goal_rate: 득점 중 자살골 비율
+        teams_per_round: 라운드마다 경기하는 팀 수 (나머지 팀은 빈 칸)
+        seed: 난수 시드 (같은 인자면 항상 같은 결과)
+
+    Returns:
+        (df_match, df_att) 모든 값이 문자열인 DataFrame
+    """
+    rng = random.Random(seed)
+    cols = team_names(teams)
+    # 선수 이름은 리그 전체에서 중복 없음 (선수 -> 팀 매핑이 하나로 정해지도록)
+    names = _player_names(rng, roster * teams)
+    rosters = {t: names[i * roster:(i + 1) * roster] for i, t in enumerate(cols)}
+    teams_per_round = min(teams_per_round, teams)
+
+    att_rows = {(t, p): {} for t in cols for p in rosters[t]}
+    match_rows = []
+    for week in range(1, weeks + 1):
+        # 주차별 출석 명단 (득점자는 출석한 선수 중에서 선택)
+        present = {}
+        for t in cols:
+            present[t] = [p for p in rosters[t] if rng.random() < attendance_rate] or rosters[t][:1]
+            for p in rosters[t]:
+                att_rows[(t, p)][f'{week}주차'] = '1' if p in present[t] else '0'
+
+        for rnd in range(1, rounds + 1):
+            row = {'주차': str(week), '라운드': str(rnd)}
+            playing = set(rng.sample(cols, teams_per_round))
+            for t in cols:
+                if t not in playing:
+                    row[t] = ''
+                    continue
+                n_goals = _poisson(rng, scorer_density)
+                if n_goals == 0:
+                    row[t] = '0'
+                    continue
+                scorers = ['자살골' if rng.random() < own_goal_rate else rng.choice(present[t]) for _ in range(n_goals)]
+                row[t] = ','.join(scorers)
+            match_rows.append(row)
+
+    df_match = pd.DataFrame(match_rows, columns=['주차', '라운드'] + cols)
+    df_att = pd.DataFrame([{'팀이름': t, '선수이름': p, **weeks_att} for (t, p), weeks_att in att_rows.items()],
+                          columns=['팀이름', '선수이름'] + [f'{w}주차' for w in range(1, weeks + 1)])
+    return df_match, df_att
+
+
+def _poisson(rng, lam):
+    """표준 라이브러리 random 기반 포아송 샘플 (Knuth)"""
+    threshold, k, p = math.exp(-lam), 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= threshold:
+            return k
+        k += 1
+
+
+def write_league(out_dir, **kwargs):
+    """generate_league 결과를 로더가 읽는 TSV 파일명으로 저장"""
+    df_match, df_att = generate_league(**kwargs)
+    os.makedirs(out_dir, exist_ok=True)
+    df_match.to_csv(os.path.join(out_dir, MATCH_FILE), sep='\t', index=False)
+    df_att.to_csv(os.path.join(out_dir, ATTENDANCE_FILE), sep='\t', index=False)
+    return df_match, df_att
+
+
+def main():
+    parser = argparse.ArgumentParser(description='합성 리그 TSV 생성')
+    parser.add_argument('--out', required=True, help='저장할 폴더')
+    parser.add_argument('--weeks', type=int, default=10)
+    parser.add_argument('--rounds', type=int, default=9)
+    parser.add_argument('--teams', type=int, default=3)
+    parser.add_argument('--roster', type=int, default=12)
+    parser.add_argument('--scorer-density', type=float, default=1.0)
+    parser.add_argument('--attendance-rate', type=float, default=0.75)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    df_match, df_att = write_league(
+        args.out, weeks=args.weeks, rounds=args.rounds, teams=args.teams, roster=args.roster,
+        scorer_density=args.scorer_density, attendance_rate=args.attendance_rate, seed=args.seed,
+    )
+    print(f'{args.out}: 경기 {len(df_match)}행, 출석 {len(df_att)}명 x {args.weeks}주차')
+
+
+if __name__ == '__main__':
+    main()
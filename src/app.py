@@ -3,79 +3,17 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_loader import load_data, process_match_results, process_attendance, count_goals, get_scorers_list
-
-
-# 헬퍼 함수: DataFrame을 중앙 정렬된 HTML 테이블로 변환
-def df_to_html_table(df, center_align=True, match_result=False, scrollable=False):
-    """
-    DataFrame을 HTML 테이블로 변환
-    
-    Args:
-        df: pandas DataFrame
-        center_align: True면 모든 셀 중앙 정렬, False면 왼쪽 정렬
-        match_result: True면 경기 결과 테이블 (텍스트 중앙 정렬)
-        scrollable: True면 모바일에서 가로 스크롤을 위해 최소 너비 확보
-    """
-    # 스타일 설정
-    if match_result:
-        # 경기 결과: 모두 중앙 정렬
-        cell_style = 'text-align: center; padding: 8px 12px;'
-        header_style = 'text-align: center; padding: 8px 12px; font-weight: 700; background-color: #dee2e6;'
-    elif center_align:
-        # 일반 테이블: 모두 중앙
-        cell_style = 'text-align: center; padding: 8px 12px;'
-        header_style = 'text-align: center; padding: 8px 12px; font-weight: 700; background-color: #dee2e6;'
-    else:
-        # 왼쪽 정렬
-        cell_style = 'text-align: left; padding: 8px 12px;'
-        header_style = 'text-align: left; padding: 8px 12px; font-weight: 700; background-color: #dee2e6;'
-    
-    # HTML 테이블 생성
-    table_classes = ["match-result-table" if match_result else "standard-table"]
-    if scrollable:
-        table_classes.append("scrollable-table")
-    
-    table_class_str = " ".join(table_classes)
-    layout_style = "table-layout: fixed;" if match_result else "table-layout: auto;"
-    
-    html = f'<div class="table-container">'
-    html += f'<table class="{table_class_str}" style="width: 100%; border-collapse: collapse; color: #212529; {layout_style}">'
-    
-    # 경기 결과 테이블의 경우 각 컬럼 너비 강제 고정
-    if match_result:
-        col_count = len(df.columns)
-        # 인덱스(라운드)는 80px, 나머지는 균등 분할
-        html += '<colgroup>'
-        html += '<col style="width: 80px;">'
-        for _ in range(col_count):
-            html += f'<col style="width: calc((100% - 80px) / {col_count});">'
-        html += '</colgroup>'
-
-    # 헤더
-    html += '<thead><tr>'
-    if df.index.name or not all(isinstance(i, int) for i in df.index):
-        # 라운드(인덱스) 컬럼 스타일
-        html += f'<th style="{header_style}">{df.index.name if df.index.name else ""}</th>'
-    
-    # 데이터 컬럼
-    for col in df.columns:
-        html += f'<th style="{header_style}">{col}</th>'
-    html += '</tr></thead>'
-    
-    # 데이터
-    html += '<tbody>'
-    for idx, row in df.iterrows():
-        html += '<tr>'
-        if df.index.name or not all(isinstance(i, int) for i in df.index):
-            html += f'<td style="{header_style}">{idx}</td>'
-        for val in row:
-            html += f'<td style="{cell_style}">{val}</td>'
-        html += '</tr>'
-    html += '</tbody></table>'
-    html += '</div>'
-    
-    return html
+import os
+from utils.data_loader import load_data_versioned, get_sheet_cache_status
+from utils.incremental import IncrementalLeagueState
+from utils.snapshot import SnapshotRegistry, build_league_snapshot
+from utils.watcher import SheetWatcher
+from utils.html_table import df_to_html_table, record_payload, html_payload_report, COMPACT_TABLE_CSS
+from utils.views import (
+    format_team_name, team_color, standings_view, standings_by_week_view, title_odds_view, personal_view, impact_view, rapm_view,
+    team_trends_view, player_detail_view, attendance_view,
+)
+from utils.profiling import span, start_trace, end_trace, trace_rows, PERF_LOG_PATH
 
 
 # 페이지 설정
@@ -86,6 +24,10 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# --- 성능 계측 (?debug=perf 또는 PERF_DEBUG=1이면 하단에 패널 표시, PERF_LOG_PATH면 JSON lines 기록) ---
+show_perf_panel = os.getenv('PERF_DEBUG', '').lower() in ('1', 'true') or st.query_params.get('debug') == 'perf'
+perf_trace = start_trace('rerun') if (show_perf_panel or PERF_LOG_PATH) else None
+
 # --- 스타일링 (CSS) ---
 st.markdown("""
 <style>
@@ -285,6 +227,9 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# 테이블 compact 모드 클래스 (셀마다 인라인 style을 반복하지 않도록 한 번만 정의)
+st.markdown(f"<style>{COMPACT_TABLE_CSS}</style>", unsafe_allow_html=True)
+
 # --- 메인 타이틀 ---
 st.title("⚽ 26 Brocelona Iron League")
 st.markdown("매주 업데이트되는 브로셀로나 리그의 경기 결과와 승점 현황입니다.")
@@ -299,395 +244,206 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- 데이터 로딩 ---
+@st.cache_resource
+def get_incremental_state():
+    """모든 세션이 공유하는 증분 계산 상태 (새로 추가/변경된 주차만 계산)"""
+    return IncrementalLeagueState()
+
+@st.cache_resource
+def get_snapshot_registry():
+    """모든 세션이 공유하는 데이터 버전별 리그 스냅샷 저장소"""
+    return SnapshotRegistry(max_versions=3)
+
+def get_spreadsheet_url():
+    """st.secrets의 구글 시트 URL (없으면 None)"""
+    try:
+        if "google_sheets" in st.secrets and st.secrets["google_sheets"].get("spreadsheet_url"):
+            return st.secrets["google_sheets"]["spreadsheet_url"]
+    except:
+        pass
+    return None
+
+@st.cache_resource
+def get_sheet_watcher(spreadsheet_url):
+    """
+    시트 변경 감시 스레드 (프로세스당 하나, 새 버전의 스냅샷을 요청 전에 미리 생성)
+    
+    우승 확률 시뮬레이션은 몇 초가 걸리므로 스냅샷과 함께 미리 계산하여
+    데이터가 바뀐 뒤 첫 방문자가 기다리지 않게 합니다.
+    """
+    def prewarm(df_match, df_att, version):
+        snapshot = get_snapshot_registry().get_or_build(
+            version, lambda: build_league_snapshot(df_match, df_att, version, get_incremental_state())
+        )
+        snapshot.section('title_odds', lambda: title_odds_view(snapshot))
+    return SheetWatcher(spreadsheet_url, prewarm).start()
+
+# 구글 시트를 사용할 때만 감시 (Streamlit에는 서버 시작 훅이 없으므로 첫 리런에서 시작)
+sheet_url = get_spreadsheet_url() or os.getenv('SPREADSHEET_URL')
+sheet_watcher = get_sheet_watcher(sheet_url) if sheet_url else None
+
 try:
-    df_match, df_att = load_data()
-    df_teams, df_history, df_scorers = process_match_results(df_match)
-    df_att_processed = process_attendance(df_att)
+    with span('load_data') as s:
+        df_match, df_att, data_version = load_data_versioned(get_spreadsheet_url(), warn=st.warning)
+        s['version'] = data_version
+    # 같은 데이터 버전은 한 번만 계산하여 모든 세션이 공유
+    league = get_snapshot_registry().get_or_build(
+        data_version,
+        lambda: build_league_snapshot(df_match, df_att, data_version, get_incremental_state())
+    )
 except Exception as e:
     st.error(f"데이터 로딩 중 오류가 발생했습니다: {e}")
     st.stop()
 
 # --- 탭 구성 ---
-all_teams_raw = df_teams['Team'].tolist()
-
-# 팀 이름 변환 함수 (스타크(블루) -> 🔵 스타크)
-def format_team_name(name):
-    if '레드' in name: return '🔴 타르가르옌'
-    if '블루' in name: return '🔵 스타크'
-    if '옐로' in name: return '🟡 라니스터'
-    return name
-
-# 실제 팀별 색상 딕셔너리 생성
-team_colors = {}
-for t in all_teams_raw:
-    if '레드' in t: team_colors[t] = '#ef4444'
-    elif '블루' in t: team_colors[t] = '#3b82f6'
-    elif '옐로' in t: team_colors[t] = '#eab308'
-    else: team_colors[t] = '#6c757d'
+all_teams_raw = list(league.teams)
 
-# 표시용 팀 이름 매핑
+# 표시용 팀 이름 / 팀별 색상 매핑
 display_team_map = {t: format_team_name(t) for t in all_teams_raw}
+team_colors = {t: team_color(t) for t in all_teams_raw}
 
-# 표 내부용 짧은 팀 이름 매핑 (이모지만 표시)
-team_short_map = {
-    t: ('🔴' if '레드' in t else '🔵' if '블루' in t else '🟡') 
-    for t in all_teams_raw
-}
-
-# --- 데이터 전처리를 위한 기본 정보 구성 ---
-df_history['Week'] = df_history['Week'].astype(int)
-team_points_by_week = df_history.groupby(['Week', 'Team'])['PointsGained'].sum().reset_index()
-df_match['주차'] = df_match['주차'].astype(int)
-
-# 득점/실점 주차별 데이터 (임팩트 분석 등에서 재사용)
-weekly_stats_temp = []
-for idx, row in df_match.iterrows():
-    w = row['주차']
-    for t in all_teams_raw:
-        if t in df_match.columns:
-            g = count_goals(row[t])
-            if g is not None:
-                weekly_stats_temp.append({'Week': w, 'Team': t, 'GF': g})
-
-df_weekly_gf = pd.DataFrame(weekly_stats_temp).groupby(['Week', 'Team'])['GF'].sum().reset_index()
-
-weekly_ga_temp = []
-for w in df_match['주차'].unique():
-    w_data = df_match[df_match['주차'] == w]
-    for t in all_teams_raw:
-        ga = 0
-        for _, row in w_data.iterrows():
-            if t in row and count_goals(row[t]) is not None:
-                for opp in all_teams_raw:
-                    if opp != t and opp in row:
-                        og = count_goals(row[opp])
-                        if og is not None: ga += og
-        weekly_ga_temp.append({'Week': w, 'Team': t, 'GA': ga})
-df_weekly_ga = pd.DataFrame(weekly_ga_temp)
-
-# --- 모든 선수 지표 통합 계산 (임팩트 포함) ---
-# 1. 선수-팀 매핑 정보 확보
-player_team_map = df_att[['선수이름', '팀이름']].drop_duplicates().set_index('선수이름')['팀이름'].to_dict()
-
-# 2. 기초 데이터 병합 (출석 + 득점)
-att_counts = df_att_processed[df_att_processed['IsAttended'] == 1].groupby('선수이름')['WeekNum'].count().reset_index(name='출석횟수')
-df_players_base = pd.merge(att_counts, df_scorers.rename(columns={'Goals': '득점'}), left_on='선수이름', right_on='Player', how='outer').fillna(0)
-df_players_base['Player'] = df_players_base.apply(lambda x: x['선수이름'] if pd.notna(x['선수이름']) and x['선수이름'] != 0 else x['Player'], axis=1)
-df_players_base['Team'] = df_players_base['Player'].map(player_team_map)
-df_players_base = df_players_base[['Player', 'Team', '출석횟수', '득점']].reset_index(drop=True)
-
-# 3. 상세 지표 계산 함수
-def calculate_full_player_metrics(player_name):
-    # 항상 14개의 요소를 반환해야 함 (순서 중요)
-    default_vals = [0.0] * 14
-    
-    my_team = player_team_map.get(player_name)
-    att_rows = df_att_processed[(df_att_processed['선수이름'] == player_name) & (df_att_processed['IsAttended'] == 1)]
-    
-    if att_rows.empty or not my_team:
-        return pd.Series(default_vals)
-    
-    present_weeks = att_rows['WeekNum'].unique().astype(int)
-    all_weeks = sorted(df_history['Week'].unique())
-    absent_weeks = [w for w in all_weeks if w not in present_weeks]
-    
-    # 출전 시 성적
-    p_pts_df = team_points_by_week[(team_points_by_week['Week'].isin(present_weeks)) & (team_points_by_week['Team'] == my_team)]['PointsGained']
-    p_gf_df = df_weekly_gf[(df_weekly_gf['Week'].isin(present_weeks)) & (df_weekly_gf['Team'] == my_team)]['GF']
-    p_ga_df = df_weekly_ga[(df_weekly_ga['Week'].isin(present_weeks)) & (df_weekly_ga['Team'] == my_team)]['GA']
-    
-    avg_p_pts = p_pts_df.mean() if not p_pts_df.empty else 0.0
-    avg_p_gf = p_gf_df.mean() if not p_gf_df.empty else 0.0
-    avg_p_ga = p_ga_df.mean() if not p_ga_df.empty else 0.0
-    
-    # 결장 시 성적
-    a_pts_df = team_points_by_week[(team_points_by_week['Week'].isin(absent_weeks)) & (team_points_by_week['Team'] == my_team)]['PointsGained']
-    a_gf_df = df_weekly_gf[(df_weekly_gf['Week'].isin(absent_weeks)) & (df_weekly_gf['Team'] == my_team)]['GF']
-    a_ga_df = df_weekly_ga[(df_weekly_ga['Week'].isin(absent_weeks)) & (df_weekly_ga['Team'] == my_team)]['GA']
-    
-    avg_a_pts = a_pts_df.mean() if not a_pts_df.empty else 0.0
-    avg_a_gf = a_gf_df.mean() if not a_gf_df.empty else 0.0
-    avg_a_ga = a_ga_df.mean() if not a_ga_df.empty else 0.0
+def table_html(key, df, label, **options):
+    """
+    compact 테이블 HTML (스냅샷 섹션 캐시에 데이터 버전마다 한 번만 생성하여 재사용)
     
-    return pd.Series([
-        p_pts_df.sum(), p_ga_df.sum(), p_gf_df.sum(), # 누적 합계 (3)
-        avg_p_pts, avg_p_ga, avg_p_gf,             # 출전 평균 (3)
-        avg_a_pts, avg_a_ga, avg_a_gf,             # 결장 평균 (3)
-        avg_p_pts - avg_a_pts, avg_p_gf - avg_a_gf, avg_p_ga - avg_a_ga, # 임팩트 (3)
-        float(len(present_weeks)), float(len(absent_weeks)) # 주차수 (2)
-    ])
-
-# 4. 전체 선수에 대해 지표 적용 (인덱스 정렬 유지)
-metrics_data = []
-for p_name in df_players_base['Player']:
-    metrics_data.append(calculate_full_player_metrics(p_name))
-
-metrics_df = pd.DataFrame(metrics_data)
-metrics_df.columns = [
-    '팀승점합계', '팀실점합계', '팀득점합계',
-    '출전_평균승점', '출전_평균실점', '출전_평균득점',
-    '결장_평균승점', '결장_평균실점', '결장_평균득점',
-    '임팩트_승점', '임팩트_득점', '임팩트_실점',
-    '출석주차수', '결장주차수'
-]
+    key는 스냅샷 안에서 테이블을 구분하는 이름, label은 페이로드 집계용 테이블 종류입니다.
+    """
+    html = league.section(f'html:{key}', lambda: df_to_html_table(df, compact=True, **options))
+    record_payload(label, html)
+    return html
 
-# 인덱스를 기준으로 완벽하게 합침
-df_players_all = pd.concat([df_players_base, metrics_df], axis=1)
-df_players_all['경기당 득점'] = (df_players_all['득점'] / df_players_all['출석횟수'].replace(0, 1)).fillna(0)
+def build_rank_bump_figure():
+    """주차별 순위 변동 (bump chart, 스냅샷의 주차별 누적 순위표 사용)"""
+    with span('plotly_figure', metric='rank_bump'):
+        df_rank = league.standings_by_week
+        n_teams = len(all_teams_raw)
+        fig = go.Figure()
+        for team in all_teams_raw:
+            team_data = df_rank[df_rank['Team'] == team]
+            fig.add_trace(
+                go.Scatter(
+                    x=team_data['Week'],
+                    y=team_data['Rank'],
+                    name=display_team_map.get(team, team),
+                    line=dict(color=team_colors[team], width=4),
+                    marker=dict(size=12),
+                    mode='lines+markers',
+                    customdata=team_data[['Points', 'GD']],
+                    hovertemplate='%{x}주차 %{y}위 (승점 %{customdata[0]}, 득실차 %{customdata[1]})'
+                )
+            )
+        
+        fig.update_xaxes(title_text="주차", tickmode='linear', dtick=1)
+        fig.update_yaxes(title_text="순위", tickmode='linear', dtick=1, range=[n_teams + 0.5, 0.5])  # 1위가 위쪽
+        fig.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font_color='#212529',
+            hovermode='x unified',
+            height=350
+        )
+        return fig
 
-tab1, tab2, tab5, tab3, tab4, tab6 = st.tabs(["🏆 종합 순위", "🏃 개인 기록", "🌟 개인 임팩트", "📈 팀 트렌드", "📊 개인 상세", "📅 주차별 출석표"])
+# 선택된 탭만 실행 (on_change="rerun"이면 각 탭의 .open으로 현재 탭 여부 확인)
+tab1, tab2, tab5, tab3, tab4, tab6 = st.tabs(
+    ["🏆 종합 순위", "🏃 개인 기록", "🌟 개인 임팩트", "📈 팀 트렌드", "📊 개인 상세", "📅 주차별 출석표"],
+    key="main_tab",
+    on_change="rerun"
+)
 
 # ==========================================
 # 탭 1: 종합 순위
 # ==========================================
 with tab1:
-    st.subheader("종합 순위")
-    
-    # 순위표 표시
-    df_teams_display = df_teams.copy()
-    df_teams_display['Team'] = df_teams_display['Team'].map(team_short_map)
-    df_teams_display = df_teams_display.rename(columns={
-        'Team': '팀',
-        'Points': '승점',
-        'Played': '경기수',
-        'W': '승',
-        'D': '무',
-        'L': '패',
-        'GF': '득점',
-        'GA': '실점',
-        'GD': '득실차'
-    })
-    
-    display_cols = ['팀', '승점', '경기수', '승', '무', '패', '득점', '실점', '득실차']
-    st.markdown(df_to_html_table(df_teams_display[display_cols].reset_index(drop=True)), unsafe_allow_html=True)
-    
-    # 경기 결과 원본 데이터
-    st.markdown("---")
-    st.markdown("### 📋 경기 결과 상세")
-    
-    # 경기 결과 원본 데이터 표시
-    df_match_display = df_match.copy()
-    
-    # 주차별로 그룹화하여 표시
-    for week in sorted(df_match_display['주차'].unique(), reverse=True):
-        with st.expander(f"**{week}주차 경기 결과**", expanded=(week == df_match_display['주차'].max())):
-            week_data = df_match_display[df_match_display['주차'] == week].copy()
-            
-            # 각 라운드별 처리하여 승/무/패 표시
-            formatted_data = []
-            for _, row in week_data.iterrows():
-                round_num = int(row['라운드'])
-                
-                # 각 팀의 결과 정보 생성
-                res_row = {'라운드': round_num}
-                
-                # 모든 팀의 점수 미리 계산
-                team_scores = {}
-                for team in all_teams_raw:
-                    if team in row:
-                        team_scores[team] = count_goals(row[team])
-                
-                for team in all_teams_raw:
-                    # 표 헤더용 짧은 이름 사용
-                    short_name = team_short_map.get(team, team)
-                    if team in row:
-                        my_goals = team_scores[team]
-                        if my_goals is None:
-                            res_row[short_name] = '-'
-                            continue
-                            
-                        my_scorers = get_scorers_list(row[team])
-                        opp_scores = [v for k, v in team_scores.items() if k != team and v is not None]
-                        max_opp = max(opp_scores) if opp_scores else 0
-                        
-                        # 득점자 명단 가공 (이름+득점수 형식)
-                        from collections import Counter
-                        scorer_counts = Counter(my_scorers)
-                        formatted_scorers = []
-                        # Counter는 순서가 보장되지 않을 수 있으므로 원래 리스트의 순서를 최대한 유지하거나 이름순 정렬
-                        for name in dict.fromkeys(my_scorers): # 순서 유지를 위한 dict.fromkeys
-                            count = scorer_counts[name]
-                            if count > 1:
-                                formatted_scorers.append(f"{name}{count}")
-                            else:
-                                formatted_scorers.append(name)
-                        
-                        scorers_text = f" ({', '.join(formatted_scorers)})" if formatted_scorers else ""
-                        
-                        # 승패 결과에 따른 배지 및 색상 설정
-                        if my_goals > max_opp:
-                            status_html = "<div style='color: #d63384; font-weight: 800; font-size: 1.1em;'>승</div>"
-                        elif my_goals == max_opp:
-                            status_html = "<div style='color: #6c757d; font-weight: 800; font-size: 1.1em;'>무</div>"
-                        else:
-                            status_html = "<div style='color: #212529; font-weight: 400; font-size: 1.1em;'>패</div>"
-                            
-                        result_detail_html = f"<div style='margin-top: 4px; font-weight: 500;'>{my_goals}득점<span style='font-size: 0.85em; color: #6c757d;'>{scorers_text}</span></div>"
-                        
-                        res_row[short_name] = f"<div>{status_html}{result_detail_html}</div>"
-                    else:
-                        res_row[short_name] = '-'
-                
-                formatted_data.append(res_row)
-            
-            # DataFrame 생성
-            formatted_df = pd.DataFrame(formatted_data)
-            
-            # 주차별 승점 합계 계산
-            week_points = df_history[df_history['Week'] == week].groupby('Team')['PointsGained'].sum()
-            
-            # 승점 합계 row 추가
-            points_row = {'라운드': '승점 합계'}
-            for team in all_teams_raw:
-                # 합계 행에서도 짧은 이름 사용
-                short_name = team_short_map.get(team, team)
-                points_row[short_name] = int(week_points.get(team, 0))
-            
-            formatted_df = pd.concat([formatted_df, pd.DataFrame([points_row])], ignore_index=True)
-            
-            # 경기 결과 테이블 - 헤더는 중앙, 값은 왼쪽 정렬
-            st.markdown(df_to_html_table(formatted_df.set_index('라운드'), match_result=True), unsafe_allow_html=True)
+    if tab1.open:
+        standings_table, match_tables = league.section('standings', lambda: standings_view(league))
+        standings_by_week = league.section('standings_by_week', lambda: standings_by_week_view(league))
+        
+        st.subheader("종합 순위")
+        
+        # 주차 슬라이더: 미리 만든 주차별 순위표 중 하나를 선택 (재계산 없음)
+        standings_weeks = list(standings_by_week)
+        selected_week = standings_weeks[-1] if standings_weeks else None
+        if len(standings_weeks) > 1:
+            selected_week = st.select_slider(
+                "기준 주차", options=standings_weeks, value=standings_weeks[-1],
+                format_func=lambda w: f"{w}주차", key="standings_week"
+            )
+        standings_key = 'standings'
+        if selected_week is not None and selected_week != standings_weeks[-1]:
+            st.caption(f"{selected_week}주차 경기까지 반영한 순위입니다.")
+            standings_table = standings_by_week[selected_week]
+            standings_key = f'standings:{selected_week}'
+        st.markdown(table_html(standings_key, standings_table, 'standings'), unsafe_allow_html=True)
+        
+        if len(standings_weeks) > 1:
+            st.markdown("### 🔀 주차별 순위 변동")
+            st.plotly_chart(league.section('rank_bump', build_rank_bump_figure), width='stretch')
+        
+        # 남은 시즌 몬테카를로 시뮬레이션 (데이터 버전마다 한 번만 계산)
+        title_odds = league.section('title_odds', lambda: title_odds_view(league))
+        st.markdown("### 🎲 최종 순위 확률")
+        if title_odds is not None:
+            odds_table, remaining_weeks, remaining_rounds, n_seasons = title_odds
+            st.caption(f"팀별 득점/실점률로 남은 {remaining_weeks}주차({remaining_rounds}라운드)를 {n_seasons:,}번 시뮬레이션한 결과입니다.")
+            st.markdown(table_html('title_odds', odds_table, 'title_odds'), unsafe_allow_html=True)
+        else:
+            st.info("남은 주차가 없어 최종 순위 확률을 계산하지 않았습니다. 시즌 전체 주차 수는 출석 시트의 주차 컬럼 수를 사용하며, "
+                    "시즌이 끝나지 않았다면 환경 변수 `SEASON_WEEKS`로 전체 주차 수를 지정하세요.")
+        
+        # 경기 결과 원본 데이터
+        st.markdown("---")
+        st.markdown("### 📋 경기 결과 상세")
+        
+        latest_week = league.events.weeks.max()
+        for week, match_table in match_tables:
+            with st.expander(f"**{week}주차 경기 결과**", expanded=(week == latest_week)):
+                # 경기 결과 테이블 - 헤더는 중앙, 값은 왼쪽 정렬
+                st.markdown(table_html(f'match_detail:{week}', match_table, 'match_detail', match_result=True), unsafe_allow_html=True)
 
 # ==========================================
 # 탭 2: 개인 기록
 # ==========================================
 with tab2:
-    # 랭킹 표시 공통 헬퍼 함수
-    def display_personal_rankings(df, sort_col, title, caption, rename_map, display_cols, is_ascending=False, teams=all_teams_raw):
-        st.subheader(title)
-        st.caption(caption)
-        
-        # 1. 전체 TOP 10
-        df_overall = df.sort_values(by=sort_col, ascending=is_ascending).head(10).reset_index(drop=True)
-        df_overall.index += 1
-        df_overall_disp = df_overall.copy()
-        df_overall_disp['Team'] = df_overall_disp['Team'].map(team_short_map)
-        st.markdown(f"**전체 순위**")
-        st.markdown(df_to_html_table(df_overall_disp[display_cols].rename(columns=rename_map)), unsafe_allow_html=True)
-        
-        # 2. 팀별 TOP 5
-        st.markdown(f"**팀별 순위 (Top 5)**")
-        t_cols = st.columns(len(teams))
-        for i, t_raw in enumerate(teams):
-            with t_cols[i]:
-                st.markdown(f"**{display_team_map.get(t_raw)}**")
-                t_df = df[df['Team'] == t_raw].sort_values(by=sort_col, ascending=is_ascending).head(5).reset_index(drop=True)
-                t_df.index += 1
-                # 팀별 표에는 팀 이름을 뺌
-                t_disp_cols = [c for c in display_cols if c != 'Team']
-                t_rename_map = {k: v for k, v in rename_map.items() if k != 'Team'}
-                st.markdown(df_to_html_table(t_df[t_disp_cols].rename(columns=t_rename_map)), unsafe_allow_html=True)
-        st.markdown("---")
-
-    # 1. Golden Boot
-    display_personal_rankings(
-        df_players_all, 
-        sort_col='득점', 
-        title="👟 Golden Boot (Top 10)", 
-        caption="리그 최고의 득점 기계! 가장 많은 득점을 기록한 주인공입니다.",
-        rename_map={'Player': '선수', 'Team': '팀', '득점': '득점'},
-        display_cols=['Player', '득점', 'Team']
-    )
-    
-    # 2. 아이언 맨
-    display_personal_rankings(
-        df_players_all, 
-        sort_col='출석횟수', 
-        title="🦸 아이언 맨 (Top 10)", 
-        caption="리그의 기둥! 성실함의 상징, 철의 체력으로 모든 경기를 함께합니다.",
-        rename_map={'Player': '선수', 'Team': '팀', '출석횟수': '출석횟수'},
-        display_cols=['Player', '출석횟수', 'Team']
-    )
-
-    # 3. 가성비 스트라이커
-    df_eff_base = df_players_all[df_players_all['출석횟수'] > 0].copy()
-    df_eff_base['출석 당 득점_disp'] = df_eff_base['경기당 득점'].apply(lambda x: f'{x:.2f}')
-    display_personal_rankings(
-        df_eff_base, 
-        sort_col='경기당 득점', 
-        title="⚡ 가성비 스트라이커 (Top 10)", 
-        caption="최강의 효율! 적은 기회도 놓치지 않고 득점으로 연결하는 해결사입니다. (득점/출석횟수)",
-        rename_map={'Player': '선수', 'Team': '팀', '출석 당 득점_disp': '출석 당 득점', '득점': '개인득점', '출석횟수': '출석'},
-        display_cols=['Player', '출석 당 득점_disp', '득점', '출석횟수', 'Team']
-    )
-    
-    # 4. 승리 요정
-    df_lucky_base = df_players_all[df_players_all['출석횟수'] > 0].copy()
-    df_lucky_base['출석 당 팀승점_disp'] = df_lucky_base['출전_평균승점'].apply(lambda x: f'{x:.2f}')
-    display_personal_rankings(
-        df_lucky_base, 
-        sort_col='출전_평균승점', 
-        title="🧚 승리 요정 (Top 10)", 
-        caption="승리의 부적! 내가 경기에 나서는 것만으로도 팀의 승리 확률이 올라갑니다. (나올 때 팀 평균 승점)",
-        rename_map={'Player': '선수', 'Team': '팀', '출석 당 팀승점_disp': '출석 당 팀승점', '팀승점합계': '누적 팀승점', '출석횟수': '출석'},
-        display_cols=['Player', '출석 당 팀승점_disp', '팀승점합계', '출석횟수', 'Team']
-    )
-    
-    # 5. 득점 폭격기
-    df_gf_base = df_players_all[df_players_all['출석횟수'] > 0].copy()
-    df_gf_base['출석 당 팀득점_disp'] = df_gf_base['출전_평균득점'].apply(lambda x: f'{x:.2f}')
-    display_personal_rankings(
-        df_gf_base, 
-        sort_col='출전_평균득점', 
-        title="🚀 득점 폭격기 (Top 10)", 
-        caption="공격의 불씨! 내가 그라운드에 있으면 팀 전체의 화력이 불을 뿜습니다. (나올 때 팀 평균 득점)",
-        rename_map={'Player': '선수', 'Team': '팀', '출석 당 팀득점_disp': '출석 당 팀득점', '팀득점합계': '누적 팀 득점', '출석횟수': '출석'},
-        display_cols=['Player', '출석 당 팀득점_disp', '팀득점합계', '출석횟수', 'Team']
-    )
-    
-    # 6. 통곡의 벽
-    df_shield_base = df_players_all[df_players_all['출석횟수'] > 0].copy()
-    df_shield_base['출석 당 팀실점_disp'] = df_shield_base['출전_평균실점'].apply(lambda x: f'{x:.2f}')
-    display_personal_rankings(
-        df_shield_base, 
-        sort_col='출전_평균실점', 
-        title="🧱 통곡의 벽 (Bottom 10)", 
-        caption="철통 보안! 상대 공격수들을 절망에 빠뜨리는 든든한 수비의 핵심입니다. (나올 때 팀 평균 실점)",
-        rename_map={'Player': '선수', 'Team': '팀', '출석 당 팀실점_disp': '출석 당 팀실점', '팀실점합계': '누적 팀실점', '출석횟수': '출석'},
-        display_cols=['Player', '출석 당 팀실점_disp', '팀실점합계', '출석횟수', 'Team'],
-        is_ascending=True # 실점은 낮은게 좋은 순위
-    )
+    if tab2.open:
+        for title, caption, overall_table, team_tables in league.section('personal', lambda: personal_view(league)):
+            st.subheader(title)
+            st.caption(caption)
+            
+            # 1. 전체 TOP 10
+            st.markdown(f"**전체 순위**")
+            st.markdown(table_html(f'personal:{title}', overall_table, 'personal_rankings'), unsafe_allow_html=True)
+            
+            # 2. 팀별 TOP 5
+            st.markdown(f"**팀별 순위 (Top 5)**")
+            t_cols = st.columns(len(team_tables))
+            for i, (t_raw, team_table) in enumerate(team_tables):
+                with t_cols[i]:
+                    st.markdown(f"**{display_team_map.get(t_raw)}**")
+                    st.markdown(table_html(f'personal:{title}:{t_raw}', team_table, 'personal_rankings'), unsafe_allow_html=True)
+            st.markdown("---")
 
 # ==========================================
 # 탭 3: 트렌드 분석
 # ==========================================
-with tab3:
-    st.subheader("📊 주차별 추이 분석")
-    
-    all_weeks = sorted(df_history['Week'].unique())
-    teams_list = all_teams_raw
-    
-    # ========== 1. 승점 복합 그래프 ==========
-    st.markdown("### 🏆 승점 추이 (주차별 + 누적)")
-    
-    # 주차별 승점 데이터 준비
-    weekly_points_data = []
-    cumulative_points_data = []
-    
-    for team in teams_list:
-        cum_points = 0
-        for w in all_weeks:
-            week_p = df_history[(df_history['Week'] == w) & (df_history['Team'] == team)]['PointsGained'].sum()
-            cum_points += week_p
-            weekly_points_data.append({'Week': w, 'Team': team, 'Points': week_p})
-            cumulative_points_data.append({'Week': w, 'Team': team, 'CumulativePoints': cum_points})
-    
-    df_weekly_points = pd.DataFrame(weekly_points_data)
-    df_cumulative_points = pd.DataFrame(cumulative_points_data)
-    
-    # 이중 Y축 그래프 생성
+def build_trend_figure(df_trends, weekly_col, cum_col, metric_name):
+    """주차별 값(막대) + 누적 값(선) 이중 Y축 그래프"""
+    with span('plotly_figure', metric=metric_name):
+        return _build_trend_figure(df_trends, weekly_col, cum_col, metric_name)
+
+def _build_trend_figure(df_trends, weekly_col, cum_col, metric_name):
     from plotly.subplots import make_subplots
     
-    fig_points = make_subplots(specs=[[{"secondary_y": True}]])
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
     
-    # 막대 그래프 (주차별 승점)
-    for team in teams_list:
-        team_data = df_weekly_points[df_weekly_points['Team'] == team]
+    # 막대 그래프 (주차별)
+    for team in all_teams_raw:
+        team_data = df_trends[df_trends['Team'] == team]
         display_name = display_team_map.get(team, team)
-        fig_points.add_trace(
+        fig.add_trace(
             go.Bar(
                 x=team_data['Week'],
-                y=team_data['Points'],
+                y=team_data[weekly_col],
                 name=f'{display_name} (주차별)',
                 marker_color=team_colors[team],
                 opacity=0.6,
@@ -697,14 +453,14 @@ with tab3:
             secondary_y=False
         )
     
-    # 선 그래프 (누적 승점)
-    for team in teams_list:
-        team_data = df_cumulative_points[df_cumulative_points['Team'] == team]
+    # 선 그래프 (누적)
+    for team in all_teams_raw:
+        team_data = df_trends[df_trends['Team'] == team]
         display_name = display_team_map.get(team, team)
-        fig_points.add_trace(
+        fig.add_trace(
             go.Scatter(
                 x=team_data['Week'],
-                y=team_data['CumulativePoints'],
+                y=team_data[cum_col],
                 name=f'{display_name} (누적)',
                 line=dict(color=team_colors[team], width=3),
                 mode='lines+markers',
@@ -713,11 +469,11 @@ with tab3:
             secondary_y=True
         )
     
-    fig_points.update_xaxes(title_text="주차", tickmode='linear', dtick=1)
-    fig_points.update_yaxes(title_text="주차별 승점", secondary_y=False)
-    fig_points.update_yaxes(title_text="누적 승점", secondary_y=True)
+    fig.update_xaxes(title_text="주차", tickmode='linear', dtick=1)
+    fig.update_yaxes(title_text=f"주차별 {metric_name}", secondary_y=False)
+    fig.update_yaxes(title_text=f"누적 {metric_name}", secondary_y=True)
     
-    fig_points.update_layout(
+    fig.update_layout(
         barmode='group',
         plot_bgcolor='rgba(0,0,0,0)',
         paper_bgcolor='rgba(0,0,0,0)',
@@ -725,483 +481,155 @@ with tab3:
         hovermode='x unified',
         height=400
     )
-    
-    st.plotly_chart(fig_points, use_container_width=True)
-    
-    # ========== 2. 득점 복합 그래프 ==========
-    st.markdown("### ⚽ 득점 추이 (주차별 + 누적)")
-    
-    # 주차별 득점 계산
-    weekly_goals_data = []
-    cumulative_goals_data = []
-    
-    for team in teams_list:
-        cum_goals = 0
-        for w in all_weeks:
-            week_data = df_match[df_match['주차'] == w]
-            week_goals = 0
-            for _, row in week_data.iterrows():
-                goals = count_goals(row[team])
-                if goals is not None:
-                    week_goals += goals
-            
-            cum_goals += week_goals
-            weekly_goals_data.append({'Week': w, 'Team': team, 'Goals': week_goals})
-            cumulative_goals_data.append({'Week': w, 'Team': team, 'CumulativeGoals': cum_goals})
-    
-    df_weekly_goals = pd.DataFrame(weekly_goals_data)
-    df_cumulative_goals = pd.DataFrame(cumulative_goals_data)
-    
-    fig_goals = make_subplots(specs=[[{"secondary_y": True}]])
-    
-    # 막대 그래프 (주차별 득점)
-    for team in teams_list:
-        team_data = df_weekly_goals[df_weekly_goals['Team'] == team]
-        display_name = display_team_map.get(team, team)
-        fig_goals.add_trace(
-            go.Bar(
-                x=team_data['Week'],
-                y=team_data['Goals'],
-                name=f'{display_name} (주차별)',
-                marker_color=team_colors[team],
-                opacity=0.6,
-                width=0.25,
-                legendgroup=team
-            ),
-            secondary_y=False
-        )
-    
-    # 선 그래프 (누적 득점)
-    for team in teams_list:
-        team_data = df_cumulative_goals[df_cumulative_goals['Team'] == team]
-        display_name = display_team_map.get(team, team)
-        fig_goals.add_trace(
-            go.Scatter(
-                x=team_data['Week'],
-                y=team_data['CumulativeGoals'],
-                name=f'{display_name} (누적)',
-                line=dict(color=team_colors[team], width=3),
-                mode='lines+markers',
-                legendgroup=team
-            ),
-            secondary_y=True
-        )
-    
-    fig_goals.update_xaxes(title_text="주차", tickmode='linear', dtick=1)
-    fig_goals.update_yaxes(title_text="주차별 득점", secondary_y=False)
-    fig_goals.update_yaxes(title_text="누적 득점", secondary_y=True)
-    
-    fig_goals.update_layout(
-        barmode='group',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font_color='#212529',
-        hovermode='x unified',
-        height=400
-    )
-    
-    st.plotly_chart(fig_goals, use_container_width=True)
-    
-    # ========== 3. 실점 복합 그래프 ==========
-    st.markdown("### 🛡️ 실점 추이 (주차별 + 누적)")
-    
-    # 주차별 실점 계산
-    weekly_conceded_data = []
-    cumulative_conceded_data = []
-    
-    for team in teams_list:
-        cum_conceded = 0
-        for w in all_weeks:
-            week_data = df_match[df_match['주차'] == w]
-            week_conceded = 0
-            for _, row in week_data.iterrows():
-                my_goals = count_goals(row[team])
-                if my_goals is not None:
-                    for opp_team in teams_list:
-                        if opp_team != team:
-                            opp_goals = count_goals(row[opp_team])
-                            if opp_goals is not None:
-                                week_conceded += opp_goals
-            
-            cum_conceded += week_conceded
-            weekly_conceded_data.append({'Week': w, 'Team': team, 'Conceded': week_conceded})
-            cumulative_conceded_data.append({'Week': w, 'Team': team, 'CumulativeConceded': cum_conceded})
-    
-    df_weekly_conceded = pd.DataFrame(weekly_conceded_data)
-    df_cumulative_conceded = pd.DataFrame(cumulative_conceded_data)
-    
-    fig_conceded = make_subplots(specs=[[{"secondary_y": True}]])
-    
-    # 막대 그래프 (주차별 실점)
-    for team in teams_list:
-        team_data = df_weekly_conceded[df_weekly_conceded['Team'] == team]
-        display_name = display_team_map.get(team, team)
-        fig_conceded.add_trace(
-            go.Bar(
-                x=team_data['Week'],
-                y=team_data['Conceded'],
-                name=f'{display_name} (주차별)',
-                marker_color=team_colors[team],
-                opacity=0.6,
-                width=0.25,
-                legendgroup=team
-            ),
-            secondary_y=False
-        )
-    
-    # 선 그래프 (누적 실점)
-    for team in teams_list:
-        team_data = df_cumulative_conceded[df_cumulative_conceded['Team'] == team]
-        display_name = display_team_map.get(team, team)
-        fig_conceded.add_trace(
-            go.Scatter(
-                x=team_data['Week'],
-                y=team_data['CumulativeConceded'],
-                name=f'{display_name} (누적)',
-                line=dict(color=team_colors[team], width=3),
-                mode='lines+markers',
-                legendgroup=team
-            ),
-            secondary_y=True
-        )
-    
-    fig_conceded.update_xaxes(title_text="주차", tickmode='linear', dtick=1)
-    fig_conceded.update_yaxes(title_text="주차별 실점", secondary_y=False)
-    fig_conceded.update_yaxes(title_text="누적 실점", secondary_y=True)
-    
-    fig_conceded.update_layout(
-        barmode='group',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font_color='#212529',
-        hovermode='x unified',
-        height=400
-    )
-    
-    st.plotly_chart(fig_conceded, use_container_width=True)
-    
-    # ========== 4. 득실차 복합 그래프 ==========
-    st.markdown("### 📈 득실차 추이 (주차별 + 누적)")
-    
-    # 주차별 득실차 계산
-    weekly_gd_data = []
-    cumulative_gd_data = []
-    
-    for team in teams_list:
-        cum_gd = 0
-        for w in all_weeks:
-            # 해당 주차의 득점과 실점 가져오기
-            week_goals = df_weekly_goals[(df_weekly_goals['Week'] == w) & (df_weekly_goals['Team'] == team)]['Goals'].values[0]
-            week_conceded = df_weekly_conceded[(df_weekly_conceded['Week'] == w) & (df_weekly_conceded['Team'] == team)]['Conceded'].values[0]
-            week_gd = week_goals - week_conceded
-            
-            cum_gd += week_gd
-            weekly_gd_data.append({'Week': w, 'Team': team, 'GD': week_gd})
-            cumulative_gd_data.append({'Week': w, 'Team': team, 'CumulativeGD': cum_gd})
-    
-    df_weekly_gd = pd.DataFrame(weekly_gd_data)
-    df_cumulative_gd = pd.DataFrame(cumulative_gd_data)
-    
-    fig_gd = make_subplots(specs=[[{"secondary_y": True}]])
-    
-    # 막대 그래프 (주차별 득실차)
-    for team in teams_list:
-        team_data = df_weekly_gd[df_weekly_gd['Team'] == team]
-        display_name = display_team_map.get(team, team)
-        fig_gd.add_trace(
-            go.Bar(
-                x=team_data['Week'],
-                y=team_data['GD'],
-                name=f'{display_name} (주차별)',
-                marker_color=team_colors[team],
-                opacity=0.6,
-                width=0.25,
-                legendgroup=team
-            ),
-            secondary_y=False
-        )
-    
-    # 선 그래프 (누적 득실차)
-    for team in teams_list:
-        team_data = df_cumulative_gd[df_cumulative_gd['Team'] == team]
-        display_name = display_team_map.get(team, team)
-        fig_gd.add_trace(
-            go.Scatter(
-                x=team_data['Week'],
-                y=team_data['CumulativeGD'],
-                name=f'{display_name} (누적)',
-                line=dict(color=team_colors[team], width=3),
-                mode='lines+markers',
-                legendgroup=team
-            ),
-            secondary_y=True
+    return fig
+
+def build_elo_figure():
+    """라운드별 팀 레이팅 추이 (스냅샷의 Elo 원장, x축은 라운드 순번에 주차 눈금)"""
+    with span('plotly_figure', metric='elo'):
+        ledger = league.elo_ledger
+        fig = go.Figure()
+        for team in all_teams_raw:
+            team_data = ledger[ledger['Team'] == team]
+            fig.add_trace(
+                go.Scatter(
+                    x=team_data['Seq'],
+                    y=team_data['Rating'],
+                    name=display_team_map.get(team, team),
+                    line=dict(color=team_colors[team], width=3),
+                    mode='lines',
+                    customdata=team_data[['Week', 'Round', 'Delta']],
+                    hovertemplate='%{customdata[0]}주차 %{customdata[1]}라운드: %{y:.0f} (%{customdata[2]:+.1f})'
+                )
+            )
+        
+        # 주차 첫 라운드마다 눈금
+        week_starts = ledger.groupby('Week')['Seq'].min()
+        fig.update_xaxes(title_text="주차", tickmode='array', tickvals=week_starts.tolist(),
+                         ticktext=[f"{w}주차" for w in week_starts.index])
+        fig.update_yaxes(title_text="레이팅")
+        fig.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font_color='#212529',
+            hovermode='x unified',
+            height=400
         )
-    
-    fig_gd.update_xaxes(title_text="주차", tickmode='linear', dtick=1)
-    fig_gd.update_yaxes(title_text="주차별 득실차", secondary_y=False)
-    fig_gd.update_yaxes(title_text="누적 득실차", secondary_y=True)
-    
-    fig_gd.update_layout(
-        barmode='group',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font_color='#212529',
-        hovermode='x unified',
-        height=400
-    )
-    
-    st.plotly_chart(fig_gd, use_container_width=True)
+        return fig
+
+def build_trends_section():
+    """팀 트렌드 탭 데이터: 주차 x 팀 추이 테이블 한 번으로 만든 4개 그래프 + 레이팅 추이"""
+    df_trends = team_trends_view(league)
+    return [
+        ("### 🏆 승점 추이 (주차별 + 누적)", build_trend_figure(df_trends, 'Points', 'CumPoints', '승점')),
+        ("### ⚽ 득점 추이 (주차별 + 누적)", build_trend_figure(df_trends, 'GF', 'CumGF', '득점')),
+        ("### 🛡️ 실점 추이 (주차별 + 누적)", build_trend_figure(df_trends, 'GA', 'CumGA', '실점')),
+        ("### 📈 득실차 추이 (주차별 + 누적)", build_trend_figure(df_trends, 'GD', 'CumGD', '득실차')),
+        ("### 🧮 팀 레이팅 추이 (Elo, 라운드별)", build_elo_figure()),
+    ]
+
+with tab3:
+    if tab3.open:
+        st.subheader("📊 주차별 추이 분석")
+        
+        for chart_title, fig in league.section('trends', build_trends_section):
+            st.markdown(chart_title)
+            st.plotly_chart(fig, width='stretch')
 
 # ==========================================
 # 탭 4: 선수 상세 데이터
 # ==========================================
 with tab4:
-    st.subheader("📊 팀별 선수 상세 기록")
-    st.markdown("모든 지표를 한눈에 확인할 수 있는 통합 테이블입니다.")
-    
-    for t_raw in all_teams_raw:
-        display_name = display_team_map.get(t_raw, t_raw)
-        st.markdown(f"### {display_name}")
-        
-        df_team_players = df_players_all[df_players_all['Team'] == t_raw].copy()
+    if tab4.open:
+        st.subheader("📊 팀별 선수 상세 기록")
+        st.markdown("모든 지표를 한눈에 확인할 수 있는 통합 테이블입니다.")
         
-        # 컬럼 포맷팅
-        df_team_players = df_team_players.rename(columns={
-            'Player': '선수이름',
-            '출석횟수': '🦸 아이언맨(출석)',
-            '득점': '🎯 개인 득점',
-            '경기당 득점': '⚡ 출석 당 득점',
-            '출전_평균승점': '🧚 출석 당 팀승점',
-            '출전_평균득점': '🚀 출석 당 팀득점',
-            '출전_평균실점': '🧱 출석 당 팀실점',
-            '임팩트_승점': '🔥 승점 임팩트',
-            '임팩트_득점': '🚀 득점 임팩트',
-            '임팩트_실점': '🛡️ 실점 임팩트',
-            '팀승점합계': '팀 승점 합계',
-            '팀득점합계': '팀 득점 합계',
-            '팀실점합계': '팀 실점 합계'
-        })
-        
-        # 숫자 형식 정리
-        cols_to_format = ['⚡ 출석 당 득점', '🧚 출석 당 팀승점', '🚀 출석 당 팀득점', '🧱 출석 당 팀실점', '🔥 승점 임팩트', '🚀 득점 임팩트', '🛡️ 실점 임팩트']
-        for col in cols_to_format:
-            df_team_players[col] = df_team_players[col].apply(lambda x: f'{x:+.2f}')
-            
-        int_cols = ['🦸 아이언맨(출석)', '팀 승점 합계', '팀 득점 합계', '🎯 개인 득점', '팀 실점 합계']
-        for col in int_cols:
-            df_team_players[col] = df_team_players[col].fillna(0).astype(int)
-            
-        display_cols = [
-            '선수이름', '🦸 아이언맨(출석)', '팀 승점 합계', '팀 득점 합계', '팀 실점 합계',
-            '🎯 개인 득점', '⚡ 출석 당 득점', 
-            '🧚 출석 당 팀승점', '🚀 출석 당 팀득점', '🧱 출석 당 팀실점',
-            '🔥 승점 임팩트', '🚀 득점 임팩트', '🛡️ 실점 임팩트'
-        ]
-        
-        # 표 내부의 팀명은 이모지로 (이미 팀별 섹션이지만 컬럼이 남아있을 경우를 대비하거나 명시적 표시 시 사용)
-        if 'Team' in df_team_players.columns:
-            df_team_players['Team'] = df_team_players['Team'].map(team_short_map)
+        for t_raw, display_name, team_table in league.section('player_detail', lambda: player_detail_view(league)):
+            st.markdown(f"### {display_name}")
+            st.markdown(table_html(f'player_detail:{t_raw}', team_table, 'player_detail', scrollable=True), unsafe_allow_html=True)
+            st.markdown("<br>", unsafe_allow_html=True)
 
-        st.markdown(df_to_html_table(df_team_players[display_cols].sort_values(by='🦸 아이언맨(출석)', ascending=False).reset_index(drop=True), scrollable=True), unsafe_allow_html=True)
-        st.markdown("<br>", unsafe_allow_html=True)
 # ==========================================
 # 탭 5: 임팩트 분석
 # ==========================================
 with tab5:
-    st.subheader("🌟 임팩트 분석 (Game Changer)")
-    st.markdown("임팩트 = (내가 출전했을 때 팀 평균) - (내가 결장했을 때 팀 평균)")
-    
-    impact_data = df_players_all[(df_players_all['출석주차수'] > 0) & (df_players_all['결장주차수'] > 0)].copy()
-    
-    if impact_data.empty:
-        st.warning("아직 분석을 위한 충분한 데이터(출전 및 결장 기록)가 쌓이지 않았습니다.")
-    else:
-        # 공통 스타일 함수
-        def display_impact_rankings(df, target_col, title, caption, is_ascending=False, value_suffix=""):
-            st.markdown(f"### {title}")
-            st.caption(caption)
-            
-            # 1. 전체 랭킹 조회
-            top_n = 10
-            sorted_df = df.sort_values(by=target_col, ascending=is_ascending).head(top_n).reset_index(drop=True)
-            sorted_df.index += 1
-            
-            # 표시 컬럼 설정
-            # target_col 이 '임팩트_승점' 인 경우, '출전_평균승점', '결장_평균승점' 매칭
-            baseline = target_col.replace('임팩트_', '')
-            disp_cols = ['Player', target_col, f'출전_평균{baseline}', f'결장_평균{baseline}', 'Team']
-            disp_df = sorted_df[disp_cols].copy()
-            disp_df['Team'] = disp_df['Team'].map(team_short_map)
-            
-            # 컬럼명 정리
-            col_map = {
-                'Player': '선수', 'Team': '팀',
-                target_col: '🔥 임팩트',
-                f'출전_평균{baseline}': '출전 시(A)',
-                f'결장_평균{baseline}': '결장 시(B)'
-            }
-            disp_df = disp_df.rename(columns=col_map)
-            
-            # 포맷팅
-            format_cols = ['🔥 임팩트', '출전 시(A)', '결장 시(B)']
-            for c in format_cols:
-                disp_df[c] = disp_df[c].apply(lambda x: f'{x:+.2f}{value_suffix}')
-            
-            st.markdown(f"**전체 순위**")
-            st.markdown(df_to_html_table(disp_df), unsafe_allow_html=True)
-            
-            # 2. 팀별 랭킹 (Top 5)
-            st.markdown(f"**팀별 순위 (Top 5)**")
-            t_cols = st.columns(len(all_teams_raw))
-            for i, t_raw in enumerate(all_teams_raw):
-                with t_cols[i]:
-                    st.markdown(f"**{display_team_map.get(t_raw)}**")
-                    t_df = df[df['Team'] == t_raw].sort_values(by=target_col, ascending=is_ascending).head(5).reset_index(drop=True)
-                    t_df.index += 1
-                    
-                    baseline = target_col.replace('임팩트_', '')
-                    t_disp = t_df[['Player', target_col, f'출전_평균{baseline}', f'결장_평균{baseline}']].copy()
-                    
-                    col_map_t = {
-                        'Player': '선수',
-                        target_col: '🔥 임팩트',
-                        f'출전_평균{baseline}': '출전(A)',
-                        f'결장_평균{baseline}': '결장(B)'
-                    }
-                    t_disp = t_disp.rename(columns=col_map_t)
-                    
-                    # 소수점 포맷
-                    for c in ['🔥 임팩트', '출전(A)', '결장(B)']:
-                        t_disp[c] = t_disp[c].apply(lambda x: f'{x:+.2f}' if pd.notna(x) else '0.00')
-                        
-                    st.markdown(df_to_html_table(t_disp), unsafe_allow_html=True)
-            st.markdown("---")
-
-        # 1. 승점 임팩트
-        display_impact_rankings(impact_data, '임팩트_승점', "🏆 승점 임팩트 (승리 유전자)", "진정한 승리 전문가! 내가 경기에 나서는 것만으로도 팀의 승점 기대치가 이만큼 상승합니다.")
+    if tab5.open:
+        st.subheader("🌟 임팩트 분석 (Game Changer)")
+        st.markdown("임팩트 = (내가 출전했을 때 팀 평균) - (내가 결장했을 때 팀 평균)")
         
-        # 2. 득점 임팩트
-        display_impact_rankings(impact_data, '임팩트_득점', "⚽ 득점 임팩트 (공격의 핵)", "팀 화력의 기폭제! 내가 그라운드에 있을 때 우리 팀은 더 많은 득점을 기록하게 됩니다.")
+        impact_rankings = league.section('impact', lambda: impact_view(league))
         
-        # 3. 실점 임팩트 (Bottom 10/5)
-        display_impact_rankings(impact_data, '임팩트_실점', "🛡️ 실점 임팩트 (통곡의 벽)", "골문 최후의 보루! 내가 수비 중심을 잡으면 상대 팀의 득점 확률이 눈에 띄게 줄어듭니다.", is_ascending=True)
+        if impact_rankings is None:
+            st.warning("아직 분석을 위한 충분한 데이터(출전 및 결장 기록)가 쌓이지 않았습니다.")
+        else:
+            for title, caption, overall_table, team_tables in impact_rankings:
+                st.markdown(f"### {title}")
+                st.caption(caption)
+                
+                # 1. 전체 랭킹
+                st.markdown(f"**전체 순위**")
+                st.markdown(table_html(f'impact:{title}', overall_table, 'impact_rankings'), unsafe_allow_html=True)
+                
+                # 2. 팀별 랭킹 (Top 5)
+                st.markdown(f"**팀별 순위 (Top 5)**")
+                t_cols = st.columns(len(team_tables))
+                for i, (t_raw, team_table) in enumerate(team_tables):
+                    with t_cols[i]:
+                        st.markdown(f"**{display_team_map.get(t_raw)}**")
+                        st.markdown(table_html(f'impact:{title}:{t_raw}', team_table, 'impact_rankings'), unsafe_allow_html=True)
+                st.markdown("---")
+        
+        # 동료/상대를 함께 고려한 보정 플러스마이너스 (데이터 버전마다 한 번만 계산)
+        rapm_table = league.section('rapm', lambda: rapm_view(league))
+        if rapm_table is not None:
+            st.markdown("### 📐 보정 플러스마이너스 (RAPM)")
+            st.caption("같이 뛴 동료와 상대 팀 선수를 함께 고려하여 회귀로 추정한 라운드당 기여도입니다. "
+                       "구간은 주차 단위 부트스트랩으로 구한 추정 범위이며, 공격은 팀 득점, 수비는 상대 득점 억제 기여입니다.")
+            st.markdown(table_html('rapm', rapm_table, 'rapm'), unsafe_allow_html=True)
 
 
 # ==========================================
 # 탭 6: 주차별 출석표
 # ==========================================
 with tab6:
-    st.subheader("📅 주차별 출석표")
-    st.markdown("전체 선수의 주차별 출석 현황입니다. (✅: 출석, ❌: 결장)")
-    
-    # 주차 컬럼들 추출 (컬럼명에 '주차'가 포함된 것들)
-    week_cols = [c for c in df_att.columns if '주차' in c]
-    # 주차 숫자로 정렬 (1주차, 2주차, ..., 10주차 순서 보장)
-    import re
-    def extract_week_num(col_name):
-        match = re.search(r'(\d+)', col_name)
-        return int(match.group(1)) if match else 999
-    
-    week_cols = sorted(week_cols, key=extract_week_num)
-    
-    # 출석 인정 기준 값들
-    POSITIVE_VALS = ['1', '1.0', 'o', 'O', 'v', 'V', '참석', '출석', 'true', 'True']
-    NEGATIVE_VALS = ['0', '0.0', 'x', 'X', '불참', '결장', 'false', 'False']
-
-    def is_attended_val(val):
-        v = str(val).strip().lower()
-        if v in [pv.lower() for pv in POSITIVE_VALS]: return True
-        try:
-            if float(v) > 0: return True
-        except: pass
-        return False
-
-    # --- 팀별 출석률 요약 (최상단) ---
-    st.markdown("### 📊 팀별 출석률 요약")
-    team_att_summary = []
-    
-    for t_raw in all_teams_raw:
-        display_name = display_team_map.get(t_raw, t_raw)
-        df_team_att_raw = df_att[df_att['팀이름'].str.strip() == t_raw.strip()].copy()
-        
-        if df_team_att_raw.empty:
-            short_keyword = '레드' if '레드' in t_raw else '블루' if '블루' in t_raw else '옐로' if '옐로' in t_raw else t_raw
-            df_team_att_raw = df_att[df_att['팀이름'].str.contains(short_keyword)].copy()
-        
-        if df_team_att_raw.empty: continue
-        
-        total_players = len(df_team_att_raw)
-        row_data = {'팀이름': display_name}
-        week_rates = []
+    if tab6.open:
+        st.subheader("📅 주차별 출석표")
+        st.markdown("전체 선수의 주차별 출석 현황입니다. (✅: 출석, ❌: 결장)")
         
-        for col in week_cols:
-            attended_count = df_team_att_raw[col].apply(is_attended_val).sum()
-            rate = (attended_count / total_players * 100) if total_players > 0 else 0
-            row_data[col] = f"{rate:.2f}% ({attended_count}/{total_players})"
-            week_rates.append(rate)
-            
-        avg_rate = sum(week_rates) / len(week_rates) if week_rates else 0
-        row_data['평균출석률'] = f"{avg_rate:.2f}%"
-        team_att_summary.append(row_data)
-        
-    if team_att_summary:
-        df_summary = pd.DataFrame(team_att_summary)
-        # 컬럼 순서 조정: 팀이름, 평균출석률, 1주차, 2주차...
-        summary_cols = ['팀이름', '평균출석률'] + week_cols
-        st.markdown(df_to_html_table(df_summary[summary_cols]), unsafe_allow_html=True)
-        st.markdown("<br>", unsafe_allow_html=True)
+        df_summary, attendance_tables = league.section('attendance', lambda: attendance_view(league))
 
-    st.markdown("---")
-    st.markdown("### 📋 팀별 상세 출석부")
-    
-    for t_raw in all_teams_raw:
-        display_name = display_team_map.get(t_raw, t_raw)
-        st.markdown(f"### {display_name}")
-        
-        # 해당 팀 데이터 필터링 (팀이름이 다를 수 있으므로 포함 여부로 체크하거나 strip)
-        df_team_att = df_att[df_att['팀이름'].str.strip() == t_raw.strip()].copy()
-        
-        if df_team_att.empty:
-            # 혹시나 팀명이 정확히 안 맞을 경우를 대비해 키워드 검색
-            short_keyword = '레드' if '레드' in t_raw else '블루' if '블루' in t_raw else '옐로' if '옐로' in t_raw else t_raw
-            df_team_att = df_att[df_att['팀이름'].str.contains(short_keyword)].copy()
-            
-        if df_team_att.empty:
-            st.info(f"{display_name} 팀의 출석 데이터가 없습니다.")
-            continue
-            
-        # 출석 데이터 시각화 보정
-        plot_df = df_team_att.copy()
-        
-        # 누적 출석 횟수 계산 함수
-        def is_attended(val):
-            return is_attended_val(val)
+        # --- 팀별 출석률 요약 (최상단) ---
+        st.markdown("### 📊 팀별 출석률 요약")
+        if df_summary is not None:
+            st.markdown(table_html('attendance_summary', df_summary, 'attendance_summary'), unsafe_allow_html=True)
+            st.markdown("<br>", unsafe_allow_html=True)
 
-        # 각 행(선수)별로 출석률 및 횟수 계산
-        total_weeks = len(week_cols)
-        def format_cumulative(row):
-            count = sum(is_attended(v) for v in row)
-            percentage = (count / total_weeks * 100) if total_weeks > 0 else 0
-            return f"{percentage:.2f}%({count})"
-            
-        plot_df['출석률(출석횟수)'] = df_team_att[week_cols].apply(format_cumulative, axis=1)
+        st.markdown("---")
+        st.markdown("### 📋 팀별 상세 출석부")
         
-        for col in week_cols:
-            def format_att(val):
-                if is_attended(val):
-                    return '✅'
-                v = str(val).strip().lower()
-                if v in [nv.lower() for nv in NEGATIVE_VALS]:
-                    return '❌'
-                if v == '' or v == 'nan':
-                    return '-'
-                return '❌' if v.isdigit() else v
+        for t_raw, display_name, team_table in attendance_tables:
+            st.markdown(f"### {display_name}")
+            if team_table is None:
+                st.info(f"{display_name} 팀의 출석 데이터가 없습니다.")
+                continue
+            
+            # 테이블 출력
+            st.markdown(table_html(f'attendance:{t_raw}', team_table, 'attendance'), unsafe_allow_html=True)
+            st.markdown("<br>", unsafe_allow_html=True)
 
-            plot_df[col] = plot_df[col].apply(format_att)
-        
-        # 표시할 컬럼 (선수이름 + 출석률(출석횟수) + 모든 주차)
-        display_cols = ['선수이름', '출석률(출석횟수)'] + [c for c in week_cols if c in plot_df.columns]
-        
-        # 테이블 출력
-        st.markdown(df_to_html_table(plot_df[display_cols].reset_index(drop=True)), unsafe_allow_html=True)
-        st.markdown("<br>", unsafe_allow_html=True)
+# ==========================================
+# 성능 계측 패널 (디버그용, 숨김)
+# ==========================================
+if perf_trace is not None:
+    total_ms = perf_trace.elapsed_ms()
+    end_trace()
+    if show_perf_panel:
+        st.markdown("---")
+        with st.expander("⏱️ 성능 계측 (디버그)", expanded=True):
+            st.caption(f"trace {perf_trace.id} · 리런 전체 {total_ms:.1f} ms · 데이터 버전 {league.version}")
+            st.dataframe(pd.DataFrame(trace_rows(perf_trace)), hide_index=True, width='stretch')
+            st.markdown("**HTML 테이블 페이로드 (프로세스 누적)**")
+            st.dataframe(html_payload_report(), hide_index=True, width='stretch')
+            st.json({
+                'sheet_cache': get_sheet_cache_status(),
+                'sheet_watcher': sheet_watcher.status() if sheet_watcher else None,
+            }, expanded=False)
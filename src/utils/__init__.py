@@ -4,16 +4,50 @@ Utility modules for data processing
 
 from .data_loader import (
     load_data,
+    load_data_versioned,
+    get_sheet_cache_status,
+    add_sheet_update_hook,
+    refresh_sheets_now,
     process_match_results,
+    parse_scorer_cells,
+    get_team_columns,
     process_attendance,
     count_goals,
     get_scorers_list
 )
+from .attendance import AttendanceMatrix, build_attendance_matrix, is_attended_value
+from .events import MatchEvents, CellRecord, build_match_events, parse_cells
+from .incremental import IncrementalLeagueState
+from .sheets_client import SheetsClient, CircuitBreaker, CircuitOpenError, get_sheets_client
+from .snapshot import LeagueSnapshot, SnapshotRegistry, build_league_snapshot
+from .watcher import SheetWatcher
 
 __all__ = [
     'load_data',
+    'load_data_versioned',
+    'get_sheet_cache_status',
+    'add_sheet_update_hook',
+    'refresh_sheets_now',
     'process_match_results', 
+    'parse_scorer_cells',
+    'get_team_columns',
     'process_attendance',
     'count_goals',
-    'get_scorers_list'
+    'get_scorers_list',
+    'AttendanceMatrix',
+    'build_attendance_matrix',
+    'is_attended_value',
+    'MatchEvents',
+    'build_match_events',
+    'CellRecord',
+    'parse_cells',
+    'IncrementalLeagueState',
+    'SheetsClient',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'get_sheets_client',
+    'LeagueSnapshot',
+    'SnapshotRegistry',
+    'build_league_snapshot',
+    'SheetWatcher'
 ]
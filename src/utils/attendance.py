@@ -0,0 +1,97 @@
+"""
+출석 시트 정규화: 선수 x 주차 출석 행렬
+
+출석 셀 값('1', 'O', '참석', '1.0', 빈 값 등)을 서로 다른 값마다 한 번만 판정하여
+불리언 (선수 x 주차) 행렬로 바꿉니다. 출석 횟수, 출석률, 출석부 표 등
+모든 출석 집계가 같은 판정 규칙(is_attended_value)을 사용합니다.
+"""
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+
+# 출석/불참으로 인정하는 표시 값 (소문자 비교)
+ATTENDED_VALUES = frozenset(['1', '1.0', 'o', 'v', '참석', '출석', 'true'])
+ABSENT_VALUES = frozenset(['0', '0.0', 'x', '불참', '결장', 'false'])
+
+
+def is_attended_value(val):
+    """
+    출석 셀 값 하나의 출석 여부 (출석 표시 값이거나 0보다 큰 숫자)
+
+    비어 있지 않은 텍스트라도 출석 표시 값이 아니면('x', '불참' 등) 출석이 아닙니다.
+    """
+    v = str(val).strip().lower()
+    if v in ATTENDED_VALUES:
+        return True
+    try:
+        return float(v) > 0
+    except ValueError:
+        return False
+
+
+def map_unique_values(values, fn, na_result):
+    """
+    배열의 서로 다른 값마다 fn을 한 번만 호출하여 같은 모양의 결과 배열 반환
+
+    선수 x 주차 셀은 대부분 몇 가지 값('1', '0', 빈 값)의 반복이므로
+    셀마다 판정하는 대신 값 목록에서 한 번 계산한 결과를 인덱싱합니다. 결측값은 na_result.
+    """
+    values = np.asarray(values, dtype=object)
+    codes, uniques = pd.factorize(values.ravel())
+    results = np.empty(len(uniques) + 1, dtype=object)
+    results[:-1] = [fn(u) for u in uniques]
+    results[-1] = na_result
+    return results[codes].reshape(values.shape)
+
+
+def attendance_lookup(values):
+    """출석 셀 값 배열 -> 같은 모양의 출석 여부 배열 (bool)"""
+    return map_unique_values(values, is_attended_value, False).astype(bool)
+
+
+def week_columns(df_att):
+    """출석 시트의 주차 컬럼 (시트 순서)"""
+    return [c for c in df_att.columns if '주차' in c]
+
+
+@dataclass(frozen=True)
+class AttendanceMatrix:
+    """
+    정규화된 출석 기록 (읽기 전용)
+
+    - teams / players: 행(출석 시트 행)별 팀이름, 선수이름
+    - week_cols: 주차 컬럼명 (시트 순서)
+    - values: 행 x 주차 원본 셀 값 (object)
+    - attended: 행 x 주차 출석 여부 (bool)
+    """
+    teams: np.ndarray
+    players: np.ndarray
+    week_cols: tuple
+    values: np.ndarray
+    attended: np.ndarray
+
+    def counts(self, rows=None):
+        """선수(행)별 출석 횟수 (rows: 행 마스크 또는 위치)"""
+        attended = self.attended if rows is None else self.attended[rows]
+        return attended.sum(axis=1)
+
+    def week_slice(self, start, end=None):
+        """주차 구간 [start, end)만 담은 AttendanceMatrix"""
+        return replace(self, week_cols=self.week_cols[start:end], values=self.values[:, start:end],
+                       attended=self.attended[:, start:end])
+
+
+def build_attendance_matrix(df_att):
+    """출석 시트를 AttendanceMatrix로 정규화"""
+    week_cols = week_columns(df_att)
+    values = df_att[week_cols].to_numpy(dtype=object).reshape(len(df_att), len(week_cols))
+    return AttendanceMatrix(
+        teams=df_att['팀이름'].to_numpy(dtype=object),
+        players=df_att['선수이름'].to_numpy(dtype=object),
+        week_cols=tuple(week_cols),
+        values=values,
+        attended=attendance_lookup(values),
+    )
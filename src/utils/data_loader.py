@@ -1,68 +1,348 @@
 import pandas as pd
+import numpy as np
 import os
-import streamlit as st
+import io
+import time
+import hashlib
+import logging
+import threading
 
-def load_data_from_url():
-    """공개된 Google Sheets URL에서 데이터를 읽어옵니다. (Raw CSV 방식)"""
+from .sheets_client import get_sheets_client, reset_sheets_client
+from .disk_cache import save_sheet_cache, load_sheet_cache
+from .attendance import build_attendance_matrix
+from .events import build_match_events, parse_cells
+from .profiling import span
+
+logger = logging.getLogger(__name__)
+
+# ⚠️ gviz API의 타입 추론 오류를 피하기 위해 Raw Export API 사용
+# match_result (gid=1046780866), attendance (gid=1984754051)
+# SHEETS_BASE_URL로 다른 서버(예: benchmarks/sheets_stub_server.py)를 가리킬 수 있습니다.
+SHEETS_BASE_URL = os.getenv('SHEETS_BASE_URL', 'https://docs.google.com/spreadsheets')
+EXPORT_URL_TEMPLATE = "{base_url}/d/{doc_id}/export?format=csv&gid={gid}"
+MATCH_GID = '1046780866'
+ATTENDANCE_GID = '1984754051'
+
+# 캐시 유효 시간(초). 지나면 마지막 데이터를 즉시 반환하고 백그라운드에서 갱신합니다.
+CACHE_TTL_SECONDS = float(os.getenv('SHEETS_CACHE_TTL', '60'))
+
+# 모든 세션이 공유하는 시트 캐시 (프로세스 단위)
+_sheet_cache = {
+    'data': None,          # (df_match, df_att) 마지막 정상 데이터
+    'version': None,       # CSV 원본 바이트의 내용 해시
+    'fetched_at': 0.0,     # 마지막 갱신 시도 시각
+    'refreshing': False,   # 백그라운드 갱신 진행 여부
+    'last_error': None,    # 마지막 갱신 실패 사유
+    'source': None,        # 'network' 또는 'disk' (디스크 캐시에서 복원)
+    'origin': None,        # 데이터 출처 (sheet_origin, 다른 시트/서버의 데이터는 재사용하지 않음)
+    'disk_version': None,  # 디스크 캐시에 저장된 (출처, 버전) (같으면 다시 저장하지 않음)
+}
+_sheet_cache_lock = threading.Lock()
+
+# 새 버전을 캐시에 반영하기 직전에 호출할 함수들 (df_match, df_att, version)
+# 스냅샷을 미리 만들어 두면 교체 후 첫 요청도 계산을 기다리지 않습니다.
+_sheet_update_hooks = []
+
+def add_sheet_update_hook(fn):
+    """시트 내용이 바뀌어 새 버전이 반영되기 직전에 fn(df_match, df_att, version) 호출"""
+    with _sheet_cache_lock:
+        if fn not in _sheet_update_hooks:
+            _sheet_update_hooks.append(fn)
+
+def remove_sheet_update_hook(fn):
+    with _sheet_cache_lock:
+        if fn in _sheet_update_hooks:
+            _sheet_update_hooks.remove(fn)
+
+def _run_sheet_update_hooks(df_match, df_att, version):
+    with _sheet_cache_lock:
+        hooks = list(_sheet_update_hooks)
+    for fn in hooks:
+        try:
+            fn(df_match, df_att, version)
+        except Exception:
+            logger.exception("시트 갱신 훅 실행 실패")
+
+def _content_hash(*raw_parts):
+    """원본 바이트 묶음의 내용 해시 (데이터 버전 키로 사용)"""
+    h = hashlib.sha256()
+    for raw in raw_parts:
+        h.update(raw)
+        h.update(b'\0')
+    return h.hexdigest()[:16]
+
+def _parse_sheet_csv(raw_bytes):
+    """CSV 바이트를 문자열 DataFrame으로 변환합니다."""
+    # 모든 데이터를 문자열로 로드하여 데이터 유실 방지
+    df = pd.read_csv(io.BytesIO(raw_bytes), dtype=str).fillna('')
+    # 컬럼명 공백 제거
+    df.columns = [c.strip() for c in df.columns]
+    return df
+
+def export_url(doc_id, gid, base_url=None):
+    """시트 하나의 CSV export URL"""
+    base_url = (base_url or SHEETS_BASE_URL).rstrip('/')
+    return EXPORT_URL_TEMPLATE.format(base_url=base_url, doc_id=doc_id, gid=gid)
+
+def sheet_origin(doc_id, base_url=None):
+    """캐시 데이터의 출처 키 (시트 서버 주소 + 문서 ID)"""
+    base_url = (base_url or SHEETS_BASE_URL).rstrip('/')
+    return f'{base_url}/d/{doc_id}'
+
+def _fetch_sheets(doc_id):
+    """두 시트의 CSV 원본 바이트를 공유 세션으로 동시에 내려받습니다."""
+    urls = [export_url(doc_id, gid) for gid in [MATCH_GID, ATTENDANCE_GID]]
+    client = get_sheets_client()
+    with span('fetch_sheets') as s:
+        match_bytes, att_bytes = client.fetch_many(urls)
+        s['bytes'] = client.last_fetch.get('bytes_downloaded')
+        s['cache'] = 'hit' if client.last_fetch.get('not_modified') == len(urls) else 'miss'
+    return match_bytes, att_bytes
+
+def spreadsheet_doc_id(spreadsheet_url):
+    """구글 시트 URL에서 문서 ID 추출"""
+    return spreadsheet_url.split('/d/')[1].split('/')[0]
+
+def _refresh_sheet_cache(doc_id):
+    """
+    시트를 다시 받아 내용 해시가 바뀐 경우에만 파싱하여 캐시를 교체합니다.
+    
+    교체 직전에 갱신 훅을 실행하므로, 훅이 끝날 때까지 다른 세션은 이전 버전을 그대로 봅니다.
+    
+    Returns:
+        (version, changed)
+    """
+    origin = sheet_origin(doc_id)
+    match_bytes, att_bytes = _fetch_sheets(doc_id)
+    version = _content_hash(match_bytes, att_bytes)
+    
+    with _sheet_cache_lock:
+        unchanged = version == _sheet_cache['version'] and origin == _sheet_cache['origin']
+    
+    if not unchanged:
+        with span('parse_csv') as s:
+            df_match = _parse_sheet_csv(match_bytes)
+            df_att = _parse_sheet_csv(att_bytes)
+            
+            # '주차' 컬럼 기준 데이터 정제
+            if '주차' in df_match.columns:
+                df_match = df_match[df_match['주차'].str.strip() != ''].reset_index(drop=True)
+            s['rows'] = len(df_match) + len(df_att)
+        _run_sheet_update_hooks(df_match, df_att, version)
+    
+    with _sheet_cache_lock:
+        if not unchanged:
+            _sheet_cache['data'] = (df_match, df_att)
+            _sheet_cache['version'] = version
+            _sheet_cache['origin'] = origin
+        df_match, df_att = _sheet_cache['data']
+        fetched_at = time.time()
+        _sheet_cache['fetched_at'] = fetched_at
+        _sheet_cache['last_error'] = None
+        _sheet_cache['source'] = 'network'
+        needs_save = _sheet_cache['disk_version'] != (origin, version)
+    
+    # 다음 콜드 스타트/오프라인 대비 디스크에 저장 (디스크에 없는 버전일 때만, 실패해도 화면 표시에는 영향 없음)
+    if needs_save:
+        try:
+            save_sheet_cache(df_match, df_att, version, fetched_at, origin)
+        except Exception:
+            logger.exception("시트 디스크 캐시 저장 실패")
+        else:
+            with _sheet_cache_lock:
+                _sheet_cache['disk_version'] = (origin, version)
+    return version, not unchanged
+
+def _has_cached_data(origin):
+    """메모리 캐시에 origin 출처의 데이터가 있는지 (_sheet_cache_lock을 잡은 상태에서 호출)"""
+    return _sheet_cache['data'] is not None and _sheet_cache['origin'] == origin
+
+def _restore_from_disk(doc_id):
+    """같은 출처의 디스크 캐시가 있으면 메모리 캐시로 복원 (즉시 재검증되도록 갱신 시각은 0)"""
+    origin = sheet_origin(doc_id)
+    cached = load_sheet_cache(origin)
+    if cached is None:
+        return False
+    df_match, df_att, version, _ = cached
+    with _sheet_cache_lock:
+        if not _has_cached_data(origin):
+            _sheet_cache['data'] = (df_match, df_att)
+            _sheet_cache['version'] = version
+            _sheet_cache['origin'] = origin
+            _sheet_cache['fetched_at'] = 0.0
+            _sheet_cache['source'] = 'disk'
+        _sheet_cache['disk_version'] = (origin, version)
+    return True
+
+def _background_refresh(doc_id):
+    """
+    백그라운드 갱신 (실패해도 마지막 정상 데이터를 유지)
+    
+    Returns:
+        (version, changed) 또는 실패 시 None (사유는 last_error)
+    """
     try:
-        base_url = st.secrets["google_sheets"]["spreadsheet_url"]
-        doc_id = base_url.split('/d/')[1].split('/')[0]
-        
-        # ⚠️ gviz API의 타입 추론 오류를 피하기 위해 Raw Export API 사용
-        # match_result (gid=1046780866), attendance (gid=1984754051)
-        match_url = f"https://docs.google.com/spreadsheets/d/{doc_id}/export?format=csv&gid=1046780866"
-        att_url = f"https://docs.google.com/spreadsheets/d/{doc_id}/export?format=csv&gid=1984754051"
+        return _refresh_sheet_cache(doc_id)
+    except Exception as e:
+        with _sheet_cache_lock:
+            # 실패 시에도 TTL 동안은 재시도하지 않음
+            _sheet_cache['fetched_at'] = time.time()
+            _sheet_cache['last_error'] = str(e)
+        return None
+    finally:
+        with _sheet_cache_lock:
+            _sheet_cache['refreshing'] = False
+
+def refresh_sheets_now(spreadsheet_url):
+    """
+    요청과 무관하게 지금 시트를 확인 (백그라운드 감시용)
+    
+    다른 갱신이 이미 진행 중이면 건너뜁니다. 실패해도 마지막 정상 데이터는 유지됩니다.
+    
+    Returns:
+        (version, changed), 건너뛰었거나 실패했으면 None (실패 사유는 get_sheet_cache_status()['last_error'])
+    """
+    doc_id = spreadsheet_doc_id(spreadsheet_url)
+    with _sheet_cache_lock:
+        if _sheet_cache['refreshing']:
+            return None
+        _sheet_cache['refreshing'] = True
+    return _background_refresh(doc_id)
+
+def restore_sheets_from_disk(spreadsheet_url):
+    """
+    메모리 캐시가 비어 있으면 같은 시트의 디스크 캐시에서 복원 (서버 시작 직후 미리 채우기용)
+    
+    Returns:
+        (df_match, df_att, version) 또는 캐시가 없으면 None
+    """
+    doc_id = spreadsheet_doc_id(spreadsheet_url)
+    with _sheet_cache_lock:
+        has_data = _has_cached_data(sheet_origin(doc_id))
+    if not has_data and not _restore_from_disk(doc_id):
+        return None
+    with _sheet_cache_lock:
+        df_match, df_att = _sheet_cache['data']
+        return df_match, df_att, _sheet_cache['version']
+
+def _load_cached_sheets(doc_id, ttl=None):
+    """
+    Stale-while-revalidate 방식의 시트 로드
+    - 캐시가 비어 있으면 디스크 캐시에서 복원하고, 그것도 없으면 동기적으로 받아옴
+    - TTL이 지났으면 마지막 데이터를 즉시 반환하고 백그라운드에서 갱신
+    """
+    ttl = CACHE_TTL_SECONDS if ttl is None else ttl
+    
+    with span('sheet_cache') as s:
+        with _sheet_cache_lock:
+            has_data = _has_cached_data(sheet_origin(doc_id))
+        s['cache'] = 'memory'
+        if not has_data:
+            s['cache'] = 'disk'
+            if not _restore_from_disk(doc_id):
+                s['cache'] = 'miss'
+                _refresh_sheet_cache(doc_id)
         
-        # 모든 데이터를 문자열로 로드하여 데이터 유실 방지
-        df_match = pd.read_csv(match_url, dtype=str).fillna('')
-        df_att = pd.read_csv(att_url, dtype=str).fillna('')
+        with _sheet_cache_lock:
+            df_match, df_att = _sheet_cache['data']
+            version = _sheet_cache['version']
+            is_stale = time.time() - _sheet_cache['fetched_at'] >= ttl
+            start_refresh = is_stale and not _sheet_cache['refreshing']
+            if start_refresh:
+                _sheet_cache['refreshing'] = True
+        s['stale'] = is_stale
         
-        # 컬럼명 공백 제거
-        df_match.columns = [c.strip() for c in df_match.columns]
-        df_att.columns = [c.strip() for c in df_att.columns]
+        if start_refresh:
+            threading.Thread(target=_background_refresh, args=(doc_id,), daemon=True).start()
         
-        # '주차' 컬럼 기준 데이터 정제
-        if '주차' in df_match.columns:
-            df_match = df_match[df_match['주차'].str.strip() != ''].reset_index(drop=True)
-            
-        return df_match, df_att
+        # 캐시 원본은 여러 세션이 공유하므로 복사본을 반환
+        s['rows'] = len(df_match) + len(df_att)
+        return df_match.copy(), df_att.copy(), version
+
+def get_sheet_cache_status():
+    """시트 캐시 상태 (버전, 마지막 갱신 시각, 오류, 서킷 브레이커 상태) 조회"""
+    with _sheet_cache_lock:
+        status = {k: v for k, v in _sheet_cache.items() if k != 'data'}
+    status['breaker'] = get_sheets_client().breaker.status()
+    return status
+
+def reset_sheet_cache():
+    """메모리 시트 캐시와 공유 클라이언트 초기화 (디스크 캐시는 유지, 벤치마크/테스트용)"""
+    with _sheet_cache_lock:
+        _sheet_cache.update(data=None, version=None, fetched_at=0.0, refreshing=False,
+                            last_error=None, source=None, origin=None, disk_version=None)
+    reset_sheets_client()
+
+def load_data_from_url(spreadsheet_url=None, warn=None):
+    """공개된 Google Sheets URL에서 데이터를 읽어옵니다. (Raw CSV 방식, TTL 캐시 적용)"""
+    return _load_data_from_url_versioned(spreadsheet_url, warn)[:2]
+
+def _load_data_from_url_versioned(spreadsheet_url=None, warn=None):
+    warn = warn or logger.warning
+    origin = None
+    try:
+        if not spreadsheet_url:
+            raise ValueError("spreadsheet_url이 설정되지 않았습니다 (SPREADSHEET_URL 환경 변수 또는 secrets)")
+        doc_id = spreadsheet_doc_id(spreadsheet_url)
+        origin = sheet_origin(doc_id)
+        return _load_cached_sheets(doc_id)
     except Exception as e:
-        st.warning(f"Google Sheets 연결 실패 (로컬 데이터를 사용합니다): {e}")
-        return load_data_from_local()
+        # 같은 시트에서 마지막으로 받아 둔 데이터가 있으면 샘플 대신 사용
+        cached = load_sheet_cache(origin) if origin else None
+        if cached is not None:
+            df_match, df_att, version, fetched_at = cached
+            fetched_str = time.strftime('%Y-%m-%d %H:%M', time.localtime(fetched_at))
+            warn(f"Google Sheets 연결 실패 ({fetched_str}에 저장된 데이터를 사용합니다): {e}")
+            return df_match, df_att, version
+        warn(f"Google Sheets 연결 실패 (로컬 데이터를 사용합니다): {e}")
+        return _load_data_from_local_versioned()
 
 def load_data_from_local():
     """로컬 TSV 파일을 읽어서 DataFrame으로 반환합니다."""
+    return _load_data_from_local_versioned()[:2]
+
+def _load_data_from_local_versioned():
     current_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(os.path.dirname(current_dir))
     
     match_file = os.path.join(project_root, 'data', 'match_result_sample.tsv')
     att_file = os.path.join(project_root, 'data', 'attendance_sample.tsv')
     
-    df_match = pd.read_csv(match_file, sep='\t')
-    df_att = pd.read_csv(att_file, sep='\t')
+    with span('read_local') as s:
+        with open(match_file, 'rb') as f:
+            match_bytes = f.read()
+        with open(att_file, 'rb') as f:
+            att_bytes = f.read()
+        
+        df_match = pd.read_csv(io.BytesIO(match_bytes), sep='\t')
+        df_att = pd.read_csv(io.BytesIO(att_bytes), sep='\t')
+        s['rows'] = len(df_match) + len(df_att)
     
-    return df_match, df_att
+    return df_match, df_att, _content_hash(match_bytes, att_bytes)
 
-def load_data():
+def load_data(spreadsheet_url=None, warn=None):
     """
     데이터 로드 메인 함수.
-    1. st.secrets에 spreadsheet_url이 설정되어 있으면 구글 시트 우선 로드.
+    1. spreadsheet_url(또는 환경 변수 SPREADSHEET_URL)이 있으면 구글 시트 우선 로드.
     2. 환경 변수 USE_GOOGLE_SHEETS가 true여도 구글 시트 로드.
     3. 그 외에는 로컬 데이터 로드.
+    
+    warn: 시트 연결 실패 등 사용자에게 알릴 메시지를 받는 함수 (기본: logging 경고)
     """
+    return load_data_versioned(spreadsheet_url, warn)[:2]
+
+def load_data_versioned(spreadsheet_url=None, warn=None):
+    """
+    load_data와 동일하지만 (df_match, df_att, data_version)을 반환합니다.
+    data_version은 원본 바이트의 내용 해시로, 내용이 같으면 값이 같습니다.
+    """
+    spreadsheet_url = spreadsheet_url or os.getenv('SPREADSHEET_URL')
     use_url_env = os.getenv('USE_GOOGLE_SHEETS', 'false').lower() == 'true'
-    has_url_secret = False
-    
-    try:
-        if "google_sheets" in st.secrets and st.secrets["google_sheets"].get("spreadsheet_url"):
-            has_url_secret = True
-    except:
-        pass
 
-    if has_url_secret or use_url_env:
-        return load_data_from_url()
+    if spreadsheet_url or use_url_env:
+        return _load_data_from_url_versioned(spreadsheet_url, warn)
     else:
-        return load_data_from_local()
+        return _load_data_from_local_versioned()
 
 def count_goals(scorer_str):
     """
@@ -93,92 +373,156 @@ def get_scorers_list(scorer_str):
     scorers = [s.strip() for s in s_str.split(',')]
     return [s for s in scorers if s and '자살골' not in s and s not in ['0', '0.0']]
 
-def process_match_results(df_match):
-    """경기 결과 분석 (풀네임 대응)"""
-    # 1. 시트에서 실제 팀 컬럼 정식 명칭 찾기 (레드, 블루, 옐로 키워드 기준)
+# 순위표 통계 컬럼 (누적 순서)
+TEAM_STAT_COLS = ['Points', 'W', 'D', 'L', 'GF', 'GA', 'Played']
+
+def get_team_columns(df_match):
+    """시트에서 실제 팀 컬럼 정식 명칭 찾기 (레드, 블루, 옐로 키워드 기준)"""
     teams = []
     for col in df_match.columns:
         if any(keyword in str(col) for keyword in ['레드', '블루', '옐로']):
             teams.append(col)
+    return teams
+
+def parse_scorer_cells(values):
+    """
+    득점자 셀 배열을 한 번에 파싱 (count_goals / get_scorers_list의 벡터화 버전)
     
-    # 2. 통계 초기화
-    team_stats = {t: {'Points': 0, 'W': 0, 'D': 0, 'L': 0, 'GF': 0, 'GA': 0, 'Played': 0} for t in teams}
-    history_records = []
-    player_stats = {}
+    Returns:
+        goals: 셀별 득점 수 (np.ndarray, 미참여 셀은 0)
+        participated: 셀별 참여 여부 (np.ndarray[bool], count_goals가 None이 아닌 경우)
+        scorers: 득점자 이름 Series (index = 셀 위치, 셀 내 원래 순서 유지)
+    """
+    participated, goals, tokens = parse_cells(values)
+    credited = tokens[tokens['credited']]
+    scorers = pd.Series(credited['token'].to_numpy(dtype=object), index=credited['cell'].to_numpy())
+    return goals, participated, scorers
 
-    # 3. 라운드별 처리
-    for idx, row in df_match.iterrows():
-        week = row['주차']
-        scores = {}
-        participating = []
-        
-        # 각 팀의 득점 파싱 (우선 데이터가 있는 팀만 분류)
-        for team in teams:
-            val = row[team]
-            goals = count_goals(val)
-            if goals is not None:
-                scores[team] = goals
-                participating.append(team)
-        
-        # ⚠️ 최소 2개 팀 이상 참여해야 유효한 경기로 인정
-        if len(participating) < 2: 
-            continue
-            
-        # 유효한 경기인 경우에만 통계 산출 시작
-        for team in participating:
-            goals = scores[team]
-            # 팀 득점 누적
-            team_stats[team]['GF'] += goals
-            
-            # 선수 득점 누적 (자살골 제외 리스트 사용)
-            for p in get_scorers_list(row[team]):
-                player_stats[p] = player_stats.get(p, 0) + 1
-            
-            # 승무패 및 실점 판별
-            opponents = [scores[t] for t in participating if t != team]
-            max_opp = max(opponents) if opponents else 0
-            
-            team_stats[team]['GA'] += sum(opponents)
-            team_stats[team]['Played'] += 1
-            
-            p_gained = 0
-            if goals > max_opp:
-                team_stats[team]['W'] += 1
-                team_stats[team]['Points'] += 3
-                p_gained = 3
-            elif goals == max_opp:
-                team_stats[team]['D'] += 1
-                team_stats[team]['Points'] += 1
-                p_gained = 1
-            else:
-                team_stats[team]['L'] += 1
-            
-            history_records.append({'Week': week, 'Team': team, 'PointsGained': p_gained})
+def process_match_results(df_match, events=None):
+    """
+    경기 결과 분석 (풀네임 대응, 라운드 x 팀 배열 연산)
+    
+    events(MatchEvents)가 주어지면 시트를 다시 파싱하지 않고 그대로 사용합니다.
+    """
+    # 1. 시트에서 실제 팀 컬럼 정식 명칭 찾기 + 득점 이벤트로 정규화
+    if events is None:
+        events = build_match_events(df_match, get_team_columns(df_match))
+    teams = list(events.teams)
+    n_rounds, n_teams = events.n_rounds, len(teams)
+
+    # 2. 라운드 x 팀 경기 결과
+    results, valid_round = round_results(events.goal_matrix(), events.participated)
+    M = results['Played']
+    points = results['Points']
 
-    # 4. 결과 정리
-    df_teams = pd.DataFrame(team_stats).T.reset_index().rename(columns={'index': 'Team'})
+    # 3. 결과 정리
+    df_teams = build_team_table(teams, {col: results[col].sum(axis=0) for col in TEAM_STAT_COLS})
+
+    flat_mask = M.ravel()
+    df_history = pd.DataFrame({
+        'Week': np.repeat(events.weeks.astype(np.int64), n_teams)[flat_mask],
+        'Team': np.tile(np.array(teams, dtype=object), n_rounds)[flat_mask],
+        'PointsGained': points.ravel()[flat_mask].astype(np.int64),
+    })
+    
+    # 선수 득점 누적 (유효 경기만, 첫 득점 순서 유지)
+    scorer_events = events.scorer_events()
+    players = scorer_events['player'].cat.categories
+    codes = scorer_events['player'].cat.codes.to_numpy()[valid_round[scorer_events['round'].to_numpy()]]
+    counts = np.bincount(codes, minlength=len(players))
+    df_scorers = build_scorer_table({players[c]: int(counts[c]) for c in pd.unique(codes)})
+    
+    return df_teams, df_history, df_scorers
+
+def round_results(G, P):
+    """
+    라운드 x 팀 득점(G)/참여(P) 행렬 -> 라운드 x 팀 경기 결과
+
+    라운드끼리는 서로 영향을 주지 않으므로 일부 라운드만 넘겨도 결과가 같습니다.
+
+    Returns:
+        (results, valid_round)
+        results: TEAM_STAT_COLS별 라운드 x 팀 배열 (Played는 bool, 나머지는 정수)
+        valid_round: 라운드별 유효 경기 여부
+    """
+    n_teams = G.shape[1]
+
+    # ⚠️ 최소 2개 팀 이상 참여해야 유효한 경기로 인정
+    valid_round = P.sum(axis=1) >= 2
+    M = P & valid_round[:, None]
+
+    # 상대 팀 최다 득점 / 실점 (자기 자신 제외)
+    G_masked = np.where(P, G, -1)
+    if n_teams >= 2:
+        top2 = -np.sort(-G_masked, axis=1)[:, :2]
+        max_opp = np.where(G_masked == top2[:, [0]], top2[:, [1]], top2[:, [0]])
+    else:
+        max_opp = np.zeros_like(G)
+    opp_sum = np.where(P, G, 0).sum(axis=1, keepdims=True) - np.where(P, G, 0)
+
+    win = M & (G > max_opp)
+    draw = M & (G == max_opp)
+    loss = M & (G < max_opp)
+    results = {
+        'Points': np.where(win, 3, np.where(draw, 1, 0)),
+        'W': win,
+        'D': draw,
+        'L': loss,
+        'GF': np.where(M, G, 0),
+        'GA': np.where(M, opp_sum, 0),
+        'Played': M,
+    }
+    return results, valid_round
+
+def build_team_table(teams, stats):
+    """팀별 누적 통계(TEAM_STAT_COLS 순서의 배열 dict)로 순위표 생성"""
+    df_teams = pd.DataFrame({'Team': teams})
+    for col in TEAM_STAT_COLS:
+        df_teams[col] = np.asarray(stats[col]).astype(np.int64)
     df_teams['GD'] = df_teams['GF'] - df_teams['GA']
     df_teams = df_teams.sort_values(by=['Points', 'GD', 'GF'], ascending=False).reset_index(drop=True)
     df_teams.index += 1
-    
-    return df_teams, pd.DataFrame(history_records), pd.DataFrame(list(player_stats.items()), columns=['Player', 'Goals'])
+    return df_teams
 
-def process_attendance(df_att):
-    """출석 데이터 분석 (원본 이름 유지)"""
-    # 주차 컬럼 식별
-    week_cols = [c for c in df_att.columns if '주차' in c]
-    
-    # 데이터 구조 변환
-    df_melt = df_att.melt(id_vars=['팀이름', '선수이름'], value_vars=week_cols, var_name='WeekName', value_name='Attended')
-    df_melt['Attended'] = df_melt['Attended'].fillna(0)
+def build_scorer_table(player_goals):
+    """{선수: 득점} dict(첫 득점 순서)로 득점 테이블 생성"""
+    if not player_goals:
+        return pd.DataFrame([], columns=['Player', 'Goals'])
+    return pd.DataFrame({
+        'Player': np.array(list(player_goals.keys()), dtype=object),
+        'Goals': np.array(list(player_goals.values()), dtype=np.int64),
+    })
+
+def process_attendance(df_att, attendance=None):
+    """
+    출석 데이터 분석 (원본 이름 유지)
     
-    def check_att(val):
-        try:
-            if float(val) > 0: return 1
-        except:
-            if str(val).strip() != '': return 1
-        return 0
-        
-    df_melt['IsAttended'] = df_melt['Attended'].apply(check_att)
-    df_melt['WeekNum'] = df_melt['WeekName'].str.extract(r'(\d+)').astype(int)
-    return df_melt
+    출석 여부는 선수 x 주차 출석 행렬(attendance.build_attendance_matrix)에서 가져옵니다.
+    이미 만든 행렬이 있으면 attendance로 넘겨 다시 판정하지 않습니다.
+    """
+    if attendance is None:
+        attendance = build_attendance_matrix(df_att)
+    return add_attendance_flags(melt_attendance(df_att, list(attendance.week_cols)), attendance)
+
+def melt_attendance(df_att, week_cols):
+    """출석 시트 -> (팀이름, 선수이름, WeekName, Attended) long 테이블 (주차 컬럼 -> 선수 순서, 원본 값 그대로)"""
+    # 데이터 구조 변환 (주차 컬럼 -> 선수 순서, 출석 행렬의 전치와 같은 순서)
+    # melt와 같은 결과를 컬럼별 take/concat으로 직접 구성 (컬럼 dtype 유지)
+    if week_cols:
+        n_rows = len(df_att)
+        df_melt = df_att[['팀이름', '선수이름']].take(np.tile(np.arange(n_rows), len(week_cols))).reset_index(drop=True)
+        df_melt['WeekName'] = np.repeat(np.array(week_cols, dtype=object), n_rows)
+        df_melt['Attended'] = pd.concat([df_att[c] for c in week_cols], ignore_index=True)
+        return df_melt
+    return df_att.melt(id_vars=['팀이름', '선수이름'], value_vars=week_cols, var_name='WeekName', value_name='Attended')
+
+def add_attendance_flags(df_melt, attendance):
+    """melt_attendance 결과에 출석 여부(IsAttended)와 주차 번호(WeekNum)를 더한 새 테이블 (결측 Attended는 0)"""
+    week_cols = list(attendance.week_cols)
+    # 주차 번호는 컬럼별로 한 번만 추출
+    week_nums = pd.Series(week_cols, dtype=object).str.extract(r'(\d+)')[0].astype(int).to_numpy()
+    return df_melt.assign(
+        Attended=df_melt['Attended'].fillna(0),
+        IsAttended=attendance.attended.T.ravel().astype(np.int64),
+        WeekNum=np.repeat(week_nums, len(attendance.teams)),
+    )
@@ -0,0 +1,90 @@
+"""
+마지막 정상 시트 데이터의 디스크 캐시 (Arrow IPC)
+
+프로세스가 재시작되어도 네트워크를 기다리지 않고 바로 화면을 띄울 수 있도록
+마지막으로 받아온 (df_match, df_att)를 내용 해시/받은 시각과 함께 저장합니다.
+- 출처(시트 서버 주소 + 문서 ID)를 함께 저장하고, 다른 출처로 읽으면 캐시가 없는 것으로 봅니다.
+  (대역 서버나 다른 시트로 실행한 데이터가 실제 시트의 오프라인 대체로 쓰이지 않도록)
+- 프레임은 버전별 Arrow IPC 파일(비압축)로 저장하고 memory map으로 읽습니다.
+- meta.json을 마지막에 교체하므로 쓰는 도중 중단되어도 이전 캐시가 유지됩니다.
+"""
+
+import json
+import os
+import threading
+
+
+_project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DISK_CACHE_DIR = os.getenv('SHEETS_DISK_CACHE_DIR', os.path.join(_project_root, '.cache', 'sheets'))
+
+_META_FILE = 'meta.json'
+_disk_cache_lock = threading.Lock()
+
+
+def _frame_path(cache_dir, name, version):
+    return os.path.join(cache_dir, f'{name}_{version}.arrow')
+
+
+def _write_json_atomic(path, payload):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def save_sheet_cache(df_match, df_att, version, fetched_at, origin=None, cache_dir=None):
+    """정규화된 두 시트 프레임을 버전 키, 출처와 함께 저장 (같은 버전이면 받은 시각만 갱신)"""
+    # pyarrow는 캐시를 실제로 읽고 쓸 때만 import (엔진 import 비용 절감)
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    cache_dir = cache_dir or DISK_CACHE_DIR
+    with _disk_cache_lock:
+        os.makedirs(cache_dir, exist_ok=True)
+        for name, df in [('match', df_match), ('attendance', df_att)]:
+            path = _frame_path(cache_dir, name, version)
+            if os.path.exists(path):
+                continue
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            feather.write_feather(table, f'{path}.tmp', compression='uncompressed')
+            os.replace(f'{path}.tmp', path)
+
+        _write_json_atomic(os.path.join(cache_dir, _META_FILE),
+                           {'version': version, 'fetched_at': fetched_at, 'origin': origin})
+
+        # 이전 버전 파일 정리
+        keep = {os.path.basename(_frame_path(cache_dir, n, version)) for n in ['match', 'attendance']}
+        for fname in os.listdir(cache_dir):
+            if fname.endswith('.arrow') and fname not in keep:
+                try:
+                    os.remove(os.path.join(cache_dir, fname))
+                except OSError:
+                    pass
+
+
+def load_sheet_cache(origin=None, cache_dir=None):
+    """
+    저장된 마지막 정상 데이터 로드
+
+    Args:
+        origin: 기대하는 출처 (저장된 출처와 다르면 None)
+
+    Returns:
+        (df_match, df_att, version, fetched_at) 또는 캐시가 없거나 손상되었거나 출처가 다르면 None
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    cache_dir = cache_dir or DISK_CACHE_DIR
+    with _disk_cache_lock:
+        try:
+            with open(os.path.join(cache_dir, _META_FILE), encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('origin') != origin:
+                return None
+            version = meta['version']
+            df_match = feather.read_table(_frame_path(cache_dir, 'match', version), memory_map=True).to_pandas()
+            df_att = feather.read_table(_frame_path(cache_dir, 'attendance', version), memory_map=True).to_pandas()
+        except (OSError, ValueError, KeyError, pa.ArrowException):
+            return None
+    return df_match, df_att, version, meta.get('fetched_at', 0.0)
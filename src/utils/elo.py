@@ -0,0 +1,126 @@
+"""
+팀 Elo 레이팅 원장 (라운드 단위, 증분 갱신)
+
+라운드마다 참여한 팀끼리 서로 한 번씩 맞붙은 것으로 보고(다자 경기는 상대 팀별 쌍 결과)
+Elo 레이팅을 갱신하며, 모든 라운드 직후의 레이팅을 원장(ledger)에 보관합니다.
+- 쌍 결과: 득점이 많으면 1, 같으면 0.5, 적으면 0
+- 한 라운드의 변화량은 K x (실제 - 기대)의 상대 팀 평균 (상대 수와 관계없이 같은 크기)
+- 유효 경기(2개 팀 이상 참여)가 아닌 라운드는 레이팅이 바뀌지 않습니다.
+
+새 라운드가 추가되면 마지막 레이팅에서 이어서 계산하고,
+앞쪽 라운드가 수정된 경우에만 그 라운드부터 다시 계산합니다.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+ELO_INITIAL = 1500.0
+ELO_K = 20.0
+
+
+def elo_round_update(ratings, goals, participated, k=ELO_K):
+    """
+    라운드 하나의 레이팅 변화량 (팀별 배열)
+
+    Args:
+        ratings: 라운드 직전 팀별 레이팅
+        goals: 팀별 득점
+        participated: 팀별 참여 여부
+    """
+    idx = np.flatnonzero(participated)
+    delta = np.zeros(len(ratings))
+    if len(idx) < 2:
+        return delta
+
+    r, g = ratings[idx], goals[idx]
+    expected = 1.0 / (1.0 + 10.0 ** ((r[None, :] - r[:, None]) / 400.0))
+    actual = np.where(g[:, None] > g[None, :], 1.0, np.where(g[:, None] == g[None, :], 0.5, 0.0))
+    np.fill_diagonal(expected, 0.0)
+    np.fill_diagonal(actual, 0.0)
+    delta[idx] = k * (actual - expected).sum(axis=1) / (len(idx) - 1)
+    return delta
+
+
+class EloLedger:
+    """
+    라운드별 팀 레이팅 원장 (프로세스 내 공유, 스레드 안전)
+
+    update(events)는 이전에 처리한 라운드와 비교하여 바뀐 라운드부터만 계산하고
+    원장 전체를 long 테이블로 반환합니다.
+    """
+
+    def __init__(self, initial=ELO_INITIAL, k=ELO_K):
+        self.initial = initial
+        self.k = k
+        self._lock = threading.Lock()
+        self._teams = None
+        # 처리한 라운드의 (주차, 라운드 번호, 득점, 참여) 행과 라운드 직후 레이팅
+        self._keys = np.zeros((0, 0), dtype=np.int64)
+        self._ratings = np.zeros((0, 0))
+        # 마지막 갱신 통계 (재사용/계산한 라운드 수)
+        self.last_update = {}
+
+    def reset(self):
+        with self._lock:
+            self._teams = None
+
+    def update(self, events):
+        """events(MatchEvents)의 모든 라운드를 반영한 원장 반환 (elo_ledger_frame 형식)"""
+        teams = tuple(events.teams)
+        n_teams = len(teams)
+        goals = events.goal_matrix()
+        keys = np.column_stack([
+            events.weeks.astype(np.int64), events.round_labels.astype(np.int64),
+            goals, events.participated.astype(np.int64),
+        ]) if events.n_rounds else np.zeros((0, 2 + 2 * n_teams), dtype=np.int64)
+
+        with self._lock:
+            if teams != self._teams:
+                self._teams = teams
+                self._keys = keys[:0]
+                self._ratings = np.zeros((0, n_teams))
+
+            # 이전과 같은 앞쪽 라운드 수
+            n = min(len(self._keys), len(keys))
+            same = np.all(self._keys[:n] == keys[:n], axis=1)
+            n_keep = n if same.all() else int(np.argmin(same))
+
+            ratings = np.empty((events.n_rounds, n_teams))
+            ratings[:n_keep] = self._ratings[:n_keep]
+            current = ratings[n_keep - 1] if n_keep else np.full(n_teams, self.initial)
+            for r in range(n_keep, events.n_rounds):
+                current = current + elo_round_update(current, goals[r], events.participated[r], self.k)
+                ratings[r] = current
+
+            self._keys = keys
+            self._ratings = ratings
+            self.last_update = {'rounds_reused': n_keep, 'rounds_applied': events.n_rounds - n_keep}
+            return elo_ledger_frame(events, self._ratings, self.initial)
+
+
+def elo_ledger_frame(events, ratings, initial=ELO_INITIAL):
+    """
+    (라운드 x 팀) 레이팅 배열 -> 원장 테이블
+
+    Returns:
+        DataFrame[Seq, Week, Round, Team, Rating, Delta] (라운드 -> 팀 순, Seq는 1부터 시작하는 라운드 순번)
+    """
+    n_rounds, n_teams = ratings.shape
+    previous = np.vstack([np.full((1, n_teams), initial), ratings[:-1]]) if n_rounds else ratings
+    return pd.DataFrame({
+        'Seq': np.repeat(np.arange(1, n_rounds + 1), n_teams),
+        'Week': np.repeat(events.weeks.astype(np.int64), n_teams),
+        'Round': np.repeat(events.round_labels.astype(np.int64), n_teams),
+        'Team': np.tile(np.array(events.teams, dtype=object), n_rounds),
+        'Rating': ratings.ravel(),
+        'Delta': (ratings - previous).ravel(),
+    })
+
+
+def weekly_ratings(elo_ledger):
+    """주차별 마지막 라운드 직후 레이팅 (Week x Team 표, 주차 오름차순)"""
+    last = elo_ledger.groupby('Week')['Seq'].transform('max') == elo_ledger['Seq']
+    return elo_ledger[last].pivot(index='Week', columns='Team', values='Rating')
@@ -0,0 +1,210 @@
+"""
+경기 시트 정규화: 득점 이벤트 long 테이블
+
+문자열로 된 넓은 경기 시트(라운드 x 팀 득점자 셀)를 한 번만 파싱하여
+작은 정수/범주형 컬럼으로 이루어진 이벤트 테이블로 바꿉니다.
+순위표, 주차별 득실점, 경기 결과 상세 등 모든 소비자가 이 테이블을 읽습니다.
+긴 시즌에는 같은 셀 문자열('0', 같은 득점자 조합 등)이 반복되므로 서로 다른 문자열만 파싱합니다.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+
+# 셀 전체가 이 값이면 참여했으나 무득점
+ZERO_CELL_VALUES = ['0', '0.0']
+OWN_GOAL_KEYWORD = '자살골'
+
+
+@dataclass(frozen=True)
+class CellRecord:
+    """
+    득점자 셀 하나의 파싱 결과
+
+    - goals: 득점 수 (자살골 포함, 미참여면 0)
+    - participated: 참여 여부 (셀이 비어 있지 않음)
+    - scorers: 득점 인정 선수 (셀 내 순서, 중복 포함)
+    - scorer_counts: ((선수, 득점 수), ...) 첫 등장 순서
+    """
+    goals: int
+    participated: bool
+    scorers: tuple
+    scorer_counts: tuple
+
+
+EMPTY_CELL = CellRecord(goals=0, participated=False, scorers=(), scorer_counts=())
+
+
+def parse_cells(values):
+    """
+    득점자 셀 배열 파싱 (서로 다른 셀 문자열은 한 번만 파싱)
+
+    셀 규칙 (count_goals / get_scorers_list와 동일)
+    - 빈 값: 미참여
+    - '0', '0.0': 참여했으나 무득점
+    - 그 외: 쉼표로 구분된 비어 있지 않은 항목 하나가 득점 1개
+      ('자살골'이 포함된 항목과 '0' 항목은 득점으로 세지만 선수 득점으로는 인정하지 않음)
+
+    Returns:
+        (participated, goals, tokens)
+        participated: 셀별 참여 여부 (np.ndarray[bool])
+        goals: 셀별 득점 수 (np.ndarray[int64], 미참여 0)
+        tokens: 득점 1개당 한 행 (셀 -> 셀 내 순서)
+            cell (셀 위치), token (항목 문자열), is_own_goal, credited (선수 득점 인정)
+    """
+    cells = pd.Series(np.asarray(values, dtype=object).ravel(), dtype=object)
+    is_na = cells.isna().to_numpy()
+    s_str = cells.where(~is_na, '').astype(str).str.strip()
+    codes, uniques = pd.factorize(s_str)
+
+    # 서로 다른 문자열별 항목 (항목은 문자열 순서 -> 문자열 내 순서로 정렬되어 있음)
+    uniq = pd.Series(uniques, dtype=object)
+    u_participated = (uniq != '').to_numpy()
+    u_counted = u_participated & ~uniq.isin(ZERO_CELL_VALUES).to_numpy()
+    u_tokens = uniq[u_counted].str.split(',').explode().str.strip()
+    u_tokens = u_tokens[u_tokens != '']
+    n_tokens = np.bincount(u_tokens.index.to_numpy(dtype=np.int64), minlength=len(uniq))
+    starts = np.cumsum(n_tokens) - n_tokens
+    u_own_goal = u_tokens.str.contains(OWN_GOAL_KEYWORD, regex=False).to_numpy()
+    u_credited = ~u_own_goal & ~u_tokens.isin(ZERO_CELL_VALUES).to_numpy()
+
+    # 셀별로 해당 문자열의 항목 구간을 펼침
+    goals = n_tokens[codes].astype(np.int64)
+    cell = np.repeat(np.arange(len(codes), dtype=np.int64), goals)
+    offset = np.arange(len(cell)) - np.repeat(np.cumsum(goals) - goals, goals)
+    idx = np.repeat(starts[codes], goals) + offset
+    tokens = pd.DataFrame({
+        'cell': cell,
+        'token': u_tokens.to_numpy(dtype=object)[idx],
+        'is_own_goal': u_own_goal[idx],
+        'credited': u_credited[idx],
+    })
+    return u_participated[codes], goals, tokens
+
+
+@dataclass(frozen=True)
+class MatchEvents:
+    """
+    정규화된 경기 기록 (읽기 전용)
+
+    - weeks / round_labels: 라운드(시트 행)별 주차와 라운드 번호 (int16)
+    - participated: 라운드 x 팀 참여 여부 (셀이 비어 있지 않음)
+    - goals: 득점 1개당 한 행인 이벤트 테이블 (시트의 라운드 -> 팀 -> 셀 내 순서)
+        week (int16), round (int32, 시트 행 위치), team (category, teams 순서),
+        player (category, 득점 인정 선수가 아니면 NaN), is_own_goal (bool)
+    """
+    teams: tuple
+    weeks: np.ndarray
+    round_labels: np.ndarray
+    participated: np.ndarray
+    goals: pd.DataFrame
+
+    @property
+    def n_rounds(self):
+        return len(self.weeks)
+
+    @cached_property
+    def _goal_matrix(self):
+        n_teams = len(self.teams)
+        flat = self.goals['round'].to_numpy(dtype=np.int64) * n_teams + self.goals['team'].cat.codes.to_numpy()
+        counts = np.bincount(flat, minlength=self.n_rounds * n_teams)
+        counts = counts.reshape(self.n_rounds, n_teams).astype(np.int64)
+        counts.flags.writeable = False
+        return counts
+
+    def goal_matrix(self):
+        """라운드 x 팀 득점 수 (미참여 셀은 0, 처음 호출 시 한 번 계산한 읽기 전용 배열)"""
+        return self._goal_matrix
+
+    @cached_property
+    def cell_records(self):
+        """참여한 셀별 CellRecord {(라운드 위치, 팀 위치): CellRecord} (처음 접근 시 한 번 계산)"""
+        n_teams = len(self.teams)
+        events = self.scorer_events()
+        player = events['player']
+        n_players = max(len(player.cat.categories), 1)
+
+        # 이벤트는 (라운드 -> 팀 -> 셀 내 순서)로 정렬되어 있으므로 셀 키도 오름차순
+        keys = events['round'].to_numpy(dtype=np.int64) * n_teams + events['team'].cat.codes.to_numpy()
+        names = player.astype(object).tolist()
+        # (셀, 선수) 쌍을 첫 등장 순서로 모아 득점 수 집계
+        pair_codes, pairs = pd.factorize(keys * n_players + player.cat.codes.to_numpy())
+        pair_counts = np.bincount(pair_codes, minlength=len(pairs)).tolist()
+        pair_keys = pairs // n_players
+        pair_names = player.cat.categories.to_numpy(dtype=object)[pairs % n_players].tolist()
+
+        cells = np.flatnonzero(self.participated.ravel())
+        goals = self.goal_matrix().ravel()[cells].tolist()
+        bounds = zip(np.searchsorted(keys, cells).tolist(), np.searchsorted(keys, cells, 'right').tolist(),
+                     np.searchsorted(pair_keys, cells).tolist(), np.searchsorted(pair_keys, cells, 'right').tolist())
+
+        records = {}
+        for cell, n_goals, (a, b, c, d) in zip(cells.tolist(), goals, bounds):
+            records[divmod(cell, n_teams)] = CellRecord(
+                goals=n_goals,
+                participated=True,
+                scorers=tuple(names[a:b]),
+                scorer_counts=tuple(zip(pair_names[c:d], pair_counts[c:d])),
+            )
+        return records
+
+    def cell_record(self, r, t):
+        """라운드 위치 r, 팀 위치 t 셀의 CellRecord (미참여면 EMPTY_CELL)"""
+        return self.cell_records.get((r, t), EMPTY_CELL)
+
+    def slice_rounds(self, start, end):
+        """라운드 구간 [start, end)만 담은 MatchEvents (라운드 위치는 0부터 다시 매김)"""
+        rounds = self.goals['round'].to_numpy()
+        goals = self.goals[(rounds >= start) & (rounds < end)].reset_index(drop=True)
+        goals['round'] = (goals['round'] - start).astype(np.int32)
+        return MatchEvents(
+            teams=self.teams,
+            weeks=self.weeks[start:end],
+            round_labels=self.round_labels[start:end],
+            participated=self.participated[start:end],
+            goals=goals,
+        )
+
+    def scorer_events(self):
+        """득점 인정 선수가 있는 이벤트만 (자살골/무의미한 값 제외)"""
+        return self.goals[self.goals['player'].notna()]
+
+
+def build_match_events(df_match, teams):
+    """
+    경기 시트를 MatchEvents로 정규화
+
+    셀 규칙은 parse_cells와 같습니다.
+    """
+    teams = tuple(teams)
+    n_rounds, n_teams = len(df_match), len(teams)
+
+    weeks = pd.to_numeric(df_match['주차']).to_numpy().astype(np.int16)
+    if '라운드' in df_match.columns:
+        round_labels = pd.to_numeric(df_match['라운드']).to_numpy().astype(np.int16)
+    else:
+        round_labels = np.arange(1, n_rounds + 1, dtype=np.int16)
+
+    # 모든 팀 셀을 행 우선 순서(라운드 -> 팀)로 펼쳐 한 번에 파싱
+    participated, _, tokens = parse_cells(df_match[list(teams)].to_numpy(dtype=object))
+    cell_pos = tokens['cell'].to_numpy()
+
+    round_idx = cell_pos // max(n_teams, 1)
+    goals = pd.DataFrame({
+        'week': weeks[round_idx],
+        'round': round_idx.astype(np.int32),
+        'team': pd.Categorical.from_codes((cell_pos % max(n_teams, 1)).astype(np.int16), categories=list(teams)),
+        'player': pd.Categorical(tokens['token'].where(tokens['credited']).to_numpy(dtype=object)),
+        'is_own_goal': tokens['is_own_goal'].to_numpy(),
+    })
+
+    return MatchEvents(
+        teams=teams,
+        weeks=weeks,
+        round_labels=round_labels,
+        participated=participated.reshape(n_rounds, n_teams),
+        goals=goals,
+    )
@@ -0,0 +1,145 @@
+"""
+DataFrame -> HTML 테이블 렌더러 (값 배열을 한 번 순회하는 join 방식)
+
+렌더링 결과는 여기서 캐시하지 않습니다. 화면에서는 스냅샷 섹션 캐시
+(LeagueSnapshot.section)에 데이터 버전마다 한 번만 만들어 재사용합니다.
+"""
+
+import threading
+
+import pandas as pd
+
+from .profiling import span
+
+
+# compact 모드에서 사용하는 클래스 정의 (페이지 스타일시트에 한 번만 포함)
+COMPACT_TABLE_CSS = """
+    .bt { width: 100%; border-collapse: collapse; color: #212529; table-layout: auto; }
+    .bt.match-result-table { table-layout: fixed; }
+    .bt th, .bt td.ix { text-align: center; padding: 8px 12px; font-weight: 700; background-color: #dee2e6; }
+    .bt td { text-align: center; padding: 8px 12px; }
+    .bt.al th, .bt.al td { text-align: left; }
+    .bt col.ix { width: 80px; }
+    /* 경기 결과 셀 (승/무/패 배지, 득점 상세) */
+    .r-w { color: #d63384; font-weight: 800; font-size: 1.1em; }
+    .r-d { color: #6c757d; font-weight: 800; font-size: 1.1em; }
+    .r-l { color: #212529; font-weight: 400; font-size: 1.1em; }
+    .r-g { margin-top: 4px; font-weight: 500; }
+    .r-s { font-size: 0.85em; color: #6c757d; }
+"""
+
+# 테이블 종류(label)별 HTML 크기 집계 (bytes)
+_payload_stats = {}
+_payload_lock = threading.Lock()
+
+
+def df_to_html_table(df, center_align=True, match_result=False, scrollable=False, compact=False, label=None):
+    """
+    DataFrame을 HTML 테이블로 변환
+
+    Args:
+        df: pandas DataFrame
+        center_align: True면 모든 셀 중앙 정렬, False면 왼쪽 정렬
+        match_result: True면 경기 결과 테이블 (텍스트 중앙 정렬)
+        scrollable: True면 모바일에서 가로 스크롤을 위해 최소 너비 확보
+        compact: True면 인라인 style 대신 COMPACT_TABLE_CSS의 짧은 클래스 사용
+        label: 페이로드 크기 집계용 테이블 이름 (html_payload_report)
+    """
+    with span('html_table', label=label, rows=len(df)):
+        html = render_html_table(df, center_align, match_result, scrollable, compact)
+
+    if label is not None:
+        record_payload(label, html)
+    return html
+
+
+def render_html_table(df, center_align=True, match_result=False, scrollable=False, compact=False):
+    """HTML 테이블 생성 (값 배열을 한 번 순회)"""
+    # 스타일 설정 (경기 결과/일반 테이블은 중앙, 그 외 왼쪽 정렬)
+    align = 'center' if (match_result or center_align) else 'left'
+
+    # HTML 테이블 생성
+    table_classes = ["match-result-table" if match_result else "standard-table"]
+    if scrollable:
+        table_classes.append("scrollable-table")
+    col_count = len(df.columns)
+
+    if compact:
+        table_classes.insert(0, "bt")
+        if align == 'left':
+            table_classes.append("al")
+        th_open = '<th>'
+        td_index_open = '<td class="ix">'
+        td_open = '<td>'
+        parts = ['<div class="table-container">', f'<table class="{" ".join(table_classes)}">']
+        if match_result:
+            # 인덱스(라운드) 컬럼만 80px, 나머지는 table-layout: fixed로 균등 분할
+            parts.append('<colgroup><col class="ix">' + '<col>' * col_count + '</colgroup>')
+    else:
+        cell_style = f'text-align: {align}; padding: 8px 12px;'
+        header_style = f'text-align: {align}; padding: 8px 12px; font-weight: 700; background-color: #dee2e6;'
+        th_open = f'<th style="{header_style}">'
+        td_index_open = f'<td style="{header_style}">'
+        td_open = f'<td style="{cell_style}">'
+
+        table_class_str = " ".join(table_classes)
+        layout_style = "table-layout: fixed;" if match_result else "table-layout: auto;"
+        parts = ['<div class="table-container">',
+                 f'<table class="{table_class_str}" style="width: 100%; border-collapse: collapse; color: #212529; {layout_style}">']
+
+        # 경기 결과 테이블의 경우 각 컬럼 너비 강제 고정
+        if match_result:
+            # 인덱스(라운드)는 80px, 나머지는 균등 분할
+            parts.append('<colgroup><col style="width: 80px;">')
+            parts.append(f'<col style="width: calc((100% - 80px) / {col_count});">' * col_count)
+            parts.append('</colgroup>')
+
+    # 인덱스 컬럼 표시 여부 (이름이 있거나 정수 인덱스가 아닌 경우)
+    show_index = bool(df.index.name) or not all(isinstance(i, int) for i in df.index)
+
+    # 헤더
+    parts.append('<thead><tr>')
+    if show_index:
+        parts.append(f'{th_open}{df.index.name if df.index.name else ""}</th>')
+    parts.extend(f'{th_open}{col}</th>' for col in df.columns)
+    parts.append('</tr></thead>')
+
+    # 데이터 (iterrows와 동일하게 DataFrame.values 기준 값 사용)
+    td_sep = f'</td>{td_open}'
+    parts.append('<tbody>')
+    values = df.to_numpy()
+    for idx, row in zip(df.index, values.tolist() if values.dtype != object else values):
+        parts.append('<tr>')
+        if show_index:
+            parts.append(f'{td_index_open}{idx}</td>')
+        if len(row):
+            parts.append(td_open + td_sep.join([f'{val}' for val in row]) + '</td>')
+        parts.append('</tr>')
+    parts.append('</tbody></table></div>')
+
+    return ''.join(parts)
+
+
+def record_payload(label, html):
+    """화면에 보낸 테이블 HTML 크기를 label별로 집계 (캐시된 HTML을 다시 보낼 때도 호출)"""
+    size = len(html.encode('utf-8'))
+    with _payload_lock:
+        stat = _payload_stats.setdefault(label, {'tables': 0, 'bytes': 0, 'last_bytes': 0, 'max_bytes': 0})
+        stat['tables'] += 1
+        stat['bytes'] += size
+        stat['last_bytes'] = size
+        stat['max_bytes'] = max(stat['max_bytes'], size)
+
+
+def html_payload_report():
+    """
+    테이블 종류별 HTML 페이로드 크기 집계 (프로세스 시작 이후 누적)
+
+    Returns:
+        DataFrame[label, tables, bytes, last_bytes, max_bytes] (bytes 내림차순)
+    """
+    with _payload_lock:
+        rows = [dict(label=label, **stat) for label, stat in _payload_stats.items()]
+    report = pd.DataFrame(rows, columns=['label', 'tables', 'bytes', 'last_bytes', 'max_bytes'])
+    return report.sort_values('bytes', ascending=False).reset_index(drop=True)
+
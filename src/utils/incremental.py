@@ -0,0 +1,225 @@
+"""
+증분(incremental) 리그 계산
+
+경기 시트는 매주 아래쪽에 새 주차가 추가되는 형태이므로,
+이전에 처리한 라운드의 키 배열(주차, 라운드 번호, 팀별 득점/참여, 득점 인정 선수)과
+비교하여 바뀌지 않은 앞쪽 라운드의 누적 결과는 그대로 쓰고 뒤쪽 라운드만 계산합니다.
+- 앞쪽 라운드가 수정되면 그 라운드부터 끝까지 다시 계산합니다.
+- 출석 시트는 바뀌지 않은 앞쪽 주차 컬럼의 결과를 그대로 쓰고 나머지 컬럼만 계산합니다.
+- 비교는 배열 단위로 한 번에 하며, 라운드/컬럼마다 해시를 만들지 않습니다.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .attendance import build_attendance_matrix
+from .data_loader import (
+    TEAM_STAT_COLS,
+    get_team_columns,
+    round_results,
+    melt_attendance,
+    add_attendance_flags,
+    build_team_table,
+    build_scorer_table,
+)
+from .elo import EloLedger
+from .events import build_match_events
+
+
+def round_keys(events):
+    """라운드별 비교 키 (주차, 라운드 번호, 팀별 득점, 팀별 참여) 정수 배열"""
+    n_teams = len(events.teams)
+    if not events.n_rounds:
+        return np.zeros((0, 2 + 2 * n_teams), dtype=np.int64)
+    return np.column_stack([
+        events.weeks.astype(np.int64), events.round_labels.astype(np.int64),
+        events.goal_matrix(), events.participated.astype(np.int64),
+    ])
+
+
+def common_prefix(old, new):
+    """두 배열에서 앞에서부터 같은 행(또는 원소) 수 (결측값끼리는 같은 값으로 봄)"""
+    n = min(len(old), len(new))
+    same = old[:n] == new[:n]
+    if same.dtype == object or old.dtype == object:
+        same = same | (pd.isna(old[:n]) & pd.isna(new[:n]))
+    if same.ndim > 1:
+        same = same.all(axis=tuple(range(1, same.ndim)))
+    return n if same.all() else int(np.argmin(same))
+
+
+class IncrementalLeagueState:
+    """
+    라운드 단위 누적 상태를 보관하는 증분 계산기 (프로세스 내 공유, 스레드 안전)
+
+    update_match_results / update_attendance는 process_match_results /
+    process_attendance와 동일한 결과를 반환합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset_match(None)
+        self._reset_attendance()
+        # 팀 레이팅: 라운드 단위 원장 (자체적으로 바뀐 라운드부터만 계산)
+        self._elo = EloLedger()
+        # 마지막 갱신 통계 (재사용/재계산한 라운드, 주차 수)
+        self.last_update = {}
+
+    def _reset_match(self, teams):
+        n_teams = 0 if teams is None else len(teams)
+        self._teams = teams
+        self._keys = np.zeros((0, 2 + 2 * n_teams), dtype=np.int64)
+        self._valid = np.zeros(0, dtype=bool)
+        # 라운드 직후 누적 통계 (라운드 x TEAM_STAT_COLS x 팀)
+        self._cum = np.zeros((0, len(TEAM_STAT_COLS), n_teams), dtype=np.int64)
+        # 경기 기록 행 (주차, 팀 위치, 승점)과 라운드별 시작 위치 (길이 = 라운드 수 + 1)
+        self._hist_week = np.zeros(0, dtype=np.int64)
+        self._hist_team = np.zeros(0, dtype=np.int64)
+        self._hist_points = np.zeros(0, dtype=np.int64)
+        self._hist_offsets = np.zeros(1, dtype=np.int64)
+        # 득점 인정 이벤트 (라운드 위치, 선수 목록의 코드)와 유효 경기 득점 누적 {선수: 득점} (첫 득점 순서)
+        self._scorer_rounds = np.zeros(0, dtype=np.int64)
+        self._scorer_names = np.zeros(0, dtype=object)
+        self._scorer_codes = np.zeros(0, dtype=np.int64)
+        self._player_goals = {}
+
+    def _reset_attendance(self):
+        # 마지막 출석 행렬(원본 값 포함), 출석 여부를 붙이기 전 long 테이블, 결과
+        self._att_matrix = None
+        self._att_melt = None
+        self._att_result = None
+
+    def reset(self):
+        with self._lock:
+            self._reset_match(None)
+            self._reset_attendance()
+        self._elo.reset()
+
+    def update_match_results(self, df_match, events=None):
+        """
+        새로 추가/변경된 라운드만 반영하여 (df_teams, df_history, df_scorers) 반환
+
+        events(MatchEvents)가 주어지면 시트를 다시 파싱하지 않고 그대로 사용합니다.
+        """
+        if events is None:
+            events = build_match_events(df_match, get_team_columns(df_match))
+        teams = tuple(events.teams)
+        keys = round_keys(events)
+        scorers = events.scorer_events()
+        scorer_rounds = scorers['round'].to_numpy(dtype=np.int64)
+        scorer_names = scorers['player'].cat.categories.to_numpy(dtype=object)
+        scorer_codes = scorers['player'].cat.codes.to_numpy().astype(np.int64)
+
+        with self._lock:
+            if teams != self._teams:
+                self._reset_match(teams)
+
+            # 이전과 같은 앞쪽 라운드 수 (득점 수가 같아도 득점 인정 선수가 바뀌었으면 그 라운드부터)
+            # (선수 비교는 이전 선수 목록을 새 목록의 위치로 바꿔 정수 코드끼리 비교)
+            n_keep = common_prefix(self._keys, keys)
+            a = int(np.searchsorted(self._scorer_rounds, n_keep))
+            b = int(np.searchsorted(scorer_rounds, n_keep))
+            remap = pd.Index(scorer_names).get_indexer(self._scorer_names)
+            n_same = common_prefix(remap[self._scorer_codes[:a]], scorer_codes[:b])
+            if n_same < max(a, b):
+                first = [r[n_same] for r, n in [(self._scorer_rounds, a), (scorer_rounds, b)] if n_same < n]
+                n_keep = min(first)
+                a = int(np.searchsorted(self._scorer_rounds, n_keep))
+                b = int(np.searchsorted(scorer_rounds, n_keep))
+
+            # 바뀐 라운드부터 끝까지만 계산하여 앞쪽 누적값에 이어 붙임
+            results, valid_tail = round_results(events.goal_matrix()[n_keep:], events.participated[n_keep:])
+            stats = np.stack([results[col] for col in TEAM_STAT_COLS], axis=1).astype(np.int64)
+            base = self._cum[n_keep - 1] if n_keep else np.zeros(stats.shape[1:], dtype=np.int64)
+            self._cum = np.concatenate([self._cum[:n_keep], base + np.cumsum(stats, axis=0)])
+
+            M = results['Played']
+            rows, cols = np.nonzero(M)
+            h = self._hist_offsets[n_keep]
+            self._hist_week = np.concatenate([self._hist_week[:h], events.weeks[n_keep:].astype(np.int64)[rows]])
+            self._hist_team = np.concatenate([self._hist_team[:h], cols.astype(np.int64)])
+            self._hist_points = np.concatenate([self._hist_points[:h], results['Points'][rows, cols].astype(np.int64)])
+            self._hist_offsets = np.concatenate([self._hist_offsets[:n_keep + 1], h + np.cumsum(M.sum(axis=1))])
+
+            # 선수 득점: 버린 라운드의 유효 득점을 빼고 새 라운드의 유효 득점을 더함
+            # (득점이 0이 된 선수는 빼고, 새로 득점한 선수는 뒤에 추가하므로 첫 득점 순서가 유지됨)
+            player_goals = self._player_goals
+            dropped = self._scorer_names[self._scorer_codes[a:][self._valid[self._scorer_rounds[a:]]]]
+            for player in dropped.tolist():
+                player_goals[player] -= 1
+                if not player_goals[player]:
+                    del player_goals[player]
+            added = scorer_names[scorer_codes[b:][valid_tail[scorer_rounds[b:] - n_keep]]]
+            for player in added.tolist():
+                player_goals[player] = player_goals.get(player, 0) + 1
+
+            self._keys = keys
+            self._valid = np.concatenate([self._valid[:n_keep], valid_tail])
+            self._scorer_rounds = scorer_rounds
+            self._scorer_names = scorer_names
+            self._scorer_codes = scorer_codes
+            self.last_update['match_rounds_reused'] = n_keep
+            self.last_update['match_rounds_applied'] = events.n_rounds - n_keep
+
+            totals = self._cum[-1] if len(self._cum) else np.zeros((len(TEAM_STAT_COLS), len(teams)), dtype=np.int64)
+            df_teams = build_team_table(list(teams), dict(zip(TEAM_STAT_COLS, totals)))
+            df_history = pd.DataFrame({
+                'Week': self._hist_week,
+                'Team': np.array(teams, dtype=object)[self._hist_team],
+                'PointsGained': self._hist_points,
+            })
+            df_scorers = build_scorer_table(player_goals)
+
+        return df_teams, df_history, df_scorers
+
+    def update_elo(self, events):
+        """새로 추가/변경된 라운드만 반영한 팀 레이팅 원장 반환 (EloLedger.update와 동일)"""
+        ledger = self._elo.update(events)
+        self.last_update['elo_rounds_reused'] = self._elo.last_update['rounds_reused']
+        self.last_update['elo_rounds_applied'] = self._elo.last_update['rounds_applied']
+        return ledger
+
+    def update_attendance(self, df_att, attendance=None):
+        """
+        바뀌지 않은 앞쪽 주차 컬럼의 결과를 재사용하여 process_attendance 결과 반환
+
+        attendance(AttendanceMatrix)가 주어지면 출석 여부와 원본 값 비교에 그 행렬을 사용합니다.
+        """
+        if attendance is None:
+            attendance = build_attendance_matrix(df_att)
+        week_cols = attendance.week_cols
+        n_rows = len(attendance.teams)
+
+        with self._lock:
+            # 선수 명단이 바뀌면 모든 행의 위치가 달라지므로 처음부터 계산
+            prev = self._att_matrix
+            n_keep = 0
+            if (prev is not None and len(prev.teams) == n_rows
+                    and common_prefix(prev.teams, attendance.teams) == n_rows
+                    and common_prefix(prev.players, attendance.players) == n_rows):
+                n_keep = common_prefix(np.array(prev.week_cols, dtype=object), np.array(week_cols, dtype=object))
+                n_keep = common_prefix(prev.values[:, :n_keep].T, attendance.values[:, :n_keep].T)
+
+            if prev is not None and n_keep == len(week_cols) == len(prev.week_cols):
+                result = self._att_result
+            else:
+                # 앞쪽 주차의 long 테이블(원본 값)에 바뀐 주차만 펼쳐 이어 붙인 뒤 출석 여부를 붙임
+                tail_cols = list(week_cols[n_keep:])
+                if n_keep == 0:
+                    df_melt = melt_attendance(df_att, tail_cols)
+                elif tail_cols:
+                    df_melt = pd.concat([self._att_melt.iloc[:n_keep * n_rows], melt_attendance(df_att, tail_cols)],
+                                        ignore_index=True)
+                else:
+                    df_melt = self._att_melt.iloc[:n_keep * n_rows]
+                result = add_attendance_flags(df_melt, attendance)
+                self._att_melt = df_melt
+
+            self._att_matrix = attendance
+            self._att_result = result
+            self.last_update['attendance_weeks_reused'] = n_keep
+            self.last_update['attendance_weeks_applied'] = len(week_cols) - n_keep
+
+        return result
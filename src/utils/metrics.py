@@ -0,0 +1,245 @@
+"""
+리그 파생 지표 계산 (주차별 득점/실점, 선수별 통합 지표)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# 선수 상세 지표 컬럼 (compute_player_metrics 반환 순서)
+PLAYER_METRIC_COLS = [
+    '팀승점합계', '팀실점합계', '팀득점합계',
+    '출전_평균승점', '출전_평균실점', '출전_평균득점',
+    '결장_평균승점', '결장_평균실점', '결장_평균득점',
+    '임팩트_승점', '임팩트_득점', '임팩트_실점',
+    '출석주차수', '결장주차수'
+]
+
+
+def build_round_goals(events):
+    """
+    라운드 x 팀 득실점 테이블 (모든 주차별/누적 득실점 계산의 공통 원천)
+    
+    정규화된 득점 이벤트(MatchEvents)로부터 라운드마다 팀별 한 행을 만듭니다.
+    - GF: 팀 득점 (미참여 시 0)
+    - GA: 참여한 라운드에서 상대 팀들의 득점 합 (미참여 시 0)
+    - Participated: 해당 라운드 참여 여부 (셀이 비어 있지 않음)
+    """
+    teams = list(events.teams)
+    n_rounds, n_teams = events.n_rounds, len(teams)
+    G = events.goal_matrix()
+    P = events.participated
+
+    GF = np.where(P, G, 0)
+    GA = np.where(P, GF.sum(axis=1, keepdims=True) - GF, 0)
+
+    return pd.DataFrame({
+        'Week': np.repeat(events.weeks.astype(np.int64), n_teams),
+        'Round': np.repeat(np.arange(n_rounds), n_teams),
+        'Team': np.tile(np.array(teams, dtype=object), n_rounds),
+        'GF': GF.ravel().astype(np.int64),
+        'GA': GA.ravel().astype(np.int64),
+        'Participated': P.ravel(),
+    })
+
+
+def compute_weekly_gf(round_goals):
+    """주차별 팀 득점 (참여한 주차만, Week/Team 정렬)"""
+    played = round_goals[round_goals['Participated']]
+    return played.groupby(['Week', 'Team'])['GF'].sum().reset_index()
+
+
+def compute_weekly_ga(round_goals):
+    """주차별 팀 실점 (모든 주차 x 팀, 미참여 주차는 0)"""
+    return round_goals.groupby(['Week', 'Team'], sort=False)['GA'].sum().reset_index()
+
+
+def compute_team_trends(df_history, round_goals, weeks, teams):
+    """
+    주차 x 팀 추이 테이블 (승점/득점/실점/득실차의 주차별 값과 누적값)
+
+    df_history와 라운드 득실점 테이블을 한 번씩 groupby한 뒤 weeks 전체 격자로
+    채우고 팀별 cumsum으로 누적값을 구합니다. 트렌드 탭의 모든 그래프가 공유합니다.
+
+    Returns:
+        DataFrame[Week, Team, Points, GF, GA, GD, CumPoints, CumGF, CumGA, CumGD] (팀 -> 주차 순)
+    """
+    grid = pd.MultiIndex.from_product([list(teams), list(weeks)], names=['Team', 'Week'])
+    trends = (round_goals.groupby(['Team', 'Week'])[['GF', 'GA']].sum()
+              .reindex(grid, fill_value=0))
+    trends.insert(0, 'Points', df_history.groupby(['Team', 'Week'])['PointsGained'].sum()
+                  .reindex(grid, fill_value=0))
+    trends['GD'] = trends['GF'] - trends['GA']
+
+    weekly_cols = ['Points', 'GF', 'GA', 'GD']
+    cum = trends.groupby(level='Team', sort=False)[weekly_cols].cumsum()
+    for col in weekly_cols:
+        trends[f'Cum{col}'] = cum[col]
+    return trends.reset_index()[['Week', 'Team'] + weekly_cols + [f'Cum{c}' for c in weekly_cols]]
+
+
+def build_player_table(df_att, df_att_processed, df_scorers, df_history, team_points_by_week, df_weekly_gf, df_weekly_ga):
+    """모든 선수 지표 통합 계산 (출석, 득점, 출전/결장 시 팀 성적, 임팩트)"""
+    # 1. 선수-팀 매핑 정보 확보
+    player_team_map = df_att[['선수이름', '팀이름']].drop_duplicates().set_index('선수이름')['팀이름'].to_dict()
+
+    # 2. 기초 데이터 병합 (출석 + 득점)
+    att_counts = df_att_processed[df_att_processed['IsAttended'] == 1].groupby('선수이름')['WeekNum'].count().reset_index(name='출석횟수')
+    df_players_base = pd.merge(att_counts, df_scorers.rename(columns={'Goals': '득점'}), left_on='선수이름', right_on='Player', how='outer').fillna(0)
+    df_players_base['Player'] = df_players_base.apply(lambda x: x['선수이름'] if pd.notna(x['선수이름']) and x['선수이름'] != 0 else x['Player'], axis=1)
+    df_players_base['Team'] = df_players_base['Player'].map(player_team_map)
+    df_players_base = df_players_base[['Player', 'Team', '출석횟수', '득점']].reset_index(drop=True)
+
+    # 3. 상세 지표 일괄 계산 (선수 x 주차 행렬)
+    metrics_df = compute_player_metrics(df_players_base['Player'], player_team_map, df_att_processed, df_history,
+                                        team_points_by_week, df_weekly_gf, df_weekly_ga)
+
+    # 인덱스를 기준으로 완벽하게 합침
+    df_players_all = pd.concat([df_players_base, metrics_df], axis=1)
+    df_players_all['경기당 득점'] = (df_players_all['득점'] / df_players_all['출석횟수'].replace(0, 1)).fillna(0)
+    return df_players_all
+
+
+def _team_week_matrix(df, value_col, teams, weeks):
+    """(Week, Team, 값) 테이블을 팀 x 주차 합계/행수 행렬로 변환 (마지막 행은 '팀 없음'용 0 행)"""
+    values = np.zeros((len(teams) + 1, len(weeks)))
+    counts = np.zeros((len(teams) + 1, len(weeks)))
+    ti = teams.get_indexer(df['Team'])
+    wi = weeks.get_indexer(df['Week'])
+    np.add.at(values, (ti, wi), df[value_col].to_numpy(dtype=float))
+    np.add.at(counts, (ti, wi), 1)
+    values[-1] = 0
+    counts[-1] = 0
+    return values, counts
+
+
+def compute_player_metrics(players, player_team_map, df_att_processed, df_history, team_points_by_week, df_weekly_gf, df_weekly_ga):
+    """
+    전체 선수의 출전/결장 시 팀 성적과 임팩트를 행렬 연산으로 한 번에 계산
+
+    선수 x 주차 출석 행렬과 팀 x 주차 승점/득점/실점 행렬을 만들어
+    출전(출석 주차) / 결장(경기가 있었던 주차 중 미출석) 구간의 합계와 평균을 구합니다.
+    반환 컬럼은 PLAYER_METRIC_COLS 순서를 따릅니다.
+    """
+    players = pd.Index(players)
+    attended = df_att_processed[df_att_processed['IsAttended'] == 1]
+
+    weeks = pd.Index(np.unique(np.concatenate([
+        attended['WeekNum'].to_numpy(dtype=np.int64),
+        df_history['Week'].to_numpy(dtype=np.int64),
+        team_points_by_week['Week'].to_numpy(dtype=np.int64),
+        df_weekly_gf['Week'].to_numpy(dtype=np.int64),
+        df_weekly_ga['Week'].to_numpy(dtype=np.int64),
+    ])))
+    teams = pd.Index(pd.unique(np.concatenate([
+        team_points_by_week['Team'].to_numpy(dtype=object),
+        df_weekly_gf['Team'].to_numpy(dtype=object),
+        df_weekly_ga['Team'].to_numpy(dtype=object),
+    ])))
+
+    # 선수 x 주차 출석 행렬 (동명이인 행은 같은 선수로 합쳐짐)
+    names = players.unique()
+    att_matrix = np.zeros((len(names), len(weeks)), dtype=bool)
+    ni = names.get_indexer(attended['선수이름'])
+    wi = weeks.get_indexer(attended['WeekNum'].astype(np.int64))
+    found = ni >= 0
+    att_matrix[ni[found], wi[found]] = True
+    present = att_matrix[names.get_indexer(players)]
+
+    # 경기가 있었던 주차 중 미출석 = 결장
+    played_weeks = weeks.isin(df_history['Week'].unique())
+    absent = played_weeks[None, :] & ~present
+
+    # 선수별 소속 팀 행 (팀이 없거나 경기 기록이 없으면 0 행)
+    my_teams = [player_team_map.get(p) for p in players]
+    team_rows = teams.get_indexer(pd.Index(my_teams, dtype=object))
+    team_rows = np.where(team_rows >= 0, team_rows, len(teams))
+
+    result = {}
+    for key, df, col in [('승점', team_points_by_week, 'PointsGained'),
+                         ('득점', df_weekly_gf, 'GF'),
+                         ('실점', df_weekly_ga, 'GA')]:
+        values, counts = _team_week_matrix(df, col, teams, weeks)
+        v, c = values[team_rows], counts[team_rows]
+        p_sum, p_cnt = (v * present).sum(axis=1), (c * present).sum(axis=1)
+        a_sum, a_cnt = (v * absent).sum(axis=1), (c * absent).sum(axis=1)
+        result[key] = {
+            'sum': p_sum,
+            'p_avg': np.divide(p_sum, p_cnt, out=np.zeros_like(p_sum), where=p_cnt > 0),
+            'a_avg': np.divide(a_sum, a_cnt, out=np.zeros_like(a_sum), where=a_cnt > 0),
+        }
+
+    metrics = np.column_stack([
+        result['승점']['sum'], result['실점']['sum'], result['득점']['sum'],        # 누적 합계 (3)
+        result['승점']['p_avg'], result['실점']['p_avg'], result['득점']['p_avg'],  # 출전 평균 (3)
+        result['승점']['a_avg'], result['실점']['a_avg'], result['득점']['a_avg'],  # 결장 평균 (3)
+        result['승점']['p_avg'] - result['승점']['a_avg'],                         # 임팩트 (3)
+        result['득점']['p_avg'] - result['득점']['a_avg'],
+        result['실점']['p_avg'] - result['실점']['a_avg'],
+        present.sum(axis=1).astype(float), absent.sum(axis=1).astype(float),     # 주차수 (2)
+    ]) if len(players) else np.zeros((0, len(PLAYER_METRIC_COLS)))
+
+    # 출석 기록이 없거나 소속 팀이 없는 선수는 모든 지표 0
+    no_data = ~present.any(axis=1) | np.array([not t for t in my_teams], dtype=bool)
+    metrics[no_data] = 0.0
+
+    return pd.DataFrame(metrics, columns=PLAYER_METRIC_COLS)
+
+
+# 주차별 누적 순위표 컬럼 (compute_standings_by_week 반환 순서)
+STANDINGS_COLS = ['Rank', 'Points', 'Played', 'W', 'D', 'L', 'GF', 'GA', 'GD']
+
+
+def compute_standings_by_week(df_history, round_goals, weeks, teams):
+    """
+    주차별 누적 순위표 (각 주차 경기까지 반영한 승점/승무패/득실점/순위)
+
+    df_history와 라운드 득실점 테이블을 주차 x 팀 격자로 한 번씩 집계한 뒤
+    주차 축으로 cumsum하고, 주차마다 (승점, 득실차, 득점) 순으로 정렬해 순위를 매깁니다.
+    마지막 주차의 결과는 process_match_results의 df_teams와 같습니다.
+    (득실점은 2개 팀 이상 참여한 유효 경기만, 동률이면 teams 순서 유지)
+
+    Args:
+        weeks: 주차 목록 (오름차순)
+        teams: 시트 컬럼 순서의 팀 목록
+
+    Returns:
+        DataFrame[Week, Team, Rank, Points, Played, W, D, L, GF, GA, GD] (주차 -> 순위 순)
+    """
+    weeks, teams = list(weeks), list(teams)
+    n_weeks, n_teams = len(weeks), len(teams)
+    grid = pd.MultiIndex.from_product([weeks, teams], names=['Week', 'Team'])
+
+    pts = df_history['PointsGained'].to_numpy()
+    results = pd.DataFrame({
+        'Week': df_history['Week'].to_numpy(),
+        'Team': df_history['Team'].to_numpy(),
+        'Points': pts,
+        'Played': np.ones(len(pts), dtype=np.int64),
+        'W': (pts == 3).astype(np.int64),
+        'D': (pts == 1).astype(np.int64),
+        'L': (pts == 0).astype(np.int64),
+    })
+    weekly = results.groupby(['Week', 'Team']).sum().reindex(grid, fill_value=0)
+
+    valid_round = round_goals.groupby('Round')['Participated'].transform('sum') >= 2
+    played = round_goals[round_goals['Participated'] & valid_round]
+    weekly = weekly.join(played.groupby(['Week', 'Team'])[['GF', 'GA']].sum().reindex(grid, fill_value=0))
+
+    # (주차, 팀, 지표) 배열로 누적
+    stat_cols = ['Points', 'Played', 'W', 'D', 'L', 'GF', 'GA']
+    cum = weekly[stat_cols].to_numpy(dtype=np.int64).reshape(n_weeks, n_teams, len(stat_cols)).cumsum(axis=0)
+    points, gf, ga = cum[..., 0], cum[..., 5], cum[..., 6]
+    gd = gf - ga
+
+    # 주차별 순위 (np.lexsort는 안정 정렬이므로 동률이면 teams 순서)
+    order = np.lexsort((-gf, -gd, -points), axis=-1)
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.arange(1, n_teams + 1)[None, :], axis=-1)
+
+    df = pd.DataFrame(cum.reshape(-1, len(stat_cols)), columns=stat_cols)
+    df.insert(0, 'Week', np.repeat(np.asarray(weeks, dtype=np.int64), n_teams))
+    df.insert(1, 'Team', np.tile(np.array(teams, dtype=object), n_weeks))
+    df.insert(2, 'Rank', rank.ravel().astype(np.int64))
+    df['GD'] = gd.ravel()
+    return df.sort_values(['Week', 'Rank'], kind='stable').reset_index(drop=True)[['Week', 'Team'] + STANDINGS_COLS]
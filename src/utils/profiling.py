@@ -0,0 +1,132 @@
+"""
+단계별 실행 시간 계측 (가벼운 중첩 span)
+
+한 번의 리런을 trace 하나로 묶고, 그 안의 단계를 span으로 기록합니다.
+- trace가 시작되지 않은 스레드(백그라운드 갱신 등)에서는 span이 아무 일도 하지 않습니다.
+- span에는 소요 시간과 함께 행 수(rows), 캐시 적중 여부(cache) 등의 속성을 붙일 수 있습니다.
+- PERF_LOG_PATH 환경 변수가 있으면 trace가 끝날 때 span마다 JSON 한 줄씩 파일에 추가합니다.
+
+사용 예:
+    with span('parse_csv', sheet='match') as s:
+        df = ...
+        s['rows'] = len(df)
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+
+PERF_LOG_PATH = os.getenv('PERF_LOG_PATH')
+
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+class Trace:
+    """리런 한 번의 span 기록 (시작 순서대로, depth로 중첩 표현)"""
+
+    def __init__(self, name):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.spans = []
+        self._stack = []
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self._t0) * 1000
+
+
+def start_trace(name):
+    """현재 스레드에서 새 trace 시작"""
+    trace = Trace(name)
+    _local.trace = trace
+    return trace
+
+
+def current_trace():
+    return getattr(_local, 'trace', None)
+
+
+def end_trace():
+    """현재 trace를 끝내고 반환 (PERF_LOG_PATH가 있으면 JSON lines로 기록)"""
+    trace = current_trace()
+    _local.trace = None
+    if trace is not None and PERF_LOG_PATH:
+        write_trace_jsonl(trace, PERF_LOG_PATH)
+    return trace
+
+
+@contextmanager
+def span(name, **attrs):
+    """
+    단계 하나의 실행 시간 기록
+
+    yield되는 dict에 값을 넣으면 span 속성으로 함께 기록됩니다.
+    """
+    trace = current_trace()
+    if trace is None:
+        yield dict(attrs)
+        return
+
+    record = {
+        'name': name,
+        'depth': len(trace._stack),
+        'parent': trace._stack[-1]['name'] if trace._stack else None,
+        'start_ms': trace.elapsed_ms(),
+        'duration_ms': None,
+        'attrs': dict(attrs),
+    }
+    trace.spans.append(record)
+    trace._stack.append(record)
+    t0 = time.perf_counter()
+    try:
+        yield record['attrs']
+    finally:
+        record['duration_ms'] = (time.perf_counter() - t0) * 1000
+        trace._stack.pop()
+
+
+def trace_rows(trace):
+    """
+    trace를 표 형태로 변환 (디버그 패널용)
+
+    Returns:
+        [{'단계', 'ms', 'rows', 'cache', '기타'}] 시작 순서, 단계 이름은 depth만큼 들여쓰기
+    """
+    rows = []
+    for s in trace.spans:
+        attrs = dict(s['attrs'])
+        n_rows = attrs.pop('rows', None)
+        rows.append({
+            '단계': '　' * s['depth'] + s['name'],
+            'ms': round(s['duration_ms'] or 0.0, 2),
+            'rows': '' if n_rows is None else str(n_rows),
+            'cache': attrs.pop('cache', None) or '',
+            '기타': ', '.join(f'{k}={v}' for k, v in attrs.items()),
+        })
+    return rows
+
+
+def write_trace_jsonl(trace, path):
+    """span마다 JSON 한 줄 (trace id, 이름, 부모, 깊이, 시작/소요 시간, 속성)"""
+    lines = []
+    for s in trace.spans:
+        lines.append(json.dumps({
+            'ts': trace.started_at,
+            'trace': trace.id,
+            'trace_name': trace.name,
+            'span': s['name'],
+            'parent': s['parent'],
+            'depth': s['depth'],
+            'start_ms': round(s['start_ms'], 3),
+            'duration_ms': round(s['duration_ms'] or 0.0, 3),
+            **{k: v for k, v in s['attrs'].items()},
+        }, ensure_ascii=False, default=str))
+    with _log_lock:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
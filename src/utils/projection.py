@@ -0,0 +1,188 @@
+"""
+남은 시즌 몬테카를로 시뮬레이션 (최종 순위 확률)
+
+지금까지의 라운드별 득실점으로 팀별 공격/수비 득점률을 추정하고,
+남은 라운드를 시즌 N개만큼 (시즌 x 라운드 x 팀) NumPy 배열로 한 번에 시뮬레이션합니다.
+- 라운드 참여 팀 구성은 지금까지의 유효 경기(2개 팀 이상 참여)에서 무작위로 다시 뽑습니다.
+- 승점 규칙은 process_match_results와 동일합니다 (상대 최다 득점보다 많으면 3점, 같으면 1점).
+- 최종 순위는 (승점, 득실차, 득점) 순, 완전히 같으면 무작위로 정합니다.
+- 시즌은 BATCH_ELEMENTS 크기의 묶음으로 나누어 계산하고, workers가 있으면 프로세스 풀에 나눠 보냅니다.
+  묶음마다 시드를 미리 나눠 주므로 workers 수와 관계없이 결과가 같습니다.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+SIM_SEASONS = int(os.getenv('SIM_SEASONS', '100000'))
+SIM_WORKERS = int(os.getenv('SIM_WORKERS', '0'))
+# 시즌 전체 주차 수 (없으면 출석 시트의 주차 컬럼 수 사용)
+SEASON_WEEKS = os.getenv('SEASON_WEEKS')
+
+# 묶음 하나의 (시즌 x 라운드 x 팀) 원소 수 상한 (메모리 사용량 제한)
+BATCH_ELEMENTS = 2_000_000
+# 득점률 축소 강도: 리그 평균 득점률의 가상 라운드 수 (경기 수가 적은 팀의 극단값 완화)
+PRIOR_ROUNDS = 3
+
+
+def season_week_count(df_att, played_weeks):
+    """시즌 전체 주차 수 (SEASON_WEEKS 환경 변수 > 출석 시트 주차 컬럼 수, 최소 played_weeks)"""
+    if SEASON_WEEKS:
+        total = int(SEASON_WEEKS)
+    else:
+        total = sum(1 for c in df_att.columns if '주차' in c)
+    return max(total, played_weeks)
+
+
+def remaining_round_count(events, df_att):
+    """
+    남은 (주차 수, 라운드 수)
+
+    남은 주차마다 지금까지 주차별 라운드 수의 중앙값만큼 경기한다고 가정합니다.
+    """
+    weeks, rounds_per_week = np.unique(events.weeks, return_counts=True)
+    if len(weeks) == 0:
+        return 0, 0
+    remaining_weeks = season_week_count(df_att, len(weeks)) - len(weeks)
+    return remaining_weeks, remaining_weeks * int(np.median(rounds_per_week))
+
+
+def fit_team_rates(round_goals, teams):
+    """
+    팀별 득점률 추정 (유효 경기만)
+
+    Returns:
+        (mu, attack, defense)
+        mu: 리그 평균 팀당 라운드 득점
+        attack: 팀 득점률 / mu (np.ndarray, teams 순서)
+        defense: 상대 한 팀당 실점률 / mu (np.ndarray, teams 순서)
+    """
+    teams = list(teams)
+    n_teams = len(teams)
+    P = round_goals['Participated'].to_numpy().reshape(-1, n_teams)
+    GF = round_goals['GF'].to_numpy().reshape(-1, n_teams)
+    GA = round_goals['GA'].to_numpy().reshape(-1, n_teams)
+
+    n_part = P.sum(axis=1)
+    valid = n_part >= 2
+    P, GF, GA, n_part = P[valid], GF[valid], GA[valid], n_part[valid]
+
+    rounds = P.sum(axis=0)
+    if rounds.sum() == 0:
+        return 1.0, np.ones(n_teams), np.ones(n_teams)
+
+    mu = max(GF[P].mean(), 1e-6)
+    # 실점은 상대 팀 수로 나누어 상대 한 팀당 실점으로 환산
+    conceded = np.where(P, GA / np.maximum(n_part[:, None] - 1, 1), 0).sum(axis=0)
+    attack = (GF.sum(axis=0) + PRIOR_ROUNDS * mu) / ((rounds + PRIOR_ROUNDS) * mu)
+    defense = (conceded + PRIOR_ROUNDS * mu) / ((rounds + PRIOR_ROUNDS) * mu)
+    return float(mu), attack, defense
+
+
+def _simulate_chunk(seed, n_seasons, n_rounds, patterns, lam_table, base):
+    """
+    시즌 n_seasons개 시뮬레이션
+
+    배열은 (팀, 시즌 x 라운드) 순서로 두어 팀 축 연산(라운드 최다 득점 등)이
+    연속된 배열끼리의 원소 연산이 되도록 합니다.
+
+    Returns:
+        (place_counts, points_sum)
+        place_counts: [팀, 순위] 횟수 (T x T)
+        points_sum: 팀별 최종 승점 합 (기대 승점 계산용)
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = patterns.shape[1]
+
+    # 라운드마다 관측된 참여 구성 하나를 복원 추출 -> 참여 여부 / 득점 기대값
+    pattern_idx = rng.integers(len(patterns), size=n_seasons * n_rounds)
+    part = patterns.T[:, pattern_idx]
+    goals = np.zeros(part.shape, dtype=np.int16)
+    goals[part] = rng.poisson(lam_table.T[:, pattern_idx][part])
+
+    # 승/무/패: 라운드 최다 득점 팀이 혼자면 3점, 여럿이면 1점, 나머지는 0점
+    # (참여 팀이 2개 이상이므로 process_match_results의 '상대 최다 득점' 규칙과 같음)
+    masked = np.where(part, goals, -1)
+    is_top = masked == masked.max(axis=0)
+    n_top = is_top.sum(axis=0)
+    points = is_top * np.where(n_top == 1, 3, 1).astype(np.int8)
+    conceded = part * goals.sum(axis=0) - goals
+
+    def season_total(x):
+        return x.reshape(n_teams, n_seasons, n_rounds).sum(axis=-1, dtype=np.int64).T
+
+    final_points = base['Points'] + season_total(points)
+    final_gf = base['GF'] + season_total(goals)
+    final_gd = final_gf - (base['GA'] + season_total(conceded))
+
+    # 순위: 승점 > 득실차 > 득점 > 무작위 (np.lexsort는 마지막 키가 우선)
+    order = np.lexsort((rng.random(final_points.shape), -final_gf, -final_gd, -final_points), axis=-1)
+    place_counts = np.bincount(
+        (order * n_teams + np.arange(n_teams)[None, :]).ravel(), minlength=n_teams * n_teams
+    ).reshape(n_teams, n_teams)
+    return place_counts, final_points.sum(axis=0)
+
+
+def _expected_goals(patterns, mu, attack, defense):
+    """참여 구성별 팀 득점 기대값 (K x T, 미참여 0): mu x 공격 계수 x 상대 팀 평균 수비 계수"""
+    n_part = patterns.sum(axis=1, keepdims=True)
+    opp_def = ((patterns * defense).sum(axis=1, keepdims=True) - defense) / np.maximum(n_part - 1, 1)
+    return np.where(patterns, mu * attack * opp_def, 0.0)
+
+
+def simulate_title_odds(df_teams, round_goals, teams, remaining_rounds,
+                        n_seasons=None, workers=None, seed=0):
+    """
+    남은 라운드를 시뮬레이션하여 팀별 최종 순위 확률 계산
+
+    Args:
+        df_teams: 현재 순위표 (process_match_results의 df_teams)
+        round_goals: 라운드 x 팀 득실점 테이블 (build_round_goals)
+        teams: round_goals의 팀 순서 (시트 컬럼 순서)
+        remaining_rounds: 남은 라운드 수
+        n_seasons: 시뮬레이션 시즌 수 (기본 SIM_SEASONS)
+        workers: 프로세스 수 (기본 SIM_WORKERS, 0이면 현재 프로세스에서 계산)
+        seed: 난수 시드
+
+    Returns:
+        DataFrame[Team, Place1..PlaceN (확률), ExpPoints] (현재 순위표 순서)
+        유효 경기가 없으면 None
+    """
+    teams = list(teams)
+    n_teams = len(teams)
+    n_seasons = SIM_SEASONS if n_seasons is None else n_seasons
+    workers = SIM_WORKERS if workers is None else workers
+
+    P = round_goals['Participated'].to_numpy().reshape(-1, n_teams)
+    patterns = P[P.sum(axis=1) >= 2]
+    if n_teams < 2 or len(patterns) == 0:
+        return None
+
+    mu, attack, defense = fit_team_rates(round_goals, teams)
+    lam_table = _expected_goals(patterns, mu, attack, defense)
+    current = df_teams.set_index('Team').reindex(teams)
+    base = {col: current[col].to_numpy(dtype=np.int64) for col in ['Points', 'GF', 'GA']}
+
+    # 묶음별 시즌 수와 시드 (SeedSequence.spawn으로 묶음마다 독립적인 난수열)
+    per_batch = max(1, BATCH_ELEMENTS // max(remaining_rounds * n_teams, 1))
+    sizes = [min(per_batch, n_seasons - start) for start in range(0, n_seasons, per_batch)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(s, n, remaining_rounds, patterns, lam_table, base) for s, n in zip(seeds, sizes)]
+
+    if workers and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_simulate_chunk, *zip(*jobs)))
+    else:
+        results = [_simulate_chunk(*job) for job in jobs]
+
+    place_counts = sum(r[0] for r in results)
+    points_sum = sum(r[1] for r in results)
+
+    odds = pd.DataFrame({'Team': teams})
+    for place in range(n_teams):
+        odds[f'Place{place + 1}'] = place_counts[:, place] / n_seasons
+    odds['ExpPoints'] = points_sum / n_seasons
+    return odds.set_index('Team').loc[df_teams['Team']].reset_index()
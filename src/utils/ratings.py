@@ -0,0 +1,222 @@
+"""
+선수 보정 플러스마이너스 (RAPM, ridge 회귀)
+
+출전/결장 평균의 차이(임팩트)는 함께 뛴 동료와 상대를 고려하지 않으므로,
+팀-주차 하나를 관측 하나로 보고 모든 선수의 기여도를 한 번에 회귀로 추정합니다.
+- 관측: (주차, 팀)마다 라운드당 승점/득점 (가중치 = 그 주차 유효 경기 수)
+- 승점 모델: 출석한 우리 팀 선수 +1, 출석한 상대 팀 선수 -(라운드별 상대 비중 평균)
+- 득점 모델: 우리 팀 선수의 공격 계수 + 상대 팀 선수의 수비 계수 (실점은 상대의 득점이므로 따로 풀지 않음)
+- 절편은 벌점 없이, 선수 계수에만 ridge 벌점(RAPM_LAMBDA)을 줍니다.
+- 주차 단위 부트스트랩(복원 추출)을 묶음으로 풀어 신뢰 구간을 구합니다.
+
+선수 수가 수백 명 수준이므로 전체 표본은 정규 방정식(선수 x 선수)을 NumPy로 직접 풀고,
+가중치만 다른 부트스트랩 문제들은 묶어서 켤레 기울기법으로 풉니다.
+"""
+
+import os
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+
+RAPM_LAMBDA = float(os.getenv('RAPM_LAMBDA', '30'))
+BOOTSTRAP_SAMPLES = int(os.getenv('RAPM_BOOTSTRAP', '200'))
+# 부트스트랩 한 묶음의 표본 수 (묶음마다 (표본 x 행) 가중치 행렬로 함께 풀이)
+BOOTSTRAP_BATCH = 100
+CI_LEVEL = 0.9
+
+# compute_rapm 반환 지표 (각 지표마다 _하한, _상한 컬럼이 함께 붙음)
+RAPM_COLS = ['RAPM_승점', 'RAPM_공격', 'RAPM_수비']
+
+
+def _opponent_weights(round_goals, teams, weeks):
+    """
+    주차별 상대 비중 (W x T x T)
+
+    [w, A, B] = 주차 w에 A가 치른 유효 경기마다 B가 상대였으면 1/(상대 팀 수)를 더한 값
+    (라운드 수로 나누면 '라운드당 평균 상대 비중')
+    """
+    n_teams = len(teams)
+    P = round_goals['Participated'].to_numpy().reshape(-1, n_teams)
+    round_weeks = round_goals['Week'].to_numpy().reshape(-1, n_teams)[:, 0]
+    n_part = P.sum(axis=1)
+    valid = n_part >= 2
+    P, round_weeks, n_part = P[valid].astype(float), round_weeks[valid], n_part[valid]
+
+    pair = P[:, :, None] * P[:, None, :] / (n_part - 1)[:, None, None]
+    pair[:, np.arange(n_teams), np.arange(n_teams)] = 0.0
+    opp = np.zeros((len(weeks), n_teams, n_teams))
+    np.add.at(opp, weeks.get_indexer(round_weeks), pair)
+    return opp
+
+
+def build_rapm_design(df_players, df_att_processed, df_history, round_goals):
+    """
+    RAPM 회귀 입력 (팀-주차 행)
+
+    Args:
+        df_players: 선수 목록 (Player, Team)
+        df_att_processed: process_attendance 결과
+        df_history: 유효 경기별 팀 승점 (Week, Team, PointsGained)
+        round_goals: 라운드 x 팀 득실점 테이블
+
+    Returns:
+        dict
+        row_week: 행별 주차 위치 (부트스트랩 단위)
+        weight: 행별 가중치 (유효 경기 수)
+        X_points, y_points: 승점 모델 (절편 열 + 선수 P열)
+        X_goals, y_goals: 득점 모델 (절편 열 + 공격 P열 + 수비 P열)
+    """
+    players = pd.Index(df_players['Player'])
+    teams = pd.Index(pd.unique(round_goals['Team']))
+    weeks = pd.Index(np.unique(df_history['Week'].to_numpy(dtype=np.int64)))
+    n_players, n_teams, n_weeks = len(players), len(teams), len(weeks)
+
+    # 주차 x 팀 유효 경기 수 / 승점 / 득점
+    wi = weeks.get_indexer(df_history['Week'])
+    ti = teams.get_indexer(df_history['Team'])
+    rounds = np.zeros((n_weeks, n_teams))
+    points = np.zeros((n_weeks, n_teams))
+    np.add.at(rounds, (wi, ti), 1)
+    np.add.at(points, (wi, ti), df_history['PointsGained'].to_numpy(dtype=float))
+
+    n_part = round_goals.groupby('Round')['Participated'].transform('sum')
+    played = round_goals[round_goals['Participated'] & (n_part >= 2)]
+    goals = np.zeros((n_weeks, n_teams))
+    np.add.at(goals, (weeks.get_indexer(played['Week']), teams.get_indexer(played['Team'])),
+              played['GF'].to_numpy(dtype=float))
+
+    # 선수 x 주차 출석, 선수별 소속 팀 (팀이 없으면 -1)
+    attended = df_att_processed[df_att_processed['IsAttended'] == 1]
+    present = np.zeros((n_players, n_weeks), dtype=bool)
+    pi = players.get_indexer(attended['선수이름'])
+    awi = weeks.get_indexer(attended['WeekNum'].astype(np.int64))
+    found = (pi >= 0) & (awi >= 0)
+    present[pi[found], awi[found]] = True
+    player_team = teams.get_indexer(pd.Index(df_players['Team'], dtype=object))
+    present &= (player_team >= 0)[:, None]
+
+    # 팀-주차 행 (경기가 있었던 칸만)
+    row_w, row_t = np.nonzero(rounds > 0)
+    weight = rounds[row_w, row_t]
+    opp = _opponent_weights(round_goals, teams, weeks)[row_w, row_t] / weight[:, None]  # (행, 상대 팀)
+
+    # 행 x 선수: 우리 팀 출석 여부 / 상대 비중 (선수 소속 팀 기준)
+    player_present = present[:, row_w].T                                               # (행, 선수)
+    own = player_present & (player_team[None, :] == row_t[:, None])
+    opp_player = np.where(player_team >= 0, opp[:, np.maximum(player_team, 0)], 0.0) * player_present
+
+    ones = np.ones((len(row_w), 1))
+    return {
+        'row_week': row_w,
+        'weight': weight,
+        'X_points': np.hstack([ones, own - opp_player]),
+        'y_points': points[row_w, row_t] / weight,
+        'X_goals': np.hstack([ones, own.astype(float), -opp_player]),
+        'y_goals': goals[row_w, row_t] / weight,
+    }
+
+
+def _penalty(n_cols, lam):
+    """열별 ridge 벌점 (첫 열은 절편이므로 0)"""
+    penalty = np.full(n_cols, float(lam))
+    penalty[0] = 0.0
+    return penalty
+
+
+def solve_ridge(X, y, sample_weight, lam):
+    """가중 ridge 회귀 정규 방정식 직접 풀이 (첫 열은 벌점 없는 절편)"""
+    A = (X * sample_weight[:, None]).T @ X + np.diag(_penalty(X.shape[1], lam))
+    A[0, 0] += 1e-9
+    return np.linalg.solve(A, (sample_weight * y) @ X)
+
+
+def solve_ridge_batch(X, y, sample_weights, lam, base_weight, tol=1e-6, max_iter=200):
+    """
+    가중치만 다른 ridge 문제 B개를 한꺼번에 풀이 (부트스트랩용)
+
+    문제마다 (열 x 열) 행렬을 분해하는 대신 켤레 기울기법(CG)으로 X 곱셈 두 번
+    (B x 행 x 열 행렬곱)만 반복합니다. 전처리는 base_weight(전체 표본) 문제의 역행렬,
+    시작값은 전체 표본 해를 사용하므로 몇 번의 반복으로 수렴합니다.
+
+    Args:
+        sample_weights: (B, 행) 가중치
+        base_weight: (행,) 전체 표본 가중치
+
+    Returns:
+        (B, 열) 계수
+    """
+    penalty = _penalty(X.shape[1], lam)
+    A0 = (X * base_weight[:, None]).T @ X + np.diag(penalty)
+    A0[0, 0] += 1e-9
+    precond = np.linalg.inv(A0)
+
+    def apply_A(v):
+        return ((X @ v.T).T * sample_weights) @ X + v * penalty
+
+    b = (sample_weights * y) @ X
+    x = np.broadcast_to(precond @ ((base_weight * y) @ X), b.shape).copy()
+    r = b - apply_A(x)
+    z = r @ precond
+    p = z.copy()
+    rz = (r * z).sum(axis=1)
+    b_norm = np.maximum(np.linalg.norm(b, axis=1), 1e-12)
+    for _ in range(max_iter):
+        if (np.linalg.norm(r, axis=1) / b_norm).max() < tol:
+            break
+        Ap = apply_A(p)
+        alpha = rz / np.maximum((p * Ap).sum(axis=1), 1e-300)
+        x += alpha[:, None] * p
+        r -= alpha[:, None] * Ap
+        z = r @ precond
+        rz_new = (r * z).sum(axis=1)
+        p = z + (rz_new / np.maximum(rz, 1e-300))[:, None] * p
+        rz = rz_new
+    return x
+
+
+def compute_rapm(df_players, df_att_processed, df_history, round_goals,
+                 lam=None, n_bootstrap=None, seed=0):
+    """
+    선수별 RAPM과 부트스트랩 신뢰 구간
+
+    Returns:
+        DataFrame[Player, Team, RAPM_승점, RAPM_승점_하한, RAPM_승점_상한, RAPM_공격, ..., RAPM_수비, ...]
+        (df_players 순서, 라운드당 값. 수비는 클수록 상대 득점을 줄인 것)
+    """
+    lam = RAPM_LAMBDA if lam is None else lam
+    n_bootstrap = BOOTSTRAP_SAMPLES if n_bootstrap is None else n_bootstrap
+    design = build_rapm_design(df_players, df_att_processed, df_history, round_goals)
+    n_players = len(df_players)
+    weight, row_week = design['weight'], design['row_week']
+
+    def split(coef_points, coef_goals):
+        # 절편을 뺀 (승점, 공격, 수비) 계수를 마지막 축으로
+        return np.stack([coef_points[..., 1:], coef_goals[..., 1:n_players + 1],
+                         coef_goals[..., n_players + 1:]], axis=-1)
+
+    coef_points = solve_ridge(design['X_points'], design['y_points'], weight, lam)
+    coef_goals = solve_ridge(design['X_goals'], design['y_goals'], weight, lam)
+    estimate = split(coef_points, coef_goals)
+
+    # 주차 단위 복원 추출: 표본마다 주차별 뽑힌 횟수를 행 가중치에 곱함
+    rng = np.random.default_rng(seed)
+    n_weeks = int(row_week.max()) + 1 if len(row_week) else 0
+    samples = []
+    for start in range(0, n_bootstrap if n_weeks else 0, BOOTSTRAP_BATCH):
+        size = min(BOOTSTRAP_BATCH, n_bootstrap - start)
+        week_counts = rng.multinomial(n_weeks, np.full(n_weeks, 1.0 / n_weeks), size=size)
+        sw = week_counts[:, row_week] * weight
+        samples.append(split(solve_ridge_batch(design['X_points'], design['y_points'], sw, lam, weight),
+                             solve_ridge_batch(design['X_goals'], design['y_goals'], sw, lam, weight)))
+
+    # 신뢰 구간: 추정값 ± z x 부트스트랩 표준오차 (ridge 축소 때문에 백분위 구간은 추정값을 벗어날 수 있음)
+    result = df_players[['Player', 'Team']].reset_index(drop=True).copy()
+    z = NormalDist().inv_cdf(0.5 + CI_LEVEL / 2)
+    std_err = np.concatenate(samples).std(axis=0, ddof=1) if sum(len(s) for s in samples) > 1 else None
+    for k, col in enumerate(RAPM_COLS):
+        result[col] = estimate[:, k]
+        result[f'{col}_하한'] = estimate[:, k] - z * std_err[:, k] if std_err is not None else np.nan
+        result[f'{col}_상한'] = estimate[:, k] + z * std_err[:, k] if std_err is not None else np.nan
+    return result
@@ -0,0 +1,257 @@
+"""
+Google Sheets CSV export 다운로드 클라이언트
+
+- keep-alive 연결을 재사용하는 requests.Session 하나로 모든 요청을 처리
+- 여러 시트를 스레드로 동시에 받아 전체 시간이 가장 느린 시트 하나 수준이 되도록 함
+- 연결/읽기 타임아웃을 분리하여 지정
+- ETag/Last-Modified 조건부 요청으로 바뀌지 않은 시트는 304 응답만 받고 이전 본문을 재사용
+- 일시적 오류(연결 실패, 타임아웃, 429/5xx)는 지터를 준 지수 백오프로 몇 번만 재시도
+- 연속으로 실패하면 서킷 브레이커가 열려 쿨다운 동안은 요청을 보내지 않고 바로 실패
+  (호출하는 쪽은 기다리지 않고 마지막 정상 데이터를 사용)
+"""
+
+import io
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+CONNECT_TIMEOUT_SECONDS = float(os.getenv('SHEETS_CONNECT_TIMEOUT', '3.05'))
+READ_TIMEOUT_SECONDS = float(os.getenv('SHEETS_READ_TIMEOUT', '10'))
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# 시트 하나당 재시도 횟수와 백오프 (대기 = 0 ~ min(상한, 기본 x 2^시도) 사이 무작위)
+RETRY_ATTEMPTS = int(os.getenv('SHEETS_RETRIES', '2'))
+BACKOFF_BASE_SECONDS = float(os.getenv('SHEETS_BACKOFF_BASE', '0.5'))
+BACKOFF_MAX_SECONDS = 4.0
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# 연속 실패 BREAKER_FAILURES번이면 BREAKER_COOLDOWN초 동안 요청 차단
+BREAKER_FAILURES = int(os.getenv('SHEETS_BREAKER_FAILURES', '3'))
+BREAKER_COOLDOWN_SECONDS = float(os.getenv('SHEETS_BREAKER_COOLDOWN', '60'))
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않은 경우"""
+
+
+class CircuitBreaker:
+    """
+    연속 실패 횟수 기반 서킷 브레이커 (스레드 안전)
+
+    - closed: 정상. 연속 실패가 failure_threshold번이 되면 open
+    - open: cooldown초 동안 모든 요청을 즉시 거절
+    - half_open: 쿨다운이 지나면 시험 요청 하나만 허용. 성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(self, failure_threshold=None, cooldown=None):
+        self.failure_threshold = BREAKER_FAILURES if failure_threshold is None else failure_threshold
+        self.cooldown = BREAKER_COOLDOWN_SECONDS if cooldown is None else cooldown
+        self._lock = threading.Lock()
+        self._state = 'closed'
+        self._opened_at = None
+        self._trial_running = False
+        self._stats = {
+            'consecutive_failures': 0,
+            'total_failures': 0,
+            'total_successes': 0,
+            'times_opened': 0,
+            'rejected': 0,          # 열려 있어 보내지 않은 요청 수
+            'last_failure': None,   # 마지막 실패 사유
+        }
+
+    def allow(self):
+        """요청을 보내도 되는지 확인 (half_open이면 시험 요청 하나만 True)"""
+        with self._lock:
+            if self._state == 'open' and time.time() - self._opened_at >= self.cooldown:
+                self._state = 'half_open'
+            if self._state == 'closed':
+                return True
+            if self._state == 'half_open' and not self._trial_running:
+                self._trial_running = True
+                return True
+            self._stats['rejected'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = 'closed'
+            self._opened_at = None
+            self._trial_running = False
+            self._stats['consecutive_failures'] = 0
+            self._stats['total_successes'] += 1
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self._stats['consecutive_failures'] += 1
+            self._stats['total_failures'] += 1
+            self._stats['last_failure'] = None if error is None else str(error)
+            self._trial_running = False
+            if self._state == 'half_open' or self._stats['consecutive_failures'] >= self.failure_threshold:
+                if self._state != 'open':
+                    self._stats['times_opened'] += 1
+                self._state = 'open'
+                self._opened_at = time.time()
+
+    def status(self):
+        """브레이커 상태와 실패 횟수 (open이면 다시 시도할 시각 retry_at 포함)"""
+        with self._lock:
+            status = dict(self._stats)
+            status['state'] = self._state
+            status['opened_at'] = self._opened_at
+            status['retry_at'] = self._opened_at + self.cooldown if self._state == 'open' else None
+        return status
+
+
+def _is_retryable(error):
+    """일시적 오류인지 (연결 실패, 타임아웃, 중간에 끊긴 본문, 429/5xx 응답)"""
+    import requests
+
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRY_STATUS_CODES
+    return isinstance(error, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError))
+
+
+def backoff_delay(attempt, base=None, cap=BACKOFF_MAX_SECONDS):
+    """attempt번째 재시도 전 대기 시간 (full jitter: 0 ~ min(cap, base x 2^attempt))"""
+    base = BACKOFF_BASE_SECONDS if base is None else base
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class SheetsClient:
+    """
+    시트 다운로드용 공유 HTTP 클라이언트 (스레드 안전)
+
+    URL별로 마지막 응답의 검증자(ETag, Last-Modified)와 본문을 기억해 두고
+    다음 요청에 If-None-Match / If-Modified-Since 헤더로 보냅니다.
+    """
+
+    def __init__(self, pool_size=4, connect_timeout=None, read_timeout=None,
+                 retries=None, breaker=None):
+        self.retries = RETRY_ATTEMPTS if retries is None else retries
+        self.breaker = CircuitBreaker() if breaker is None else breaker
+        self.timeout = (
+            CONNECT_TIMEOUT_SECONDS if connect_timeout is None else connect_timeout,
+            READ_TIMEOUT_SECONDS if read_timeout is None else read_timeout,
+        )
+        # requests는 실제로 시트를 받을 때만 필요하므로 지연 import (엔진 import 비용 절감)
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='sheets-fetch')
+        self._lock = threading.Lock()
+        # url -> {'etag', 'last_modified', 'body'}
+        self._validators = {}
+        # 마지막 fetch 통계 (304로 재사용한 시트 수, 받은 바이트 수)
+        self.last_fetch = {}
+
+    def fetch(self, url):
+        """
+        URL 하나를 받아 (본문 바이트, 304 여부, 재시도 횟수) 반환
+
+        일시적 오류는 self.retries번까지 백오프 후 재시도하고, 그 외 오류는 바로 올립니다.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                body, not_modified = self._fetch_once(url)
+                return body, not_modified, attempt
+            except Exception as e:
+                if attempt >= self.retries or not _is_retryable(e):
+                    raise
+                time.sleep(backoff_delay(attempt))
+
+    def _fetch_once(self, url):
+        """
+        URL 하나를 한 번 요청하여 (본문 바이트, 304 여부) 반환
+
+        본문은 청크 단위 스트리밍으로 읽습니다. 304면 이전 본문을 그대로 반환합니다.
+        """
+        with self._lock:
+            cached = self._validators.get(url)
+
+        headers = {}
+        if cached is not None:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as resp:
+            if resp.status_code == 304 and cached is not None:
+                return cached['body'], True
+            resp.raise_for_status()
+
+            buf = io.BytesIO()
+            for chunk in resp.iter_content(chunk_size=STREAM_CHUNK_BYTES):
+                buf.write(chunk)
+            body = buf.getvalue()
+
+            etag = resp.headers.get('ETag')
+            last_modified = resp.headers.get('Last-Modified')
+
+        with self._lock:
+            if etag or last_modified:
+                self._validators[url] = {'etag': etag, 'last_modified': last_modified, 'body': body}
+            else:
+                self._validators.pop(url, None)
+        return body, False
+
+    def fetch_many(self, urls):
+        """
+        여러 URL을 동시에 받아 입력 순서대로 본문 바이트 리스트 반환 (하나라도 실패하면 예외)
+
+        한 번의 fetch_many가 브레이커의 호출 하나입니다. 브레이커가 열려 있으면
+        요청 없이 바로 CircuitOpenError를 올립니다.
+        """
+        if not self.breaker.allow():
+            status = self.breaker.status()
+            wait = max(0.0, (status['retry_at'] or time.time()) - time.time())
+            raise CircuitOpenError(
+                f"연속 {status['consecutive_failures']}회 실패로 요청을 잠시 중단했습니다 "
+                f"({wait:.0f}초 후 재시도, 마지막 오류: {status['last_failure']})"
+            )
+
+        futures = [self._executor.submit(self.fetch, url) for url in urls]
+        try:
+            results = [f.result() for f in futures]
+        except Exception as e:
+            self.breaker.record_failure(e)
+            raise
+        self.breaker.record_success()
+
+        self.last_fetch = {
+            'sheets': len(results),
+            'not_modified': sum(1 for _, not_modified, _ in results if not_modified),
+            'bytes_downloaded': sum(len(body) for body, not_modified, _ in results if not not_modified),
+            'retries': sum(retries for _, _, retries in results),
+        }
+        return [body for body, _, _ in results]
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_sheets_client():
+    """프로세스 공유 SheetsClient (처음 호출 시 생성)"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = SheetsClient()
+        return _default_client
+
+
+def reset_sheets_client():
+    """공유 SheetsClient 폐기 (연결, 조건부 요청 검증자, 브레이커 상태 초기화)"""
+    global _default_client
+    with _default_client_lock:
+        client, _default_client = _default_client, None
+    if client is not None:
+        client.session.close()
+        client._executor.shutdown(wait=False)
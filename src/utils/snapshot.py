@@ -0,0 +1,203 @@
+"""
+데이터 버전별 리그 스냅샷
+
+입력 데이터의 내용 해시(data_version)마다 파생 결과를 한 번만 계산하여
+모든 세션이 읽기 전용으로 공유합니다. 오래된 버전은 LRU 방식으로 제거됩니다.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .attendance import build_attendance_matrix
+from .data_loader import get_team_columns, process_match_results, process_attendance
+from .elo import EloLedger
+from .events import build_match_events
+from .profiling import span
+from .metrics import build_round_goals, compute_weekly_gf, compute_weekly_ga, build_player_table, compute_standings_by_week
+
+
+@dataclass(frozen=True)
+class LeagueSnapshot:
+    """
+    한 데이터 버전의 리그 파생 결과 묶음 (읽기 전용)
+
+    ⚠️ 여러 세션이 같은 객체를 공유하므로 DataFrame을 직접 수정하지 말고
+    필요하면 .copy() 후 사용합니다.
+    """
+    version: str
+    events: object                   # 정규화된 득점 이벤트 (MatchEvents, 경기 시트의 유일한 파싱 결과)
+    df_att: pd.DataFrame             # 출석 시트 원본
+    attendance: object               # 선수 x 주차 출석 행렬 (AttendanceMatrix, 출석 셀의 유일한 판정 결과)
+    teams: tuple                     # 순위 순서의 팀 컬럼명
+    df_teams: pd.DataFrame
+    standings_by_week: pd.DataFrame  # 주차별 누적 순위표 (Week, Team, Rank, ...), 마지막 주차 = df_teams
+    df_history: pd.DataFrame
+    df_scorers: pd.DataFrame
+    df_att_processed: pd.DataFrame
+    team_points_by_week: pd.DataFrame
+    round_goals: pd.DataFrame        # 라운드 x 팀 득실점 (GF, GA, Participated)
+    elo_ledger: pd.DataFrame         # 라운드 직후 팀 레이팅 원장 (Seq, Week, Round, Team, Rating, Delta)
+    df_weekly_gf: pd.DataFrame
+    df_weekly_ga: pd.DataFrame
+    df_players_all: pd.DataFrame
+    # 화면 섹션(탭)별 파생 데이터 캐시 (section()으로 처음 요청될 때 계산)
+    _sections: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _section_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def section(self, name, builder):
+        """
+        섹션 데이터를 처음 요청될 때 builder()로 한 번만 계산하여 재사용
+
+        같은 스냅샷을 공유하는 모든 세션이 결과를 함께 사용하므로
+        builder는 스냅샷 내용에만 의존해야 합니다.
+        """
+        with self._section_lock:
+            entry = self._sections.setdefault(name, {'lock': threading.Lock(), 'value': None, 'ready': False})
+        with span(f'section:{name}') as s:
+            with entry['lock']:
+                s['cache'] = 'hit' if entry['ready'] else 'miss'
+                if not entry['ready']:
+                    entry['value'] = builder()
+                    entry['ready'] = True
+        return entry['value']
+
+
+def build_league_snapshot(df_match, df_att, version, league_state=None):
+    """
+    원본 시트로부터 스냅샷 생성
+
+    league_state(IncrementalLeagueState)가 주어지면 경기 결과, 출석, 팀 레이팅은
+    새로 추가/변경된 라운드(주차)만 계산합니다. 이벤트 테이블, 주차별 순위표, 선수 지표는
+    버전마다 시즌 전체로 다시 만듭니다.
+    """
+    # 경기 시트는 여기서 한 번만 파싱하고 이후에는 이벤트 테이블만 사용
+    with span('match_events') as s:
+        events = build_match_events(df_match, get_team_columns(df_match))
+        s['rows'] = len(events.goals)
+
+    with span('match_results') as s:
+        if league_state is not None:
+            df_teams, df_history, df_scorers = league_state.update_match_results(df_match, events=events)
+            s.update(rounds_reused=league_state.last_update.get('match_rounds_reused'),
+                     rounds_applied=league_state.last_update.get('match_rounds_applied'))
+        else:
+            df_teams, df_history, df_scorers = process_match_results(df_match, events=events)
+        s['rows'] = len(df_match)
+
+    with span('attendance') as s:
+        attendance = build_attendance_matrix(df_att)
+        if league_state is not None:
+            df_att_processed = league_state.update_attendance(df_att, attendance)
+            s.update(weeks_reused=league_state.last_update.get('attendance_weeks_reused'),
+                     weeks_applied=league_state.last_update.get('attendance_weeks_applied'))
+        else:
+            df_att_processed = process_attendance(df_att, attendance)
+        s['rows'] = len(df_att_processed)
+
+    teams = tuple(df_teams['Team'].tolist())
+
+    # --- 데이터 전처리를 위한 기본 정보 구성 ---
+    df_history = df_history.copy()
+    df_history['Week'] = df_history['Week'].astype(int)
+    team_points_by_week = df_history.groupby(['Week', 'Team'])['PointsGained'].sum().reset_index()
+
+    # 득점/실점 주차별 데이터 (라운드 x 팀 득실점 테이블 한 번으로 모두 계산)
+    with span('round_goals') as s:
+        round_goals = build_round_goals(events)
+        df_weekly_gf = compute_weekly_gf(round_goals)
+        df_weekly_ga = compute_weekly_ga(round_goals)
+        s['rows'] = len(round_goals)
+
+    with span('standings_by_week') as s:
+        standings_by_week = compute_standings_by_week(df_history, round_goals, np.unique(events.weeks), events.teams)
+        s['rows'] = len(standings_by_week)
+
+    with span('elo') as s:
+        if league_state is not None:
+            elo_ledger = league_state.update_elo(events)
+            s.update(rounds_reused=league_state.last_update.get('elo_rounds_reused'),
+                     rounds_applied=league_state.last_update.get('elo_rounds_applied'))
+        else:
+            elo_ledger = EloLedger().update(events)
+        s['rows'] = len(elo_ledger)
+
+    with span('player_metrics') as s:
+        df_players_all = build_player_table(df_att, df_att_processed, df_scorers, df_history, team_points_by_week, df_weekly_gf, df_weekly_ga)
+        s['rows'] = len(df_players_all)
+
+    return LeagueSnapshot(
+        version=version,
+        events=events,
+        df_att=df_att,
+        attendance=attendance,
+        teams=teams,
+        df_teams=df_teams,
+        standings_by_week=standings_by_week,
+        df_history=df_history,
+        df_scorers=df_scorers,
+        df_att_processed=df_att_processed,
+        team_points_by_week=team_points_by_week,
+        round_goals=round_goals,
+        elo_ledger=elo_ledger,
+        df_weekly_gf=df_weekly_gf,
+        df_weekly_ga=df_weekly_ga,
+        df_players_all=df_players_all,
+    )
+
+
+class SnapshotRegistry:
+    """
+    data_version -> LeagueSnapshot 공유 저장소 (스레드 안전, LRU 제거)
+
+    같은 버전을 여러 세션이 동시에 요청해도 빌드는 한 번만 수행됩니다.
+    """
+
+    def __init__(self, max_versions=3):
+        self.max_versions = max_versions
+        self._lock = threading.Lock()
+        self._snapshots = OrderedDict()
+        self._build_locks = {}
+
+    def get(self, version):
+        with self._lock:
+            snapshot = self._snapshots.get(version)
+            if snapshot is not None:
+                self._snapshots.move_to_end(version)
+            return snapshot
+
+    def get_or_build(self, version, builder):
+        """버전이 없으면 builder()로 생성하여 등록 후 반환"""
+        snapshot = self.get(version)
+        if snapshot is not None:
+            with span('snapshot', cache='hit'):
+                return snapshot
+
+        with self._lock:
+            build_lock = self._build_locks.setdefault(version, threading.Lock())
+
+        with span('snapshot') as s, build_lock:
+            # 대기하는 동안 다른 세션이 빌드를 끝냈을 수 있음
+            snapshot = self.get(version)
+            s['cache'] = 'hit' if snapshot is not None else 'miss'
+            if snapshot is None:
+                snapshot = builder()
+                self.put(snapshot)
+
+        with self._lock:
+            self._build_locks.pop(version, None)
+        return snapshot
+
+    def put(self, snapshot):
+        with self._lock:
+            self._snapshots[snapshot.version] = snapshot
+            self._snapshots.move_to_end(snapshot.version)
+            while len(self._snapshots) > self.max_versions:
+                self._snapshots.popitem(last=False)
+
+    def versions(self):
+        with self._lock:
+            return list(self._snapshots.keys())
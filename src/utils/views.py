@@ -0,0 +1,517 @@
+"""
+화면(탭)별 표시용 테이블 생성 (UI 라이브러리 의존 없음)
+
+스냅샷(LeagueSnapshot)만 입력으로 받아 각 탭이 그대로 출력할 DataFrame을 만듭니다.
+Streamlit 앱은 이 결과를 snapshot.section()으로 캐시하여 렌더링만 하고,
+CLI/배치 작업도 같은 함수로 동일한 표를 얻을 수 있습니다.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from .attendance import ABSENT_VALUES, is_attended_value, map_unique_values
+from .elo import ELO_INITIAL, weekly_ratings
+from .metrics import compute_team_trends
+from .projection import SIM_SEASONS, remaining_round_count, simulate_title_odds
+from .ratings import CI_LEVEL, compute_rapm
+from .profiling import span
+
+
+# 개인 기록 탭 랭킹 (제목, 설명, 대상 선수, 정렬 컬럼, 표시 컬럼, 컬럼명, 오름차순 여부)
+# 대상 선수: 'all' = 전체, 'active' = 출석 기록이 있는 선수
+PERSONAL_RANKINGS = [
+    ("👟 Golden Boot (Top 10)", "리그 최고의 득점 기계! 가장 많은 득점을 기록한 주인공입니다.",
+     'all', '득점', ['Player', '득점', 'Team'],
+     {'Player': '선수', 'Team': '팀', '득점': '득점'}, False),
+    ("🦸 아이언 맨 (Top 10)", "리그의 기둥! 성실함의 상징, 철의 체력으로 모든 경기를 함께합니다.",
+     'all', '출석횟수', ['Player', '출석횟수', 'Team'],
+     {'Player': '선수', 'Team': '팀', '출석횟수': '출석횟수'}, False),
+    ("⚡ 가성비 스트라이커 (Top 10)", "최강의 효율! 적은 기회도 놓치지 않고 득점으로 연결하는 해결사입니다. (득점/출석횟수)",
+     'active', '경기당 득점', ['Player', '출석 당 득점_disp', '득점', '출석횟수', 'Team'],
+     {'Player': '선수', 'Team': '팀', '출석 당 득점_disp': '출석 당 득점', '득점': '개인득점', '출석횟수': '출석'}, False),
+    ("🧚 승리 요정 (Top 10)", "승리의 부적! 내가 경기에 나서는 것만으로도 팀의 승리 확률이 올라갑니다. (나올 때 팀 평균 승점)",
+     'active', '출전_평균승점', ['Player', '출석 당 팀승점_disp', '팀승점합계', '출석횟수', 'Team'],
+     {'Player': '선수', 'Team': '팀', '출석 당 팀승점_disp': '출석 당 팀승점', '팀승점합계': '누적 팀승점', '출석횟수': '출석'}, False),
+    ("🚀 득점 폭격기 (Top 10)", "공격의 불씨! 내가 그라운드에 있으면 팀 전체의 화력이 불을 뿜습니다. (나올 때 팀 평균 득점)",
+     'active', '출전_평균득점', ['Player', '출석 당 팀득점_disp', '팀득점합계', '출석횟수', 'Team'],
+     {'Player': '선수', 'Team': '팀', '출석 당 팀득점_disp': '출석 당 팀득점', '팀득점합계': '누적 팀 득점', '출석횟수': '출석'}, False),
+    # 실점은 낮은게 좋은 순위
+    ("🧱 통곡의 벽 (Bottom 10)", "철통 보안! 상대 공격수들을 절망에 빠뜨리는 든든한 수비의 핵심입니다. (나올 때 팀 평균 실점)",
+     'active', '출전_평균실점', ['Player', '출석 당 팀실점_disp', '팀실점합계', '출석횟수', 'Team'],
+     {'Player': '선수', 'Team': '팀', '출석 당 팀실점_disp': '출석 당 팀실점', '팀실점합계': '누적 팀실점', '출석횟수': '출석'}, True),
+]
+
+# 임팩트 탭 랭킹 (제목, 설명, 임팩트 컬럼, 오름차순 여부)
+IMPACT_RANKINGS = [
+    ("🏆 승점 임팩트 (승리 유전자)", "진정한 승리 전문가! 내가 경기에 나서는 것만으로도 팀의 승점 기대치가 이만큼 상승합니다.", '임팩트_승점', False),
+    ("⚽ 득점 임팩트 (공격의 핵)", "팀 화력의 기폭제! 내가 그라운드에 있을 때 우리 팀은 더 많은 득점을 기록하게 됩니다.", '임팩트_득점', False),
+    # 실점 임팩트 (Bottom 10/5)
+    ("🛡️ 실점 임팩트 (통곡의 벽)", "골문 최후의 보루! 내가 수비 중심을 잡으면 상대 팀의 득점 확률이 눈에 띄게 줄어듭니다.", '임팩트_실점', True),
+]
+
+
+# 팀 이름 변환 함수 (스타크(블루) -> 🔵 스타크)
+def format_team_name(name):
+    if '레드' in name: return '🔴 타르가르옌'
+    if '블루' in name: return '🔵 스타크'
+    if '옐로' in name: return '🟡 라니스터'
+    return name
+
+
+def team_short_name(name):
+    """표 내부용 짧은 팀 이름 (이모지만 표시)"""
+    return '🔴' if '레드' in name else '🔵' if '블루' in name else '🟡'
+
+
+def team_color(name):
+    """실제 팀별 색상"""
+    if '레드' in name: return '#ef4444'
+    if '블루' in name: return '#3b82f6'
+    if '옐로' in name: return '#eab308'
+    return '#6c757d'
+
+
+# 순위표 표시 컬럼 (원본 컬럼 -> 표시 이름)
+STANDINGS_DISPLAY_COLS = {
+    'Team': '팀',
+    'Points': '승점',
+    'Played': '경기수',
+    'W': '승',
+    'D': '무',
+    'L': '패',
+    'GF': '득점',
+    'GA': '실점',
+    'GD': '득실차',
+    'Rating': '레이팅',
+}
+
+
+def _standings_table(df_teams, team_short_map, ratings):
+    """순위 순서의 팀 통계 -> 표시용 순위표 (팀은 짧은 이름, ratings: 팀별 Elo 레이팅)"""
+    df_display = df_teams.copy()
+    df_display['Rating'] = df_display['Team'].map(ratings).round().astype(int)
+    df_display['Team'] = df_display['Team'].map(team_short_map)
+    df_display = df_display.rename(columns=STANDINGS_DISPLAY_COLS)
+    return df_display[list(STANDINGS_DISPLAY_COLS.values())].reset_index(drop=True)
+
+
+def standings_by_week_view(league):
+    """
+    종합 순위 탭의 주차 슬라이더용: {주차: 그 주차까지의 순위표}
+
+    스냅샷의 주차별 누적 순위표를 주차마다 한 번씩 표로 만들어 두므로
+    슬라이더로 주차를 바꿀 때는 dict 조회만 합니다.
+    """
+    team_short_map = {t: team_short_name(t) for t in league.teams}
+    ratings_by_week = weekly_ratings(league.elo_ledger)
+    return {
+        int(week): _standings_table(df_week, team_short_map, ratings_by_week.loc[week])
+        for week, df_week in league.standings_by_week.groupby('Week', sort=True)
+    }
+
+
+def standings_view(league):
+    """종합 순위 탭: (순위표, [(주차, 라운드별 경기 결과 테이블)]) (최신 주차부터)"""
+    events, df_teams, df_history = league.events, league.df_teams, league.df_history
+    all_teams_raw = list(league.teams)
+    team_short_map = {t: team_short_name(t) for t in all_teams_raw}
+    
+    # 순위표 (레이팅은 마지막 라운드 직후 값)
+    ratings_by_week = weekly_ratings(league.elo_ledger)
+    latest_ratings = ratings_by_week.iloc[-1] if len(ratings_by_week) else pd.Series(ELO_INITIAL, index=all_teams_raw)
+    standings_table = _standings_table(df_teams, team_short_map, latest_ratings)
+    
+    # 주차별로 그룹화한 경기 결과 상세 (정규화된 득점 이벤트 사용)
+    # 셀별 파싱 결과 (득점 수, 참여 여부, 득점자별 득점 수)는 스냅샷의 events에서 한 번만 계산
+    team_idx = {team: i for i, team in enumerate(events.teams)}
+    
+    match_tables = []
+    for week in sorted(np.unique(events.weeks), reverse=True):
+        # 각 라운드별 처리하여 승/무/패 표시
+        formatted_data = []
+        for r in np.flatnonzero(events.weeks == week):
+            round_num = int(events.round_labels[r])
+            
+            # 각 팀의 결과 정보 생성
+            res_row = {'라운드': round_num}
+            
+            # 모든 팀의 점수 (미참여 팀은 None)
+            cells = {team: events.cell_record(r, team_idx[team]) for team in all_teams_raw if team in team_idx}
+            team_scores = {team: cell.goals if cell.participated else None for team, cell in cells.items()}
+            
+            for team in all_teams_raw:
+                # 표 헤더용 짧은 이름 사용
+                short_name = team_short_map.get(team, team)
+                if team in team_idx:
+                    my_goals = team_scores[team]
+                    if my_goals is None:
+                        res_row[short_name] = '-'
+                        continue
+                        
+                    opp_scores = [v for k, v in team_scores.items() if k != team and v is not None]
+                    max_opp = max(opp_scores) if opp_scores else 0
+                    
+                    # 득점자 명단 가공 (이름+득점수 형식, 셀 내 첫 등장 순서)
+                    formatted_scorers = [
+                        f"{name}{count}" if count > 1 else name
+                        for name, count in cells[team].scorer_counts
+                    ]
+                    
+                    scorers_text = f" ({', '.join(formatted_scorers)})" if formatted_scorers else ""
+                    
+                    # 승패 결과에 따른 배지 및 색상 설정
+                    if my_goals > max_opp:
+                        status_html = "<div class='r-w'>승</div>"
+                    elif my_goals == max_opp:
+                        status_html = "<div class='r-d'>무</div>"
+                    else:
+                        status_html = "<div class='r-l'>패</div>"
+                        
+                    result_detail_html = f"<div class='r-g'>{my_goals}득점<span class='r-s'>{scorers_text}</span></div>"
+                    
+                    res_row[short_name] = f"<div>{status_html}{result_detail_html}</div>"
+                else:
+                    res_row[short_name] = '-'
+            
+            formatted_data.append(res_row)
+        
+        # DataFrame 생성
+        formatted_df = pd.DataFrame(formatted_data)
+        
+        # 주차별 승점 합계 계산
+        week_points = df_history[df_history['Week'] == week].groupby('Team')['PointsGained'].sum()
+        
+        # 승점 합계 row 추가
+        points_row = {'라운드': '승점 합계'}
+        for team in all_teams_raw:
+            # 합계 행에서도 짧은 이름 사용
+            short_name = team_short_map.get(team, team)
+            points_row[short_name] = int(week_points.get(team, 0))
+        
+        formatted_df = pd.concat([formatted_df, pd.DataFrame([points_row])], ignore_index=True)
+        match_tables.append((week, formatted_df.set_index('라운드')))
+    
+    return standings_table, match_tables
+
+
+def title_odds_view(league, n_seasons=None):
+    """
+    종합 순위 탭의 최종 순위 확률: (표, 남은 주차 수, 남은 라운드 수, 시뮬레이션 시즌 수)
+
+    남은 라운드가 없거나 유효 경기가 없으면 None
+    """
+    remaining_weeks, remaining_rounds = remaining_round_count(league.events, league.df_att)
+    if remaining_rounds <= 0:
+        return None
+    n_seasons = SIM_SEASONS if n_seasons is None else n_seasons
+    with span('title_odds', seasons=n_seasons, rounds=remaining_rounds) as s:
+        odds = simulate_title_odds(league.df_teams, league.round_goals, league.events.teams,
+                                   remaining_rounds, n_seasons=n_seasons)
+        s['rows'] = 0 if odds is None else len(odds)
+    if odds is None:
+        return None
+    
+    # 1~3위 확률 (%)과 기대 승점
+    team_short_map = {t: team_short_name(t) for t in league.teams}
+    odds_table = pd.DataFrame({'팀': odds['Team'].map(team_short_map)})
+    for place in range(1, min(3, len(odds)) + 1):
+        odds_table[f'{place}위 확률'] = odds[f'Place{place}'].apply(lambda p: f'{p * 100:.1f}%')
+    odds_table['예상 최종 승점'] = odds['ExpPoints'].apply(lambda x: f'{x:.1f}')
+    return odds_table, remaining_weeks, remaining_rounds, n_seasons
+
+
+def _active_players(league):
+    """출석 기록이 있는 선수 + 표시용 소수점 컬럼"""
+    df_players_all = league.df_players_all
+    df_active = df_players_all[df_players_all['출석횟수'] > 0].copy()
+    df_active['출석 당 득점_disp'] = df_active['경기당 득점'].apply(lambda x: f'{x:.2f}')
+    df_active['출석 당 팀승점_disp'] = df_active['출전_평균승점'].apply(lambda x: f'{x:.2f}')
+    df_active['출석 당 팀득점_disp'] = df_active['출전_평균득점'].apply(lambda x: f'{x:.2f}')
+    df_active['출석 당 팀실점_disp'] = df_active['출전_평균실점'].apply(lambda x: f'{x:.2f}')
+    return df_active
+
+
+def ranking_tables(df, sort_col, display_cols, rename_map, teams, is_ascending=False):
+    """
+    랭킹 표 묶음: (전체 TOP 10, [(팀, 팀별 TOP 5)])
+
+    전체 표의 팀은 짧은 이름으로, 팀별 표에서는 팀 컬럼을 뺍니다.
+    """
+    team_short_map = {t: team_short_name(t) for t in teams}
+
+    # 1. 전체 TOP 10
+    df_overall = df.sort_values(by=sort_col, ascending=is_ascending).head(10).reset_index(drop=True)
+    df_overall.index += 1
+    df_overall_disp = df_overall.copy()
+    df_overall_disp['Team'] = df_overall_disp['Team'].map(team_short_map)
+    overall = df_overall_disp[display_cols].rename(columns=rename_map)
+
+    # 2. 팀별 TOP 5 (팀별 표에는 팀 이름을 뺌)
+    t_disp_cols = [c for c in display_cols if c != 'Team']
+    t_rename_map = {k: v for k, v in rename_map.items() if k != 'Team'}
+    team_tables = []
+    for t_raw in teams:
+        t_df = df[df['Team'] == t_raw].sort_values(by=sort_col, ascending=is_ascending).head(5).reset_index(drop=True)
+        t_df.index += 1
+        team_tables.append((t_raw, t_df[t_disp_cols].rename(columns=t_rename_map)))
+    return overall, team_tables
+
+
+def personal_view(league):
+    """개인 기록 탭: PERSONAL_RANKINGS 순서의 [(제목, 설명, 전체 표, [(팀, 팀별 표)])]"""
+    all_teams_raw = list(league.teams)
+    sources = {'all': league.df_players_all, 'active': _active_players(league)}
+    return [
+        (title, caption) + ranking_tables(sources[source], sort_col, display_cols, rename_map, all_teams_raw, is_ascending)
+        for title, caption, source, sort_col, display_cols, rename_map, is_ascending in PERSONAL_RANKINGS
+    ]
+
+
+def impact_ranking_tables(df, target_col, teams, is_ascending=False, value_suffix=""):
+    """임팩트 랭킹 표 묶음: (전체 TOP 10, [(팀, 팀별 TOP 5)]) (출전 시/결장 시 평균 포함)"""
+    team_short_map = {t: team_short_name(t) for t in teams}
+
+    # 1. 전체 랭킹 조회
+    top_n = 10
+    sorted_df = df.sort_values(by=target_col, ascending=is_ascending).head(top_n).reset_index(drop=True)
+    sorted_df.index += 1
+    
+    # 표시 컬럼 설정
+    # target_col 이 '임팩트_승점' 인 경우, '출전_평균승점', '결장_평균승점' 매칭
+    baseline = target_col.replace('임팩트_', '')
+    disp_cols = ['Player', target_col, f'출전_평균{baseline}', f'결장_평균{baseline}', 'Team']
+    disp_df = sorted_df[disp_cols].copy()
+    disp_df['Team'] = disp_df['Team'].map(team_short_map)
+    
+    # 컬럼명 정리
+    col_map = {
+        'Player': '선수', 'Team': '팀',
+        target_col: '🔥 임팩트',
+        f'출전_평균{baseline}': '출전 시(A)',
+        f'결장_평균{baseline}': '결장 시(B)'
+    }
+    disp_df = disp_df.rename(columns=col_map)
+    
+    # 포맷팅
+    format_cols = ['🔥 임팩트', '출전 시(A)', '결장 시(B)']
+    for c in format_cols:
+        disp_df[c] = disp_df[c].apply(lambda x: f'{x:+.2f}{value_suffix}')
+    
+    # 2. 팀별 랭킹 (Top 5)
+    team_tables = []
+    for t_raw in teams:
+        t_df = df[df['Team'] == t_raw].sort_values(by=target_col, ascending=is_ascending).head(5).reset_index(drop=True)
+        t_df.index += 1
+        
+        t_disp = t_df[['Player', target_col, f'출전_평균{baseline}', f'결장_평균{baseline}']].copy()
+        
+        col_map_t = {
+            'Player': '선수',
+            target_col: '🔥 임팩트',
+            f'출전_평균{baseline}': '출전(A)',
+            f'결장_평균{baseline}': '결장(B)'
+        }
+        t_disp = t_disp.rename(columns=col_map_t)
+        
+        # 소수점 포맷
+        for c in ['🔥 임팩트', '출전(A)', '결장(B)']:
+            t_disp[c] = t_disp[c].apply(lambda x: f'{x:+.2f}' if pd.notna(x) else '0.00')
+        team_tables.append((t_raw, t_disp))
+    return disp_df, team_tables
+
+
+def impact_view(league):
+    """
+    임팩트 탭: IMPACT_RANKINGS 순서의 [(제목, 설명, 전체 표, [(팀, 팀별 표)])]
+
+    출전/결장 기록이 모두 있는 선수가 없으면 None
+    """
+    df_players_all = league.df_players_all
+    impact_data = df_players_all[(df_players_all['출석주차수'] > 0) & (df_players_all['결장주차수'] > 0)]
+    if impact_data.empty:
+        return None
+    all_teams_raw = list(league.teams)
+    return [
+        (title, caption) + impact_ranking_tables(impact_data, target_col, all_teams_raw, is_ascending=is_ascending)
+        for title, caption, target_col, is_ascending in IMPACT_RANKINGS
+    ]
+
+
+def rapm_view(league, top_n=10):
+    """
+    임팩트 탭의 보정 플러스마이너스(RAPM) 랭킹 (출석 기록이 있는 선수, 승점 RAPM 순)
+
+    부트스트랩이 가능하도록 경기가 있었던 주차가 2개 이상일 때만 계산하며, 아니면 None
+    """
+    if league.df_history['Week'].nunique() < 2:
+        return None
+    df_players = league.df_players_all
+    with span('rapm') as s:
+        df_rapm = compute_rapm(df_players[['Player', 'Team']], league.df_att_processed,
+                               league.df_history, league.round_goals)
+        s['rows'] = len(df_rapm)
+    df_rapm['출석횟수'] = df_players['출석횟수'].to_numpy()
+    df_rapm = df_rapm[df_rapm['출석횟수'] > 0].sort_values('RAPM_승점', ascending=False).head(top_n).reset_index(drop=True)
+    df_rapm.index += 1
+    
+    team_short_map = {t: team_short_name(t) for t in league.teams}
+    return pd.DataFrame({
+        '선수': df_rapm['Player'],
+        '🔥 승점 RAPM': df_rapm['RAPM_승점'].apply(lambda x: f'{x:+.2f}'),
+        f'{CI_LEVEL:.0%} 구간': [f'{lo:+.2f} ~ {hi:+.2f}' for lo, hi in zip(df_rapm['RAPM_승점_하한'], df_rapm['RAPM_승점_상한'])],
+        '⚽ 공격': df_rapm['RAPM_공격'].apply(lambda x: f'{x:+.2f}'),
+        '🛡️ 수비': df_rapm['RAPM_수비'].apply(lambda x: f'{x:+.2f}'),
+        '출석': df_rapm['출석횟수'].astype(int),
+        '팀': df_rapm['Team'].map(team_short_map),
+    })
+
+
+def team_trends_view(league):
+    """팀 트렌드 탭: 주차 x 팀 승점/득점/실점/득실차 (주차별 + 누적)"""
+    df_history = league.df_history
+    with span('team_trends') as s:
+        df_trends = compute_team_trends(df_history, league.round_goals, sorted(df_history['Week'].unique()), list(league.teams))
+        s['rows'] = len(df_trends)
+    return df_trends
+
+
+def player_detail_view(league):
+    """선수 상세 탭: 팀별 [(원본 팀 이름, 표시 이름, 통합 지표 테이블)]"""
+    df_players_all = league.df_players_all
+    all_teams_raw = list(league.teams)
+    display_team_map = {t: format_team_name(t) for t in all_teams_raw}
+    
+    team_tables = []
+    for t_raw in all_teams_raw:
+        display_name = display_team_map.get(t_raw, t_raw)
+        
+        df_team_players = df_players_all[df_players_all['Team'] == t_raw].copy()
+        
+        # 컬럼 포맷팅
+        df_team_players = df_team_players.rename(columns={
+            'Player': '선수이름',
+            '출석횟수': '🦸 아이언맨(출석)',
+            '득점': '🎯 개인 득점',
+            '경기당 득점': '⚡ 출석 당 득점',
+            '출전_평균승점': '🧚 출석 당 팀승점',
+            '출전_평균득점': '🚀 출석 당 팀득점',
+            '출전_평균실점': '🧱 출석 당 팀실점',
+            '임팩트_승점': '🔥 승점 임팩트',
+            '임팩트_득점': '🚀 득점 임팩트',
+            '임팩트_실점': '🛡️ 실점 임팩트',
+            '팀승점합계': '팀 승점 합계',
+            '팀득점합계': '팀 득점 합계',
+            '팀실점합계': '팀 실점 합계'
+        })
+        
+        # 숫자 형식 정리
+        cols_to_format = ['⚡ 출석 당 득점', '🧚 출석 당 팀승점', '🚀 출석 당 팀득점', '🧱 출석 당 팀실점', '🔥 승점 임팩트', '🚀 득점 임팩트', '🛡️ 실점 임팩트']
+        for col in cols_to_format:
+            df_team_players[col] = df_team_players[col].apply(lambda x: f'{x:+.2f}')
+            
+        int_cols = ['🦸 아이언맨(출석)', '팀 승점 합계', '팀 득점 합계', '🎯 개인 득점', '팀 실점 합계']
+        for col in int_cols:
+            df_team_players[col] = df_team_players[col].fillna(0).astype(int)
+            
+        display_cols = [
+            '선수이름', '🦸 아이언맨(출석)', '팀 승점 합계', '팀 득점 합계', '팀 실점 합계',
+            '🎯 개인 득점', '⚡ 출석 당 득점', 
+            '🧚 출석 당 팀승점', '🚀 출석 당 팀득점', '🧱 출석 당 팀실점',
+            '🔥 승점 임팩트', '🚀 득점 임팩트', '🛡️ 실점 임팩트'
+        ]
+        
+        team_tables.append((t_raw, display_name, df_team_players[display_cols].sort_values(by='🦸 아이언맨(출석)', ascending=False).reset_index(drop=True)))
+    return team_tables
+
+
+def attendance_view(league):
+    """출석표 탭: (팀별 출석률 요약 또는 None, [(원본 팀 이름, 표시 이름, 팀 출석부 또는 None)])"""
+    df_att = league.df_att
+    attendance = league.attendance
+    all_teams_raw = list(league.teams)
+    display_team_map = {t: format_team_name(t) for t in all_teams_raw}
+    
+    # 주차 숫자로 정렬 (1주차, 2주차, ..., 10주차 순서 보장)
+    def extract_week_num(col_name):
+        match = re.search(r'(\d+)', col_name)
+        return int(match.group(1)) if match else 999
+    
+    week_order = sorted(range(len(attendance.week_cols)), key=lambda j: extract_week_num(attendance.week_cols[j]))
+    week_cols = [attendance.week_cols[j] for j in week_order]
+    # 선수 x 주차 출석 여부 (표시 순서의 주차)
+    attended = attendance.attended[:, week_order]
+
+    def format_att(val):
+        if is_attended_value(val):
+            return '✅'
+        v = str(val).strip().lower()
+        if v in ABSENT_VALUES:
+            return '❌'
+        if v == '' or v == 'nan':
+            return '-'
+        return '❌' if v.isdigit() else v
+
+    def find_team_rows(t_raw):
+        # 해당 팀 행 마스크 (팀이름이 다를 수 있으므로 포함 여부로 체크하거나 strip)
+        rows = (df_att['팀이름'].str.strip() == t_raw.strip()).to_numpy()
+        if not rows.any():
+            # 혹시나 팀명이 정확히 안 맞을 경우를 대비해 키워드 검색
+            short_keyword = '레드' if '레드' in t_raw else '블루' if '블루' in t_raw else '옐로' if '옐로' in t_raw else t_raw
+            rows = df_att['팀이름'].str.contains(short_keyword).to_numpy(dtype=bool)
+        return rows
+
+    team_rows = {t_raw: find_team_rows(t_raw) for t_raw in all_teams_raw}
+
+    # --- 팀별 출석률 요약 ---
+    team_att_summary = []
+    
+    for t_raw in all_teams_raw:
+        display_name = display_team_map.get(t_raw, t_raw)
+        rows = team_rows[t_raw]
+        
+        total_players = int(rows.sum())
+        if total_players == 0: continue
+        
+        row_data = {'팀이름': display_name}
+        attended_counts = attended[rows].sum(axis=0)
+        week_rates = attended_counts / total_players * 100
+        for col, attended_count, rate in zip(week_cols, attended_counts, week_rates):
+            row_data[col] = f"{rate:.2f}% ({attended_count}/{total_players})"
+            
+        avg_rate = sum(week_rates) / len(week_rates) if len(week_rates) else 0
+        row_data['평균출석률'] = f"{avg_rate:.2f}%"
+        team_att_summary.append(row_data)
+    
+    df_summary = None
+    if team_att_summary:
+        # 컬럼 순서 조정: 팀이름, 평균출석률, 1주차, 2주차...
+        summary_cols = ['팀이름', '평균출석률'] + week_cols
+        df_summary = pd.DataFrame(team_att_summary)[summary_cols]
+
+    # --- 팀별 상세 출석부 ---
+    total_weeks = len(week_cols)
+    team_tables = []
+    for t_raw in all_teams_raw:
+        display_name = display_team_map.get(t_raw, t_raw)
+        rows = team_rows[t_raw]
+        if not rows.any():
+            team_tables.append((t_raw, display_name, None))
+            continue
+            
+        # 출석 데이터 시각화 보정 (셀 표시는 서로 다른 값마다 한 번만 계산)
+        plot_df = df_att.loc[rows, ['선수이름']].copy()
+        # 각 행(선수)별로 출석률 및 횟수 계산
+        counts = attended[rows].sum(axis=1)
+        percentages = counts / total_weeks * 100 if total_weeks > 0 else np.zeros(len(counts))
+        plot_df['출석률(출석횟수)'] = [f"{p:.2f}%({c})" for p, c in zip(percentages, counts)]
+        labels = map_unique_values(df_att.loc[rows, week_cols].to_numpy(dtype=object), format_att, '-')
+        for j, col in enumerate(week_cols):
+            plot_df[col] = labels[:, j]
+        
+        # 표시할 컬럼 (선수이름 + 출석률(출석횟수) + 모든 주차)
+        display_cols = ['선수이름', '출석률(출석횟수)'] + week_cols
+        team_tables.append((t_raw, display_name, plot_df[display_cols].reset_index(drop=True)))
+
+    return df_summary, team_tables
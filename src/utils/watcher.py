@@ -0,0 +1,108 @@
+"""
+시트 변경 감시 (백그라운드 스냅샷 미리 만들기)
+
+서버 프로세스 안에서 스레드 하나가 주기적으로 두 시트를 확인하고,
+내용 해시가 바뀌면 요청과 무관하게 새 데이터의 스냅샷을 만들어 둔 뒤 교체합니다.
+- 시작하자마자 디스크 캐시로 스냅샷을 만들고(있으면) 바로 시트를 한 번 확인합니다.
+- 스냅샷은 시트 캐시에 새 버전이 반영되기 직전(갱신 훅)에 만들어지므로,
+  그 전까지 모든 세션은 이전 버전과 이미 만들어진 스냅샷을 그대로 사용합니다.
+- 요청 경로의 TTL 갱신이 먼저 새 버전을 발견해도 같은 훅으로 스냅샷을 만듭니다.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from .data_loader import add_sheet_update_hook, refresh_sheets_now, restore_sheets_from_disk, get_sheet_cache_status
+
+logger = logging.getLogger(__name__)
+
+WATCH_INTERVAL_SECONDS = float(os.getenv('SHEETS_WATCH_INTERVAL', '30'))
+
+
+class SheetWatcher:
+    """
+    시트 변경 감시 스레드
+
+    on_update(df_match, df_att, version)은 새 버전마다 한 번 호출되며
+    스냅샷을 만들어 공유 저장소에 넣는 역할을 합니다 (예: SnapshotRegistry.get_or_build).
+    """
+
+    def __init__(self, spreadsheet_url, on_update, interval=None):
+        self.spreadsheet_url = spreadsheet_url
+        self.on_update = on_update
+        self.interval = WATCH_INTERVAL_SECONDS if interval is None else interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {
+            'checks': 0,            # 시트 확인 횟수
+            'changes': 0,           # 새 버전 발견 횟수
+            'last_check': None,     # 마지막 확인 시각
+            'last_change': None,    # 마지막 새 버전 반영 시각
+            'last_build_ms': None,  # 마지막 스냅샷 생성 시간
+            'prewarmed': None,      # 시작 시 디스크 캐시로 만든 버전
+        }
+
+    def start(self):
+        """감시 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            add_sheet_update_hook(self._build)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='sheet-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def check_now(self):
+        """지금 시트를 한 번 확인 (새 버전이면 갱신 훅에서 스냅샷 생성)"""
+        result = refresh_sheets_now(self.spreadsheet_url)
+        with self._lock:
+            self._stats['checks'] += 1
+            self._stats['last_check'] = time.time()
+            if result is not None and result[1]:
+                self._stats['changes'] += 1
+                self._stats['last_change'] = time.time()
+        return result
+
+    def status(self):
+        """감시 상태 (확인/변경 횟수, 마지막 시각, 시트 캐시 오류 포함)"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['running'] = self._thread is not None and self._thread.is_alive()
+        stats['interval'] = self.interval
+        stats['last_error'] = get_sheet_cache_status().get('last_error')
+        return stats
+
+    def _build(self, df_match, df_att, version):
+        """갱신 훅: 새 버전의 스냅샷을 미리 생성"""
+        start = time.perf_counter()
+        self.on_update(df_match, df_att, version)
+        with self._lock:
+            self._stats['last_build_ms'] = (time.perf_counter() - start) * 1000
+
+    def _run(self):
+        # 1. 디스크 캐시가 있으면 네트워크를 기다리지 않고 먼저 스냅샷 생성
+        try:
+            cached = restore_sheets_from_disk(self.spreadsheet_url)
+            if cached is not None:
+                self._build(*cached)
+                with self._lock:
+                    self._stats['prewarmed'] = cached[2]
+        except Exception:
+            logger.exception("디스크 캐시로 스냅샷 미리 만들기 실패")
+
+        # 2. 바로 한 번 확인한 뒤 주기적으로 확인
+        while not self._stop.is_set():
+            try:
+                self.check_now()
+            except Exception:
+                logger.exception("시트 변경 확인 실패")
+            self._stop.wait(self.interval)
@@ -0,0 +1,38 @@
+"""
+테스트용 작은 시트
+
+구글 시트 CSV 로드(_parse_sheet_csv)와 같은 형태의 문자열 DataFrame을 만듭니다 (빈 셀은 '').
+"""
+
+import pandas as pd
+
+
+def match_sheet(teams, rounds):
+    """
+    경기 시트
+
+    rounds: [(주차, {팀: 득점자 셀})] (라운드 번호는 주차마다 1부터, 빠진 팀은 빈 셀)
+    """
+    rows = []
+    round_no = {}
+    for week, cells in rounds:
+        round_no[week] = round_no.get(week, 0) + 1
+        row = {'주차': str(week), '라운드': str(round_no[week])}
+        row.update({team: cells.get(team, '') for team in teams})
+        rows.append(row)
+    return pd.DataFrame(rows, columns=['주차', '라운드'] + list(teams), dtype=str)
+
+
+def attendance_sheet(rosters, n_weeks):
+    """
+    출석 시트
+
+    rosters: {팀: {선수: [주차별 셀]}} (셀 목록이 n_weeks보다 짧으면 나머지는 빈 셀)
+    """
+    week_cols = [f'{w}주차' for w in range(1, n_weeks + 1)]
+    rows = []
+    for team, players in rosters.items():
+        for player, cells in players.items():
+            cells = list(cells) + [''] * (n_weeks - len(cells))
+            rows.append(dict(zip(['팀이름', '선수이름'] + week_cols, [team, player] + cells)))
+    return pd.DataFrame(rows, columns=['팀이름', '선수이름'] + week_cols, dtype=str)
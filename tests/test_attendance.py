@@ -0,0 +1,56 @@
+"""출석 판정 규칙 (is_attended_value / map_unique_values)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sheets import attendance_sheet
+from utils.attendance import attendance_lookup, build_attendance_matrix, is_attended_value, map_unique_values
+from utils.data_loader import process_attendance
+
+
+@pytest.mark.parametrize('value', ['1', ' 1 ', '1.0', 'O', 'o', 'V', '참석', '출석', 'TRUE', '2', 0.5, 1, 3.0])
+def test_attended_values(value):
+    assert is_attended_value(value)
+
+
+# 비어 있지 않은 텍스트라도 출석 표시 값이 아니면 불참 (이전 process_attendance는 모든 텍스트를 출석으로 셌음)
+@pytest.mark.parametrize('value', ['x', 'X', '불참', '결장', 'false', '0', '0.0', '-1', '', '  ', 'nan', '병가', 0, np.nan, None])
+def test_not_attended_values(value):
+    assert not is_attended_value(value)
+
+
+def test_map_unique_values_calls_once_per_value():
+    calls = []
+
+    def fn(v):
+        calls.append(v)
+        return v.upper()
+
+    values = np.array([['a', 'b', None], ['a', np.nan, 'b']], dtype=object)
+    result = map_unique_values(values, fn, '-')
+    assert result.tolist() == [['A', 'B', '-'], ['A', '-', 'B']]
+    assert sorted(calls) == ['a', 'b']
+
+
+def test_lookup_matches_scalar_rule():
+    values = np.array([['1', 'x', '불참', None], ['O', '', '참석', 2.0]], dtype=object)
+    assert attendance_lookup(values).tolist() == [[is_attended_value(v) for v in row] for row in values]
+
+
+def test_text_absence_marks_are_not_counted():
+    df_att = attendance_sheet({'스타크(블루)': {'박블루': ['1', 'x', '불참', 'O'], '최블루': ['결장', '', '참석', 'X']}}, 4)
+    attendance = build_attendance_matrix(df_att)
+    assert attendance.counts().tolist() == [2, 1]
+
+    df = process_attendance(df_att, attendance)
+    attended = df[df['IsAttended'] == 1]
+    assert sorted(zip(attended['선수이름'], attended['WeekNum'])) == [('박블루', 1), ('박블루', 4), ('최블루', 3)]
+    # 원본 값은 그대로 유지
+    assert df['Attended'].tolist() == ['1', '결장', 'x', '', '불참', '참석', 'O', 'X']
+
+
+def test_numeric_sheet():
+    df_att = pd.DataFrame({'팀이름': ['스타크(블루)'] * 2, '선수이름': ['박블루', '최블루'],
+                           '1주차': [1.0, np.nan], '2주차': [0.0, 1.0]})
+    assert build_attendance_matrix(df_att).attended.tolist() == [[True, False], [False, True]]
@@ -0,0 +1,81 @@
+"""득점자 셀 문법 (parse_cells / build_match_events)"""
+
+import numpy as np
+import pytest
+
+from sheets import match_sheet
+from utils.data_loader import count_goals, get_scorers_list
+from utils.events import build_match_events, parse_cells
+
+
+def _parse_one(cell):
+    participated, goals, tokens = parse_cells([cell])
+    return bool(participated[0]), int(goals[0]), tokens
+
+
+@pytest.mark.parametrize('cell, participated, goals, credited', [
+    # 빈 값/결측/공백뿐인 셀은 미참여
+    ('', False, 0, []),
+    ('   ', False, 0, []),
+    (None, False, 0, []),
+    (np.nan, False, 0, []),
+    # '0', '0.0'(숫자 포함)은 참여했으나 무득점
+    ('0', True, 0, []),
+    (' 0.0 ', True, 0, []),
+    (0, True, 0, []),
+    (0.0, True, 0, []),
+    # 앞뒤 공백과 빈 항목은 무시
+    ('  김레드 ,이레드  ', True, 2, ['김레드', '이레드']),
+    ('김레드,, ,', True, 1, ['김레드']),
+    (',,', True, 0, []),
+    # 같은 선수가 여러 번 나오면 그만큼 득점
+    ('김레드, 김레드, 이레드', True, 3, ['김레드', '김레드', '이레드']),
+    # 항목 '0'과 자살골은 팀 득점이지만 선수 득점 아님
+    ('0, 김레드', True, 2, ['김레드']),
+    ('김레드(자살골), 자살골', True, 2, []),
+    # 그 밖의 숫자 문자열/숫자는 이름으로 취급 (셀 단위 규칙과 동일)
+    ('2', True, 1, ['2']),
+    (1.0, True, 1, ['1.0']),
+    # 문자열 'nan'은 결측이 아님
+    ('nan', True, 1, ['nan']),
+])
+def test_cell_grammar(cell, participated, goals, credited):
+    actual = _parse_one(cell)
+    assert actual[:2] == (participated, goals)
+    tokens = actual[2]
+    assert tokens[tokens['credited']]['token'].tolist() == credited
+    # 셀 단위 규칙과 같음
+    assert (count_goals(cell) is not None) == participated
+    assert (count_goals(cell) or 0) == goals
+    assert get_scorers_list(cell) == credited
+
+
+def test_own_goal_flags():
+    _, _, tokens = _parse_one('자살골, 김레드, 이레드 자살골')
+    assert tokens['is_own_goal'].tolist() == [True, False, True]
+    assert tokens['credited'].tolist() == [False, True, False]
+
+
+def test_repeated_cells_keep_cell_order():
+    # 같은 문자열은 한 번만 파싱하지만 결과는 셀 위치/셀 내 순서 그대로
+    cells = ['이레드, 김레드', '', '0', '이레드, 김레드', '김레드', np.nan, '이레드, 김레드']
+    participated, goals, tokens = parse_cells(cells)
+    assert participated.tolist() == [True, False, True, True, True, False, True]
+    assert goals.tolist() == [2, 0, 0, 2, 1, 0, 2]
+    assert tokens['cell'].tolist() == [0, 0, 3, 3, 4, 6, 6]
+    assert tokens['token'].tolist() == ['이레드', '김레드'] * 2 + ['김레드'] + ['이레드', '김레드']
+
+
+def test_cell_records_count_duplicate_scorers():
+    RED, BLUE = '타르가르옌(레드)', '스타크(블루)'
+    events = build_match_events(match_sheet([RED, BLUE], [
+        (1, {RED: '김레드, 이레드, 김레드, 자살골', BLUE: '0'}),
+        (1, {RED: '', BLUE: '박블루'}),
+    ]), [RED, BLUE])
+    record = events.cell_record(0, 0)
+    assert record.goals == 4
+    assert record.scorers == ('김레드', '이레드', '김레드')
+    assert record.scorer_counts == (('김레드', 2), ('이레드', 1))
+    assert events.cell_record(0, 1).participated and events.cell_record(0, 1).goals == 0
+    assert not events.cell_record(1, 0).participated
+    assert events.goal_matrix().tolist() == [[4, 0], [0, 1]]
@@ -0,0 +1,146 @@
+"""IncrementalLeagueState가 시트를 고칠 때마다 처음부터 계산한 결과와 같은지 확인"""
+
+import pandas as pd
+import pytest
+
+from sheets import attendance_sheet, match_sheet
+from utils.data_loader import process_attendance, process_match_results
+from utils.incremental import IncrementalLeagueState
+
+
+RED, BLUE, YELLOW = '타르가르옌(레드)', '스타크(블루)', '라니스터(옐로)'
+TEAMS = [YELLOW, BLUE, RED]
+SCORERS = {RED: ['김레드', '이레드'], BLUE: ['박블루', '최블루'], YELLOW: ['정옐로', '강옐로']}
+
+
+def season(n_weeks):
+    """주차마다 3라운드 (2팀, 2팀, 3팀 경기)"""
+    rounds = []
+    for w in range(1, n_weeks + 1):
+        a, b = SCORERS[RED][w % 2], SCORERS[BLUE][w % 2]
+        rounds.append((w, {RED: a, BLUE: '0' if w % 3 else b}))
+        rounds.append((w, {BLUE: f'{b}, {b}', YELLOW: SCORERS[YELLOW][w % 2]}))
+        rounds.append((w, {RED: '자살골', BLUE: b, YELLOW: '0'}))
+    return match_sheet(TEAMS, rounds)
+
+
+def set_cell(df, week, round_no, team, value):
+    df = df.copy()
+    df.loc[(df['주차'] == str(week)) & (df['라운드'] == str(round_no)), team] = value
+    return df
+
+
+def assert_match_state(state, df_match):
+    for actual, expected in zip(state.update_match_results(df_match), process_match_results(df_match)):
+        pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_match_edits_match_full_rebuild():
+    state = IncrementalLeagueState()
+    df = season(4)
+    assert_match_state(state, df)
+    assert state.last_update['match_rounds_applied'] == 12
+
+    # 마지막 주차 수정: 앞쪽 3주차는 재사용
+    df = set_cell(df, 4, 2, BLUE, '박블루')
+    assert_match_state(state, df)
+    assert state.last_update['match_rounds_reused'] == 10
+
+    # 중간 주차의 득점자만 바뀜 (득점 수는 같음): 그 라운드부터 다시 계산
+    df = set_cell(df, 2, 1, RED, '이레드')
+    assert_match_state(state, df)
+    assert state.last_update['match_rounds_reused'] == 3
+
+    # 자살골이 선수 득점으로 바뀜 (득점 수는 같고 득점 인정 이벤트가 새로 생김)
+    df = set_cell(df, 2, 3, RED, '김레드')
+    assert_match_state(state, df)
+    assert state.last_update['match_rounds_reused'] == 5
+
+    # 중간 주차의 득점 수가 바뀌어 승패가 달라짐
+    df = set_cell(df, 2, 3, YELLOW, '정옐로, 강옐로')
+    assert_match_state(state, df)
+    assert state.last_update['match_rounds_reused'] == 5
+
+    # 주차 추가: 새 주차만 계산
+    df = pd.concat([df, season(5).iloc[12:]], ignore_index=True)
+    assert_match_state(state, df)
+    assert state.last_update['match_rounds_reused'] == 12
+    assert state.last_update['match_rounds_applied'] == 3
+
+    # 마지막 주차 삭제, 같은 데이터 재요청
+    df = df.iloc[:12].reset_index(drop=True)
+    assert_match_state(state, df)
+    assert_match_state(state, df)
+    assert state.last_update['match_rounds_applied'] == 0
+
+
+def test_match_round_becomes_invalid_in_the_middle():
+    state = IncrementalLeagueState()
+    df = season(3)
+    assert_match_state(state, df)
+    # 2팀 경기의 한 팀을 지우면 무효 라운드 (득점자도 빠짐)
+    assert_match_state(state, set_cell(df, 2, 1, BLUE, ''))
+    assert_match_state(state, df)
+
+
+ROSTERS = {
+    RED: {'김레드': ['1', '1', '0', 'O'], '이레드': ['0', '1', '', '1']},
+    BLUE: {'박블루': ['1', '', '1', '1'], '최블루': ['x', '1', '1', '참석']},
+    YELLOW: {'정옐로': ['1', '1', '1', '0'], '강옐로': ['', '0', '1', '1']},
+}
+
+
+def set_attendance(df, player, week_col, value):
+    df = df.copy()
+    df.loc[df['선수이름'] == player, week_col] = value
+    return df
+
+
+def assert_attendance_state(state, df_att):
+    pd.testing.assert_frame_equal(state.update_attendance(df_att), process_attendance(df_att))
+
+
+@pytest.mark.parametrize('n_weeks', [3, 4])
+def test_attendance_edits_match_full_rebuild(n_weeks):
+    state = IncrementalLeagueState()
+    df = attendance_sheet(ROSTERS, n_weeks)
+    assert_attendance_state(state, df)
+
+    # 마지막 주차 컬럼 수정
+    df = set_attendance(df, '이레드', f'{n_weeks}주차', '불참')
+    assert_attendance_state(state, df)
+    assert state.last_update['attendance_weeks_reused'] == n_weeks - 1
+
+    # 중간 주차 컬럼 수정: 그 컬럼부터 다시 계산
+    df = set_attendance(df, '박블루', '2주차', '1')
+    assert_attendance_state(state, df)
+    assert state.last_update['attendance_weeks_reused'] == 1
+
+    # 주차 컬럼 추가
+    df = df.assign(**{f'{n_weeks + 1}주차': ['1', '', '0', '1', '1', '']})
+    assert_attendance_state(state, df)
+    assert state.last_update['attendance_weeks_reused'] == n_weeks
+    assert state.last_update['attendance_weeks_applied'] == 1
+
+    # 마지막 주차 컬럼 삭제: 남은 컬럼은 모두 재사용
+    df = df.drop(columns=[f'{n_weeks + 1}주차'])
+    assert_attendance_state(state, df)
+    assert state.last_update['attendance_weeks_reused'] == n_weeks
+
+    # 선수 명단 변경: 처음부터 계산
+    df = df.assign(선수이름=df['선수이름'].replace({'강옐로': '윤옐로'}))
+    assert_attendance_state(state, df)
+    assert state.last_update['attendance_weeks_reused'] == 0
+
+
+def test_attendance_numeric_sheet():
+    # 로컬 TSV처럼 숫자/결측으로 읽은 출석 시트
+    state = IncrementalLeagueState()
+    df = pd.DataFrame({
+        '팀이름': [RED, RED, BLUE], '선수이름': ['김레드', '이레드', '박블루'],
+        '1주차': [1.0, None, 0.0], '2주차': [1.0, 1.0, None],
+    })
+    assert_attendance_state(state, df)
+    df = df.assign(**{'2주차': [None, 1.0, 1.0], '3주차': [1.0, 1.0, 1.0]})
+    assert_attendance_state(state, df)
+    assert state.last_update['attendance_weeks_reused'] == 1
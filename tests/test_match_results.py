@@ -0,0 +1,99 @@
+"""process_match_results(라운드 x 팀 배열 연산)를 셀 단위 규칙(count_goals / get_scorers_list)과 비교"""
+
+import io
+
+import pandas as pd
+import pytest
+
+from sheets import match_sheet
+from utils.data_loader import count_goals, get_scorers_list, get_team_columns, process_match_results
+
+
+RED, BLUE, YELLOW = '타르가르옌(레드)', '스타크(블루)', '라니스터(옐로)'
+TEAMS = [YELLOW, BLUE, RED]
+
+
+def scalar_match_results(df_match):
+    """라운드/셀마다 count_goals, get_scorers_list를 적용하는 기준 구현"""
+    teams = get_team_columns(df_match)
+    stats = {t: dict.fromkeys(['Points', 'W', 'D', 'L', 'GF', 'GA', 'Played'], 0) for t in teams}
+    history, player_goals = [], {}
+    for _, row in df_match.iterrows():
+        scores = {t: count_goals(row[t]) for t in teams if count_goals(row[t]) is not None}
+        if len(scores) < 2:
+            continue
+        for team, goals in scores.items():
+            for p in get_scorers_list(row[team]):
+                player_goals[p] = player_goals.get(p, 0) + 1
+            opponents = [g for t, g in scores.items() if t != team]
+            points = 3 if goals > max(opponents) else 1 if goals == max(opponents) else 0
+            s = stats[team]
+            s['GF'] += goals
+            s['GA'] += sum(opponents)
+            s['Played'] += 1
+            s['Points'] += points
+            s['W' if points == 3 else 'D' if points == 1 else 'L'] += 1
+            history.append({'Week': int(float(row['주차'])), 'Team': team, 'PointsGained': points})
+
+    df_teams = pd.DataFrame([{'Team': t, **stats[t]} for t in teams])
+    df_teams['GD'] = df_teams['GF'] - df_teams['GA']
+    df_teams = df_teams.sort_values(by=['Points', 'GD', 'GF'], ascending=False).reset_index(drop=True)
+    df_teams.index += 1
+    df_history = pd.DataFrame(history, columns=['Week', 'Team', 'PointsGained'])
+    df_scorers = pd.DataFrame(list(player_goals.items()), columns=['Player', 'Goals'])
+    return df_teams, df_history, df_scorers
+
+
+def assert_same_results(df_match):
+    for actual, expected in zip(process_match_results(df_match), scalar_match_results(df_match)):
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_string_sheet_edge_cases():
+    df_match = match_sheet(TEAMS, [
+        # 2팀 경기: 득점 / 무득점('0')
+        (1, {RED: '김레드, 이레드', BLUE: '0'}),
+        # 3팀 경기: 최다 득점 팀만 승, 나머지는 최다 득점 상대에 대해 패
+        (1, {RED: '김레드', BLUE: '박블루,박블루', YELLOW: '정옐로'}),
+        # 3팀 공동 최다 득점은 무승부, 자살골은 팀 득점이지만 선수 득점 아님
+        (2, {RED: '자살골', BLUE: '박블루', YELLOW: '정옐로'}),
+        # 한 팀만 기록된 라운드는 무효 (득점자도 세지 않음)
+        (2, {RED: '김레드'}),
+        # 공백/빈 항목, '0.0', 항목 '0'은 득점이지만 선수 득점 아님
+        (3, {RED: '  이레드 ,, ', YELLOW: '0.0'}),
+        (3, {BLUE: '0, 박블루', YELLOW: '정옐로(자살골)'}),
+        # 빈 셀과 공백뿐인 셀은 미참여
+        (4, {RED: '   ', BLUE: '', YELLOW: '정옐로'}),
+        (4, {RED: '0', BLUE: '0', YELLOW: '0'}),
+    ])
+    assert_same_results(df_match)
+
+
+def test_numeric_sheet_with_missing_cells():
+    # 로컬 TSV처럼 read_csv가 숫자/결측(NaN)으로 읽은 시트
+    tsv = '\n'.join([
+        '주차\t라운드\t' + '\t'.join(TEAMS),
+        '1\t1\t0\t\t1',
+        '1\t2\t\t0.0\t0',
+        '2\t1\t\t\t2',
+        '2\t2\t3\t1\t',
+        '3\t1\t0\t0\t0',
+    ])
+    df_match = pd.read_csv(io.StringIO(tsv), sep='\t')
+    assert df_match[RED].isna().any()
+    assert_same_results(df_match)
+
+
+@pytest.mark.parametrize('cell', ['nan', 'NaN'])
+def test_literal_nan_text_is_a_scorer_name(cell):
+    # 문자열 'nan'은 결측이 아니라 득점자 이름으로 취급 (셀 단위 규칙과 동일)
+    df_match = match_sheet(TEAMS, [(1, {RED: cell, BLUE: '0'}), (1, {RED: '0', YELLOW: f'{cell}, 정옐로'})])
+    assert_same_results(df_match)
+
+
+def test_no_valid_rounds():
+    df_match = match_sheet(TEAMS, [(1, {RED: '김레드'}), (1, {BLUE: ''})])
+    df_teams, df_history, df_scorers = process_match_results(df_match)
+    assert (df_teams[['Points', 'Played', 'GF', 'GA']] == 0).all().all()
+    assert df_history.empty
+    assert df_scorers.empty
@@ -0,0 +1,100 @@
+"""선수 임팩트 지표 (compute_player_metrics 행렬 연산)"""
+
+import pytest
+
+from sheets import attendance_sheet, match_sheet
+from utils import build_league_snapshot
+from utils.metrics import PLAYER_METRIC_COLS
+
+
+RED, BLUE, YELLOW = '타르가르옌(레드)', '스타크(블루)', '라니스터(옐로)'
+
+
+def _players(df_match, df_att):
+    league = build_league_snapshot(df_match, df_att, 'test')
+    return league, league.df_players_all.set_index('Player')
+
+
+def test_fixed_league_metric_values():
+    # 1주차 레드 1:0 승, 2주차 블루 2:0 승, 3주차 1:1 무
+    df_match = match_sheet([RED, BLUE], [
+        (1, {RED: '김레드', BLUE: '0'}),
+        (2, {RED: '0', BLUE: '박블루, 박블루'}),
+        (3, {RED: '이레드', BLUE: '박블루'}),
+    ])
+    df_att = attendance_sheet({
+        RED: {'김레드': ['1', '1', '0'], '이레드': ['0', '0', '1']},
+        BLUE: {'박블루': ['1', '1', '1'], '최블루': ['', '', '']},
+    }, 3)
+    _, players = _players(df_match, df_att)
+
+    # (팀승점합계, 팀실점합계, 팀득점합계, 출전 평균 승점/실점/득점, 결장 평균 승점/실점/득점,
+    #  임팩트 승점/득점/실점, 출석주차수, 결장주차수)
+    expected = {
+        '김레드': [3, 2, 1, 1.5, 1.0, 0.5, 1.0, 1.0, 1.0, 0.5, -0.5, 0.0, 2, 1],
+        '이레드': [1, 1, 1, 1.0, 1.0, 1.0, 1.5, 1.0, 0.5, -0.5, 0.5, 0.0, 1, 2],
+        '박블루': [4, 2, 3, 4 / 3, 2 / 3, 1.0, 0.0, 0.0, 0.0, 4 / 3, 1.0, 2 / 3, 3, 0],
+    }
+    # 출석도 득점도 없는 선수는 표에 없음
+    assert sorted(players.index) == sorted(expected)
+    for player, values in expected.items():
+        assert players.loc[player, PLAYER_METRIC_COLS].tolist() == pytest.approx(values), player
+    assert players.loc['박블루', '득점'] == 3
+    assert players.loc['김레드', '경기당 득점'] == pytest.approx(0.5)
+
+
+def per_player_metrics(league, player):
+    """선수 한 명씩 주차를 걸러 평균을 내는 기준 구현"""
+    df_att, df_att_processed = league.df_att, league.df_att_processed
+    df_history = league.df_history.astype({'Week': int})
+    team_points = df_history.groupby(['Week', 'Team'])['PointsGained'].sum().reset_index()
+    round_goals = league.round_goals
+    weekly_gf = round_goals[round_goals['Participated']].groupby(['Week', 'Team'])['GF'].sum().reset_index()
+    weekly_ga = round_goals.groupby(['Week', 'Team'], sort=False)['GA'].sum().reset_index()
+
+    my_team = df_att[['선수이름', '팀이름']].drop_duplicates().set_index('선수이름')['팀이름'].to_dict().get(player)
+    att_rows = df_att_processed[(df_att_processed['선수이름'] == player) & (df_att_processed['IsAttended'] == 1)]
+    if att_rows.empty or not my_team:
+        return [0.0] * len(PLAYER_METRIC_COLS)
+
+    present = att_rows['WeekNum'].unique().astype(int)
+    absent = [w for w in sorted(df_history['Week'].unique()) if w not in present]
+
+    def pick(df, col, weeks):
+        return df[df['Week'].isin(weeks) & (df['Team'] == my_team)][col]
+
+    def mean(s):
+        return s.mean() if not s.empty else 0.0
+
+    p_pts, p_gf, p_ga = pick(team_points, 'PointsGained', present), pick(weekly_gf, 'GF', present), pick(weekly_ga, 'GA', present)
+    a_pts, a_gf, a_ga = pick(team_points, 'PointsGained', absent), pick(weekly_gf, 'GF', absent), pick(weekly_ga, 'GA', absent)
+    return [
+        p_pts.sum(), p_ga.sum(), p_gf.sum(),
+        mean(p_pts), mean(p_ga), mean(p_gf),
+        mean(a_pts), mean(a_ga), mean(a_gf),
+        mean(p_pts) - mean(a_pts), mean(p_gf) - mean(a_gf), mean(p_ga) - mean(a_ga),
+        float(len(present)), float(len(absent)),
+    ]
+
+
+def test_matches_per_player_loop():
+    # 3팀, 팀이 쉬는 주차, 출석했지만 경기가 없는 주차, 명단에 없는 득점자, 동명이인 행
+    df_match = match_sheet([RED, BLUE, YELLOW], [
+        (1, {RED: '김레드', BLUE: '0'}),
+        (1, {BLUE: '박블루', YELLOW: '정옐로, 정옐로'}),
+        (2, {RED: '0', BLUE: '0', YELLOW: '강옐로'}),
+        (3, {RED: '유령, 김레드', YELLOW: '0'}),
+        (3, {RED: '이레드', BLUE: '박블루', YELLOW: '자살골'}),
+        (4, {BLUE: '최블루'}),
+    ])
+    df_att = attendance_sheet({
+        RED: {'김레드': ['1', '', '1', '1', '1'], '이레드': ['0', '1', '1', '', '']},
+        BLUE: {'박블루': ['1', '1', '0', '1'], '최블루': ['', 'x', '1', '1']},
+        YELLOW: {'정옐로': ['1', '1', '1', '1', '1'], '강옐로': ['', '', '', '', '1']},
+    }, 5)
+    league, players = _players(df_match, df_att)
+
+    assert '유령' in players.index
+    for player in players.index:
+        expected = per_player_metrics(league, player)
+        assert players.loc[player, PLAYER_METRIC_COLS].tolist() == pytest.approx(expected), player
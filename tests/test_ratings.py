@@ -0,0 +1,58 @@
+"""선수 보정 플러스마이너스 (ridge 풀이, RAPM 신뢰 구간)"""
+
+import numpy as np
+import pytest
+
+from synthetic_league import generate_league
+from utils import build_league_snapshot
+from utils.ratings import RAPM_COLS, compute_rapm, solve_ridge, solve_ridge_batch
+
+
+@pytest.fixture
+def ridge_problem():
+    rng = np.random.default_rng(0)
+    X = np.hstack([np.ones((60, 1)), rng.integers(-1, 2, size=(60, 12)).astype(float)])
+    y = X @ rng.normal(size=13) + rng.normal(scale=0.1, size=60)
+    weight = rng.integers(1, 4, size=60).astype(float)
+    return X, y, weight
+
+
+def test_batch_with_base_weights_matches_direct_solve(ridge_problem):
+    X, y, weight = ridge_problem
+    for base in [np.ones_like(weight), weight]:
+        expected = solve_ridge(X, y, base, 5.0)
+        batch = solve_ridge_batch(X, y, np.stack([base, base]), 5.0, base)
+        np.testing.assert_allclose(batch, np.stack([expected, expected]), rtol=1e-6, atol=1e-8)
+
+
+def test_batch_with_bootstrap_weights_matches_direct_solve(ridge_problem):
+    X, y, weight = ridge_problem
+    rng = np.random.default_rng(1)
+    sample_weights = rng.integers(0, 3, size=(5, len(y))) * weight
+    batch = solve_ridge_batch(X, y, sample_weights, 5.0, weight, tol=1e-10)
+    for sw, coef in zip(sample_weights, batch):
+        np.testing.assert_allclose(coef, solve_ridge(X, y, sw, 5.0), rtol=1e-6, atol=1e-6)
+
+
+def test_rapm_intervals_on_synthetic_league():
+    df_match, df_att = generate_league(weeks=8, rounds=6, teams=3, roster=6, seed=3)
+    league = build_league_snapshot(df_match, df_att, 'test')
+    players = league.df_players_all[['Player', 'Team']]
+    df_rapm = compute_rapm(players, league.df_att_processed, league.df_history, league.round_goals, n_bootstrap=60)
+
+    assert df_rapm['Player'].tolist() == players['Player'].tolist()
+    for col in RAPM_COLS:
+        values = df_rapm[[f'{col}_하한', col, f'{col}_상한']].to_numpy(dtype=float)
+        assert np.isfinite(values).all(), col
+        # 구간은 추정값을 가운데에 둔 대칭 구간 (90%, z = 1.645)
+        assert (values[:, 0] <= values[:, 1]).all() and (values[:, 1] <= values[:, 2]).all()
+        np.testing.assert_allclose(values[:, 1] - values[:, 0], values[:, 2] - values[:, 1])
+
+
+def test_rapm_without_bootstrap_has_no_interval():
+    df_match, df_att = generate_league(weeks=3, rounds=3, teams=3, roster=4, seed=0)
+    league = build_league_snapshot(df_match, df_att, 'test')
+    df_rapm = compute_rapm(league.df_players_all[['Player', 'Team']], league.df_att_processed,
+                           league.df_history, league.round_goals, n_bootstrap=0)
+    assert np.isfinite(df_rapm['RAPM_승점']).all()
+    assert df_rapm['RAPM_승점_하한'].isna().all()
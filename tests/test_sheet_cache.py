@@ -0,0 +1,72 @@
+"""시트 캐시 갱신과 디스크 캐시 저장 (네트워크 대신 _fetch_sheets를 바꿔 끼움)"""
+
+import logging
+
+import pytest
+
+from utils import data_loader, disk_cache
+
+
+MATCH_CSV = '주차,라운드,타르가르옌(레드),스타크(블루)\r\n1,1,김레드,0\r\n'.encode('utf-8')
+ATT_CSV = '팀이름,선수이름,1주차\r\n타르가르옌(레드),김레드,1\r\n'.encode('utf-8')
+
+
+@pytest.fixture
+def sheets(monkeypatch, tmp_path):
+    """_fetch_sheets가 돌려줄 본문 {'match', 'att'}와 저장 호출 기록"""
+    bodies = {'match': MATCH_CSV, 'att': ATT_CSV}
+    saves = []
+    monkeypatch.setattr(disk_cache, 'DISK_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(data_loader, '_fetch_sheets', lambda doc_id: (bodies['match'], bodies['att']))
+
+    def save(*args, **kwargs):
+        saves.append(args[2])
+        return disk_cache.save_sheet_cache(*args, **kwargs)
+
+    monkeypatch.setattr(data_loader, 'save_sheet_cache', save)
+    data_loader.reset_sheet_cache()
+    yield bodies, saves
+    data_loader.reset_sheet_cache()
+
+
+def test_disk_cache_saved_only_when_data_changes(sheets):
+    bodies, saves = sheets
+    v1, changed = data_loader._refresh_sheet_cache('doc')
+    assert changed and saves == [v1]
+
+    # 같은 내용을 다시 받으면 디스크에 쓰지 않음
+    assert data_loader._refresh_sheet_cache('doc') == (v1, False)
+    assert saves == [v1]
+
+    bodies['match'] += '2,1,0,박블루\r\n'.encode('utf-8')
+    v2, changed = data_loader._refresh_sheet_cache('doc')
+    assert changed and saves == [v1, v2]
+    assert disk_cache.load_sheet_cache(data_loader.sheet_origin('doc'))[2] == v2
+
+
+def test_restored_version_is_not_saved_again(sheets):
+    _, saves = sheets
+    version, _ = data_loader._refresh_sheet_cache('doc')
+    data_loader.reset_sheet_cache()
+
+    assert data_loader._restore_from_disk('doc')
+    assert data_loader._refresh_sheet_cache('doc') == (version, False)
+    assert saves == [version]
+
+
+def test_save_failure_is_logged_and_retried(sheets, monkeypatch, caplog):
+    _, saves = sheets
+
+    def fail(*args, **kwargs):
+        saves.append(args[2])
+        raise OSError('No space left on device')
+
+    monkeypatch.setattr(data_loader, 'save_sheet_cache', fail)
+    with caplog.at_level(logging.ERROR, logger=data_loader.logger.name):
+        version, _ = data_loader._refresh_sheet_cache('doc')
+    assert '디스크 캐시 저장 실패' in caplog.text
+    assert 'No space left on device' in caplog.text
+    # 화면용 메모리 캐시는 갱신되고, 저장되지 않은 버전은 다음 갱신 때 다시 저장 시도
+    assert data_loader.get_sheet_cache_status()['version'] == version
+    data_loader._refresh_sheet_cache('doc')
+    assert saves == [version, version]
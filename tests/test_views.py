@@ -0,0 +1,40 @@
+from sheets import attendance_sheet, match_sheet
+from utils import build_league_snapshot
+from utils.views import attendance_view, format_team_name, player_detail_view
+
+
+# 색 키워드가 같은 두 팀 (표시 이름이 같음)
+RED, RED2, BLUE = '타르가르옌(레드)', '타르가르옌2(레드)', '스타크(블루)'
+ROSTERS = {
+    RED: {'김레드': ['1', '1'], '이레드': ['1', '0']},
+    RED2: {'박레드': ['1', '1'], '최레드': ['0', '1']},
+    BLUE: {'정블루': ['1', '1'], '강블루': ['1', 'x']},
+}
+
+
+def _league():
+    df_match = match_sheet([RED, RED2, BLUE], [
+        (1, {RED: '김레드', BLUE: '0'}),
+        (1, {RED2: '박레드,최레드', BLUE: '정블루'}),
+        (2, {RED: '0', RED2: '0'}),
+        (2, {RED2: '박레드', BLUE: '강블루, 자살골'}),
+    ])
+    return build_league_snapshot(df_match, attendance_sheet(ROSTERS, 2), 'test')
+
+
+def test_same_display_name_teams_keep_their_own_tables():
+    assert format_team_name(RED) == format_team_name(RED2)
+    league = _league()
+
+    # 화면 캐시 키로 쓰는 원본 팀 이름은 팀마다 다르고, 표도 그 팀 선수만 담음
+    player_tables = player_detail_view(league)
+    assert sorted(t_raw for t_raw, _, _ in player_tables) == sorted([RED, RED2, BLUE])
+    for t_raw, display_name, table in player_tables:
+        assert display_name == format_team_name(t_raw)
+        assert set(table['선수이름']) == set(ROSTERS[t_raw])
+
+    _, attendance_tables = attendance_view(league)
+    assert sorted(t_raw for t_raw, _, _ in attendance_tables) == sorted([RED, RED2, BLUE])
+    for t_raw, display_name, table in attendance_tables:
+        assert display_name == format_team_name(t_raw)
+        assert list(table['선수이름']) == list(ROSTERS[t_raw])